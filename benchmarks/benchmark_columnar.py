@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Benchmark: screening a JSONL file vs. a memory-mapped columnar corpus
+
+Usage: python benchmarks/benchmark_columnar.py [nr_records]
+"""
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import make_query
+from synthetic import make_records
+
+from search_query.columnar import build_corpus
+from search_query.columnar import ColumnarCorpus
+from search_query.screening import read_records
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nr_records = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    records = make_records(nr_records)
+    query = make_query()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "records.jsonl"
+        with open(path, "w", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record) + "\n")
+
+        start = time.perf_counter()
+        build_corpus(read_records(path), Path(tmp_dir) / "corpus")
+        time_build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matcher = query.compile_matcher()
+        expected = [i for i, record in enumerate(read_records(path)) if matcher(record)]
+        time_jsonl = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ColumnarCorpus(Path(tmp_dir) / "corpus") as corpus:
+            result = corpus.search(query)
+        time_corpus = time.perf_counter() - start
+        assert result == expected, "ColumnarCorpus differs from the matcher"
+
+    print(f"records: {nr_records} ({len(expected)} selected)")
+    print(f"build corpus (once): {time_build:.3f}s")
+    print(f"JSONL (decode + match): {time_jsonl:.3f}s")
+    print(
+        f"columnar corpus (mmap): {time_corpus:.3f}s "
+        f"(speedup {time_jsonl / time_corpus:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Benchmark: re-evaluating edited queries with and without subtree caching
+
+Usage: python benchmarks/benchmark_incremental.py [nr_records]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from synthetic import make_query
+from synthetic import make_records
+
+from search_query.incremental import IncrementalEvaluator
+from search_query.record_index import RecordIndex
+
+EDITS = ["robot*", "robotics", "machine*", "robots", "learning"]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nr_records = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    index = RecordIndex(make_records(nr_records))
+    query = make_query()
+    # The term that is edited (first term of the first block)
+    term = query.children[0].children[0]
+
+    start = time.perf_counter()
+    counts = []
+    for value in EDITS:
+        term.value = value
+        counts.append(index.count(query))
+    time_full = time.perf_counter() - start
+
+    evaluator = IncrementalEvaluator(index)
+    evaluator.count(query)
+    start = time.perf_counter()
+    incremental_counts = []
+    for value in EDITS:
+        term.value = value
+        incremental_counts.append(evaluator.count(query))
+    time_incremental = time.perf_counter() - start
+
+    assert counts == incremental_counts
+    print(f"records:                {nr_records}")
+    print(f"counts:                 {counts}")
+    print(f"{len(EDITS)} edits (full):       {time_full:.3f}s")
+    print(f"{len(EDITS)} edits (incremental): {time_incremental:.3f}s")
+    print(f"speedup:                {time_full / time_incremental:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
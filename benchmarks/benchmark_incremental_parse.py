@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark: incremental parsing of WOS queries (WOSParser.apply_edit())
+compared to parsing the edited query again
+
+Usage: python benchmarks/benchmark_incremental_parse.py [max_blocks]
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import sys
+import time
+
+from search_query.constants import LinterMode
+from search_query.parser_wos import WOSParser
+
+NR_RUNS = 20
+
+
+def _strategy_query(nr_blocks: int) -> str:
+    """TS=(b0t0 OR b0t1 OR ...) AND TI=(b1t0 OR ...) AND ...: 20 terms per block"""
+    blocks = []
+    for i in range(nr_blocks):
+        field = "TS=" if i % 2 == 0 else "TI="
+        blocks.append(f"{field}({' OR '.join(f'b{i}t{j}*' for j in range(20))})")
+    return " AND ".join(blocks)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    max_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 800
+    nr_blocks = 25
+    while nr_blocks <= max_blocks:
+        query_str = _strategy_query(nr_blocks)
+
+        # Linter messages are printed
+        with contextlib.redirect_stdout(io.StringIO()):
+            time_parse = 0.0
+            for _ in range(NR_RUNS):
+                start = time.perf_counter()
+                WOSParser(query_str, "", mode=LinterMode.NONSTRICT).parse()
+                time_parse += time.perf_counter() - start
+
+            # Type (and delete) a character in a term of the middle/last block
+            times_edit = []
+            for block in [nr_blocks // 2, nr_blocks - 1]:
+                position = query_str.index(f"b{block}t10*") + 2
+                parser = WOSParser(query_str, "", mode=LinterMode.NONSTRICT)
+                parser.parse()
+                time_edit = 0.0
+                for _ in range(NR_RUNS):
+                    start = time.perf_counter()
+                    parser.apply_edit(position, position, "x")
+                    parser.apply_edit(position, position + 1, "")
+                    time_edit += (time.perf_counter() - start) / 2
+                times_edit.append(time_edit / NR_RUNS)
+
+        print(
+            f"blocks: {nr_blocks}, chars: {len(query_str)}: "
+            f"parse: {time_parse / NR_RUNS * 1000:.2f} ms, "
+            f"apply_edit (middle): {times_edit[0] * 1000:.2f} ms, "
+            f"apply_edit (end): {times_edit[1] * 1000:.2f} ms"
+        )
+        nr_blocks *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Benchmark: linting large WOS queries
+
+Usage: python benchmarks/benchmark_lint.py [nr_terms]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from search_query.parser_wos import WOSParser
+
+NR_RUNS = 5
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nr_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 2500
+    query_str = (
+        "TS=("
+        + " OR ".join(
+            f"robot{i}*" if i % 4 else f'"term {i}" NEAR/5 care'
+            for i in range(nr_terms)
+        )
+        + ") AND PY=2020"
+    )
+
+    parser = WOSParser(query_str, "", mode="non-strict")
+    parser.tokenize()
+    parser.add_artificial_parentheses_for_operator_precedence()
+    tokens = list(parser.tokens)
+
+    elapsed = 0.0
+    for _ in range(NR_RUNS):
+        parser.tokens = list(tokens)
+        parser.linter_messages.clear()
+        start = time.perf_counter()
+        parser.query_linter.pre_linting()
+        elapsed += time.perf_counter() - start
+
+    print(f"tokens: {len(tokens)}")
+    print(f"pre-linting: {elapsed / NR_RUNS * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
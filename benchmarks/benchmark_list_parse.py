@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark: parsing of list queries (search histories) with a process pool
+
+Usage: python benchmarks/benchmark_list_parse.py [nr_lines]
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+from search_query.parser import parse
+
+NR_RUNS = 3
+
+
+def _history(syntax: str, nr_lines: int) -> str:
+    """nr_lines independent lines (20 terms each) combined by the last line"""
+    lines = []
+    for i in range(nr_lines):
+        terms = [f"t{i}x{j}*" for j in range(20)]
+        if syntax == "pubmed":
+            lines.append(" OR ".join(f"{term}[tiab]" for term in terms))
+        elif syntax == "wos":
+            lines.append(f"TS=({' OR '.join(terms)})")
+        else:
+            lines.append(" OR ".join(f"TI {term}" for term in terms))
+    reference = "S" if syntax == "ebscohost" else "#"
+    lines.append(" OR ".join(f"{reference}{i + 1}" for i in range(nr_lines)))
+    return "\n".join(f"{i + 1}. {line}" for i, line in enumerate(lines))
+
+
+def _time(query_list: str, syntax: str, max_workers: int) -> float:
+    start = time.perf_counter()
+    for _ in range(NR_RUNS):
+        # Linter messages are printed
+        with contextlib.redirect_stdout(io.StringIO()):
+            parse(query_list, "", syntax=syntax, mode="", max_workers=max_workers)
+    return (time.perf_counter() - start) / NR_RUNS
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nr_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    max_workers = os.cpu_count() or 1
+    print(f"lines: {nr_lines}, cpus: {max_workers}")
+    for syntax in ["pubmed", "wos", "ebscohost"]:
+        query_list = _history(syntax, nr_lines)
+        time_sequential = _time(query_list, syntax, 1)
+        print(f"{syntax}: sequential: {time_sequential:.3f}s")
+        workers = 2
+        while workers <= max(2, max_workers):
+            elapsed = _time(query_list, syntax, workers)
+            print(
+                f"{syntax}: {workers:>2} workers: {elapsed:.3f}s "
+                f"(speedup {time_sequential / elapsed:.2f})"
+            )
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Benchmark: Query.selects() vs. Query.compile_matcher()
+
+Usage: python benchmarks/benchmark_matcher.py [nr_records]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from synthetic import make_query
+from synthetic import make_records
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nr_records = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    records = make_records(nr_records)
+    query = make_query()
+
+    start = time.perf_counter()
+    expected = [query.selects(record_dict=record) for record in records]
+    time_selects = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = query.compile_matcher()
+    result = [matcher(record) for record in records]
+    time_matcher = time.perf_counter() - start
+
+    assert result == expected, "compiled matcher differs from selects()"
+
+    print(f"records:          {nr_records} ({sum(expected)} selected)")
+    print(f"selects():        {time_selects:.3f}s")
+    print(f"compile_matcher(): {time_matcher:.3f}s")
+    print(f"speedup:          {time_selects / time_matcher:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
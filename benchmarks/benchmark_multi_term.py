@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Benchmark: compiled matcher with and without multi-term scanning
+
+Usage: python benchmarks/benchmark_multi_term.py [nr_records] [nr_synonyms]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from synthetic import make_records
+
+from search_query.constants import Fields
+from search_query.or_query import OrQuery
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nr_records = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    nr_synonyms = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    records = make_records(nr_records)
+    # Hundreds of OR'd synonyms (most of them rare)
+    query = OrQuery(
+        [f"word{i}x" for i in range(nr_synonyms)] + ["privacy"],
+        search_field=Fields.ABSTRACT,
+    )
+
+    start = time.perf_counter()
+    matcher = query.compile_matcher()
+    expected = [matcher(record) for record in records]
+    time_matcher = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = query.compile_matcher(multi_term=True)
+    result = [matcher(record) for record in records]
+    time_multi_term = time.perf_counter() - start
+
+    assert result == expected, "multi-term matcher differs"
+
+    print(f"records: {nr_records}, synonyms: {nr_synonyms}, selected: {sum(result)}")
+    print(f"one search per term: {time_matcher:.3f}s")
+    print(f"multi-term scan:     {time_multi_term:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Benchmark: parsing of deeply nested WOS queries (explicit stacks)
+
+Usage: python benchmarks/benchmark_nesting.py [max_depth]
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import sys
+import time
+import typing
+
+from search_query.constants import LinterMode
+from search_query.parser_wos import WOSParser
+
+NR_RUNS = 3
+
+
+def _nested_query(depth: int) -> str:
+    """(a0 OR b0 AND (a1 OR b1 AND (... TI=robot)))"""
+    query_str = "TI=robot"
+    for i in range(depth):
+        query_str = f"(a{i} OR b{i} AND {query_str})"
+    return query_str
+
+
+def _precedence(query_str: str) -> None:
+    parser = WOSParser(query_str, "")
+    parser.tokenize()
+    parser.add_artificial_parentheses_for_operator_precedence()
+
+
+def _parse(query_str: str) -> None:
+    parser = WOSParser(query_str, "", mode=LinterMode.NONSTRICT)
+    # Linter messages are printed
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse()
+
+
+def _time(function: typing.Callable[[], typing.Any]) -> float:
+    start = time.perf_counter()
+    for _ in range(NR_RUNS):
+        function()
+    return (time.perf_counter() - start) / NR_RUNS
+
+
+def main() -> None:
+    """Run the benchmark."""
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print(f"recursion limit: {sys.getrecursionlimit()}")
+    depth = 125
+    while depth <= max_depth:
+        query_str = _nested_query(depth)
+        time_precedence = _time(lambda: _precedence(query_str))
+        time_parse = _time(lambda: _parse(query_str))
+        print(
+            f"depth {depth}: artificial parentheses: {time_precedence:.3f}s, "
+            f"parse: {time_parse:.3f}s"
+        )
+        depth *= 2
+
+
+if __name__ == "__main__":
+    main()
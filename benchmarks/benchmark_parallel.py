@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Benchmark: scaling of select_parallel() with the number of workers
+
+Usage: python benchmarks/benchmark_parallel.py [nr_records]
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import make_query
+from synthetic import make_records
+
+from search_query.parallel import select_parallel
+from search_query.screening import read_records
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nr_records = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    records = make_records(nr_records)
+    query = make_query()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "records.jsonl"
+        with open(path, "w", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record) + "\n")
+
+        start = time.perf_counter()
+        matcher = query.compile_matcher()
+        expected = [i for i, record in enumerate(read_records(path)) if matcher(record)]
+        time_sequential = time.perf_counter() - start
+        print(f"records: {nr_records} ({len(expected)} selected, JSONL file)")
+        print(f"sequential:  {time_sequential:.3f}s")
+
+        max_workers = os.cpu_count() or 1
+        workers = 1
+        while workers <= max_workers:
+            start = time.perf_counter()
+            result = select_parallel(query, path, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            assert result == expected, "select_parallel() differs from selects()"
+            print(
+                f"{workers:>2} workers: {elapsed:.3f}s "
+                f"(speedup {time_sequential / elapsed:.1f}x)"
+            )
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Benchmark: parsing repeated search strings with a ParseCache
+
+Usage: python benchmarks/benchmark_parse_cache.py [nr_terms]
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import sys
+import time
+
+from search_query.parser import parse
+from search_query.parser import ParseCache
+
+NR_RUNS = 20
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nr_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    query_str = (
+        "TS=("
+        + " OR ".join(f"robot{i}*" for i in range(nr_terms))
+        + ") AND AB=(ethic* OR moral*)"
+    )
+    cache = ParseCache()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(NR_RUNS):
+            expected = parse(query_str, "", mode="non-strict").to_string()
+        time_parse = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(NR_RUNS):
+            result = parse(query_str, "", mode="non-strict", cache=cache).to_string()
+        time_cache = time.perf_counter() - start
+    assert result == expected, "Cached query differs"
+
+    print(f"terms: {nr_terms}, parses: {NR_RUNS}")
+    print(f"without cache: {time_parse:.3f}s")
+    print(
+        f"with cache:    {time_cache:.3f}s (speedup {time_parse / time_cache:.1f}x, "
+        f"{cache.stats()})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Benchmark: compiled matcher with and without a QueryPlanner
+
+Usage: python benchmarks/benchmark_planner.py [nr_records]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from synthetic import make_query
+from synthetic import make_records
+
+from search_query.planner import QueryPlanner
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nr_records = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    records = make_records(nr_records)
+    query = make_query()
+    # Written in an unfavorable order: frequent abstract blocks first
+    query.children.reverse()
+    for child in query.children:
+        child.children.reverse()
+
+    planners = {
+        "written order": None,
+        "heuristic planner": QueryPlanner(),
+        "sampled planner": QueryPlanner(records[:500]),
+    }
+    expected = None
+    for name, planner in planners.items():
+        start = time.perf_counter()
+        matcher = query.compile_matcher(planner=planner)
+        result = [matcher(record) for record in records]
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            expected = result
+        assert result == expected, "planned matcher differs"
+        print(f"{name:<18} {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Benchmark: operator precedence (artificial parentheses) of long mixed queries
+
+Usage: python benchmarks/benchmark_precedence.py [max_terms]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from search_query.constants import LinterMode
+from search_query.parser_wos import WOSParser
+
+NR_RUNS = 3
+
+
+def _mixed_query(nr_terms: int) -> str:
+    """TS=(t0 OR t1 AND t2 NOT t3 OR t4 AND ...)"""
+    operators = ["OR", "AND", "NOT"]
+    parts = ["t0"]
+    for i in range(1, nr_terms):
+        parts.extend([operators[i % 3], f"t{i}"])
+    return f"TS=({' '.join(parts)})"
+
+
+def _group_query(nr_terms: int) -> str:
+    """TS=(x OR (t0 OR t1 OR ...) AND y): long operand of a higher precedence"""
+    return f"TS=(x OR ({' OR '.join(f't{i}' for i in range(nr_terms))}) AND y)"
+
+
+def main() -> None:
+    """Run the benchmark."""
+    max_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 32000
+    for name, make_query in [("mixed", _mixed_query), ("group", _group_query)]:
+        nr_terms = 1000
+        while nr_terms <= max_terms:
+            parser = WOSParser(make_query(nr_terms), "", mode=LinterMode.NONSTRICT)
+            parser.tokenize()
+            tokens = list(parser.tokens)
+
+            elapsed = 0.0
+            for _ in range(NR_RUNS):
+                parser.tokens = list(tokens)
+                start = time.perf_counter()
+                parser.add_artificial_parentheses_for_operator_precedence()
+                elapsed += time.perf_counter() - start
+            elapsed /= NR_RUNS
+
+            print(
+                f"{name}: terms: {nr_terms}, tokens: {len(tokens)}: "
+                f"{elapsed * 1000:.1f} ms "
+                f"({elapsed / len(tokens) * 1e6:.2f} us per token)"
+            )
+            nr_terms *= 2
+
+
+if __name__ == "__main__":
+    main()
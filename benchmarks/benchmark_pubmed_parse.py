@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Benchmark: parsing of long PubMed queries (query tree from the tokens)
+
+Usage: python benchmarks/benchmark_pubmed_parse.py [max_terms]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from search_query.parser_pubmed import PubmedParser
+
+NR_RUNS = 3
+
+
+def _or_block(nr_terms: int) -> str:
+    """(t0[tiab] OR t1[tiab] OR ...)"""
+    return "(" + " OR ".join(f"t{i}[tiab]" for i in range(nr_terms)) + ")"
+
+
+def _strategy_query(nr_terms: int) -> str:
+    """(t0[tiab] OR ...) AND (t100[tiab] OR ...) AND ...: blocks of 100 terms"""
+    blocks = [
+        " OR ".join(f"t{i}[tiab]" for i in range(start, min(start + 100, nr_terms)))
+        for start in range(0, nr_terms, 100)
+    ]
+    return " AND ".join(f"({block})" for block in blocks)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    max_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    for name, make_query in [("or-block", _or_block), ("strategy", _strategy_query)]:
+        for nr_terms in [100, 500, 1000, 5000, 10000, 50000]:
+            if nr_terms > max_terms:
+                break
+            query_str = make_query(nr_terms)
+
+            time_tokenize = 0.0
+            time_parse = 0.0
+            for _ in range(NR_RUNS):
+                parser = PubmedParser(query_str, "")
+                start = time.perf_counter()
+                parser.tokenize()
+                time_tokenize += time.perf_counter() - start
+
+                start = time.perf_counter()
+                parser.parse_query_tree(parser.tokens)
+                time_parse += time.perf_counter() - start
+
+            print(
+                f"{name}: terms: {nr_terms}, tokens: {len(parser.tokens)}: "
+                f"tokenize: {time_tokenize / NR_RUNS * 1000:.1f} ms, "
+                f"parse: {time_parse / NR_RUNS * 1000:.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Benchmark: scanning records vs. querying a RecordIndex
+
+Usage: python benchmarks/benchmark_record_index.py [nr_records]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from synthetic import make_query
+from synthetic import make_records
+
+from search_query.record_index import RecordIndex
+
+NR_QUERIES = 20
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nr_records = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    records = make_records(nr_records)
+    query = make_query()
+
+    start = time.perf_counter()
+    matcher = query.compile_matcher()
+    for _ in range(NR_QUERIES):
+        selected = [i for i, record in enumerate(records) if matcher(record)]
+    time_scan = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = RecordIndex(records)
+    time_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(NR_QUERIES):
+        index_selected = index.search(query)
+    time_index = time.perf_counter() - start
+
+    print(f"records:            {nr_records}")
+    print(f"selected (scan):    {len(selected)}")
+    print(f"selected (index):   {len(index_selected)} (whole-token matching)")
+    print(f"{NR_QUERIES} queries (scan):  {time_scan:.3f}s")
+    print(f"index build:        {time_build:.3f}s")
+    print(f"{NR_QUERIES} queries (index): {time_index:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Benchmark: evaluating query variants with and without a result cache
+
+Usage: python benchmarks/benchmark_result_cache.py [nr_records]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from synthetic import make_query
+from synthetic import make_records
+
+from search_query.constants import Fields
+from search_query.or_query import OrQuery
+from search_query.query import SearchField
+from search_query.record_index import RecordIndex
+from search_query.result_cache import ResultCache
+
+# Variants of the last block (as for variants of a protocol)
+VARIANTS = ["survey", "review", "systematic", "analysis", "trial", "study"]
+
+
+def make_variants() -> list:
+    """Queries that only differ in their last block."""
+    queries = []
+    for variant in VARIANTS:
+        query = make_query()
+        query.children[-1].children[0] = OrQuery(
+            [variant], search_field=SearchField(Fields.TITLE)
+        )
+        queries.append(query)
+    return queries
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nr_records = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    index = RecordIndex(make_records(nr_records))
+    queries = make_variants()
+
+    start = time.perf_counter()
+    counts = [index.count(query) for query in queries]
+    time_plain = time.perf_counter() - start
+
+    cache = ResultCache()
+    start = time.perf_counter()
+    cached_counts = [index.count(query, cache=cache) for query in queries]
+    time_cached = time.perf_counter() - start
+
+    assert counts == cached_counts
+    print(f"records:              {nr_records}")
+    print(f"{len(queries)} variants (plain):  {time_plain:.3f}s")
+    print(f"{len(queries)} variants (cached): {time_cached:.3f}s")
+    print(f"speedup:              {time_plain / time_cached:.1f}x")
+    print(f"cache:                {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
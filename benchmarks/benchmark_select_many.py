@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Benchmark: per-record selects() vs. Query.select_many()
+
+Usage: python benchmarks/benchmark_select_many.py [nr_records]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from synthetic import make_query
+from synthetic import make_records
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nr_records = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    records = make_records(nr_records)
+    query = make_query()
+
+    start = time.perf_counter()
+    expected = [query.selects(record_dict=record) for record in records]
+    time_selects = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mask = query.select_many(records)
+    time_select_many = time.perf_counter() - start
+
+    assert mask.tolist() == expected, "select_many() differs from selects()"
+
+    print(f"records:       {nr_records} ({sum(expected)} selected)")
+    print(f"selects():     {time_selects:.3f}s")
+    print(f"select_many(): {time_select_many:.3f}s")
+    print(f"speedup:       {time_selects / time_select_many:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
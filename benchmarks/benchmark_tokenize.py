@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark: tokenization of large queries (single-pass lexer)
+
+Usage: python benchmarks/benchmark_tokenize.py [nr_terms]
+"""
+from __future__ import annotations
+
+import re
+import sys
+import time
+import typing
+
+from search_query.constants import TokenTypes
+from search_query.parser_ebsco import EBSCOParser
+from search_query.parser_wos import WOSParser
+
+NR_RUNS = 5
+
+
+def _classify_fullmatch(
+    parser_class: typing.Type, query_str: str
+) -> typing.List[TokenTypes]:
+    """Previous approach: combined pattern, then fullmatch per token type."""
+    pattern = "|".join(
+        [
+            parser_class.SEARCH_FIELD_REGEX,
+            parser_class.LOGIC_OPERATOR_REGEX,
+            parser_class.PROXIMITY_OPERATOR_REGEX,
+            parser_class.SEARCH_TERM_REGEX,
+            parser_class.PARENTHESIS_REGEX,
+        ]
+    )
+    token_types = []
+    for match in re.finditer(pattern, query_str):
+        value = match.group()
+        if re.fullmatch(parser_class.PARENTHESIS_REGEX, value):
+            if value == "(":
+                token_types.append(TokenTypes.PARENTHESIS_OPEN)
+            else:
+                token_types.append(TokenTypes.PARENTHESIS_CLOSED)
+        elif re.fullmatch(parser_class.LOGIC_OPERATOR_REGEX, value):
+            token_types.append(TokenTypes.LOGIC_OPERATOR)
+        elif re.fullmatch(parser_class.PROXIMITY_OPERATOR_REGEX, value):
+            token_types.append(TokenTypes.PROXIMITY_OPERATOR)
+        elif re.fullmatch(parser_class.SEARCH_FIELD_REGEX, value):
+            token_types.append(TokenTypes.FIELD)
+        elif re.fullmatch(parser_class.SEARCH_TERM_REGEX, value):
+            token_types.append(TokenTypes.SEARCH_TERM)
+        else:
+            token_types.append(TokenTypes.UNKNOWN)
+    return token_types
+
+
+def _lex(parser_class: typing.Type, query_str: str) -> typing.List[TokenTypes]:
+    parser = parser_class(query_str, "")
+    return [token.type for token in parser.lex()]
+
+
+def _time(function: typing.Callable[[], typing.Any]) -> float:
+    start = time.perf_counter()
+    for _ in range(NR_RUNS):
+        function()
+    return (time.perf_counter() - start) / NR_RUNS
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nr_terms = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    queries = {
+        WOSParser: "TS=("
+        + " OR ".join(
+            f'"term {i}"' if i % 3 else f"robot{i}* NEAR/2 care"
+            for i in range(nr_terms)
+        )
+        + ")",
+        EBSCOParser: "TI ("
+        + " OR ".join(
+            f'"term {i}"' if i % 3 else f"robot{i}* N2 care" for i in range(nr_terms)
+        )
+        + ")",
+    }
+
+    print(f"terms per query: {nr_terms}")
+    for parser_class, query_str in queries.items():
+        assert _lex(parser_class, query_str) == _classify_fullmatch(
+            parser_class, query_str
+        ), "Token types differ"
+        time_fullmatch = _time(lambda: _classify_fullmatch(parser_class, query_str))
+        time_lex = _time(lambda: _lex(parser_class, query_str))
+        print(
+            f"{parser_class.__name__}: fullmatch per token: {time_fullmatch:.3f}s, "
+            f"named groups: {time_lex:.3f}s "
+            f"(speedup {time_fullmatch / time_lex:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
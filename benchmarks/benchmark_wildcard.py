@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Benchmark: wildcard terms (regex scan vs. vocabulary expansion)
+
+Usage: python benchmarks/benchmark_wildcard.py [nr_records]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from synthetic import make_records
+
+from search_query.constants import Fields
+from search_query.or_query import OrQuery
+from search_query.positions import compile_token_wildcard
+from search_query.query import SearchField
+from search_query.record_index import RecordIndex
+from search_query.vocabulary import SortedVocabulary
+
+WILDCARD_TERMS = ["child*", "robot*", "ethic*", "word1?", "word12$", "*ing", "w*d7*"]
+
+
+def main() -> None:
+    """Run the benchmark."""
+    nr_records = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    records = make_records(nr_records)
+    queries = [
+        OrQuery([term], search_field=SearchField(Fields.ABSTRACT))
+        for term in WILDCARD_TERMS
+    ]
+
+    start = time.perf_counter()
+    for query in queries:
+        matcher = query.compile_matcher()
+        for record in records:
+            matcher(record)
+    time_scan = time.perf_counter() - start
+
+    index = RecordIndex(records)
+    # Expansion by matching the regex against all tokens of the vocabulary
+    tokens = list(index.vocabulary("abstract"))
+    start = time.perf_counter()
+    for term in WILDCARD_TERMS:
+        pattern = compile_token_wildcard(term)
+        [token for token in tokens if pattern.fullmatch(token)]
+    time_vocabulary_scan = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query)
+    time_index = time.perf_counter() - start
+
+    vocabulary = SortedVocabulary(tokens)
+    start = time.perf_counter()
+    for term in WILDCARD_TERMS:
+        vocabulary.expand(term)
+    time_expand = time.perf_counter() - start
+
+    print(f"records: {nr_records}, vocabulary (abstract): {len(tokens)} tokens")
+    print(f"regex scan of the records:       {time_scan:.3f}s")
+    print(f"index (expansion + postings):    {time_index:.3f}s")
+    print(f"expansion, regex over all tokens: {time_vocabulary_scan * 1000:.2f} ms")
+    print(f"expansion, sorted vocabulary:     {time_expand * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
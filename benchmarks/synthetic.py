@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Synthetic records and queries for the benchmarks."""
+from __future__ import annotations
+
+import random
+import typing
+
+from search_query.and_query import AndQuery
+from search_query.constants import Fields
+from search_query.not_query import NotQuery
+from search_query.or_query import OrQuery
+from search_query.query import Query
+from search_query.query import SearchField
+
+VOCABULARY = [
+    "artificial",
+    "intelligence",
+    "machine",
+    "learning",
+    "health",
+    "care",
+    "medicine",
+    "ethics",
+    "ethical",
+    "moral",
+    "robot",
+    "robotics",
+    "children",
+    "child",
+    "education",
+    "digital",
+    "platform",
+    "survey",
+    "review",
+    "systematic",
+    "outcomes",
+    "patients",
+    "clinical",
+    "trial",
+    "study",
+    "analysis",
+    "data",
+    "model",
+    "network",
+    "privacy",
+]
+FILLER = [f"word{i}" for i in range(2000)]
+
+
+def make_records(nr_records: int, *, seed: int = 0) -> typing.List[dict]:
+    """Generate records with a title and an abstract."""
+    rng = random.Random(seed)
+
+    def _text(nr_words: int) -> str:
+        words = [
+            rng.choice(VOCABULARY) if rng.random() < 0.03 else rng.choice(FILLER)
+            for _ in range(nr_words)
+        ]
+        return " ".join(words).capitalize()
+
+    return [
+        {"ID": str(i), "title": _text(12), "abstract": _text(200)}
+        for i in range(nr_records)
+    ]
+
+
+def make_query() -> Query:
+    """Generate a query with title/abstract blocks and wildcards."""
+    title = SearchField(Fields.TITLE)
+    abstract = SearchField(Fields.ABSTRACT)
+    return AndQuery(
+        [
+            OrQuery(
+                [
+                    '"artificial intelligence"',
+                    '"machine learning"',
+                    "robot*",
+                ],
+                search_field=title,
+            ),
+            OrQuery(
+                ['"health care"', "medicine", "clinical", "patient*"],
+                search_field=abstract,
+            ),
+            OrQuery(["ethic*", "moral*", "privacy"], search_field=abstract),
+            NotQuery(["survey"], search_field=title),
+        ],
+        search_field=title,
+    )
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Command-line interface for search-query."""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import sys
+import typing
+
+import search_query.parser
+from search_query.columnar import build_corpus
+from search_query.columnar import is_corpus
+from search_query.constants import ExitCodes
+from search_query.constants import LinterMode
+from search_query.profiling import QueryProfile
+from search_query.screening import read_records
+from search_query.screening import screen
+from search_query.search_file import load_search_file
+
+if typing.TYPE_CHECKING:  # pragma: no
+    from search_query.query import Query
+
+
+def _load_query(args: argparse.Namespace) -> Query:
+    """Parse the query passed as a string or search file."""
+    if args.search_file:
+        search_file = load_search_file(args.search_file)
+        query_str = search_file.search_string
+        syntax = search_query.parser.get_platform(search_file.platform)
+        search_field_general = search_file.search_field
+    else:
+        query_str = args.query
+        syntax = args.syntax
+        search_field_general = args.search_field
+
+    # Linter messages are printed by the parsers:
+    # keep stdout for the screening results
+    with contextlib.redirect_stdout(sys.stderr):
+        return search_query.parser.parse(
+            query_str, search_field_general, syntax=syntax, mode=args.mode
+        )
+
+
+def _screen(args: argparse.Namespace) -> int:
+    """Screen the records of a JSONL file."""
+    try:
+        query = _load_query(args)
+    except Exception as exc:  # pylint: disable=broad-except
+        print(exc, file=sys.stderr)
+        return ExitCodes.FAIL
+
+    profile = QueryProfile() if args.profile else None
+    try:
+        for result in screen(
+            query, args.records, ids=args.ids, id_key=args.id_key, profile=profile
+        ):
+            if args.ids or is_corpus(args.records):
+                print(result)
+            else:
+                print(json.dumps(result, ensure_ascii=False))
+    except (OSError, ValueError) as exc:
+        print(exc, file=sys.stderr)
+        return ExitCodes.FAIL
+    if profile is not None:
+        print(profile.to_string(query), file=sys.stderr)
+    return ExitCodes.SUCCESS
+
+
+def _build_corpus(args: argparse.Namespace) -> int:
+    """Convert the records of a JSONL file to a columnar corpus."""
+    try:
+        nr_records = build_corpus(
+            read_records(args.records), args.corpus, id_key=args.id_key
+        )
+    except (OSError, ValueError) as exc:
+        print(exc, file=sys.stderr)
+        return ExitCodes.FAIL
+    print(f"Converted {nr_records} records to {args.corpus}", file=sys.stderr)
+    return ExitCodes.SUCCESS
+
+
+def _get_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="search-query", description="Tools for literature search queries."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    screen_parser = subparsers.add_parser(
+        "screen", help="Select the records (JSONL) that match a query."
+    )
+    query_group = screen_parser.add_mutually_exclusive_group(required=True)
+    query_group.add_argument("--query", help="Search string")
+    query_group.add_argument("--search-file", help="Search file (JSON)")
+    screen_parser.add_argument(
+        "records", help="Records (JSONL file or columnar corpus, which prints IDs)"
+    )
+    screen_parser.add_argument(
+        "--syntax", default="wos", help="Syntax of the search string (default: wos)"
+    )
+    screen_parser.add_argument(
+        "--search-field", default="", help="General search field of the query"
+    )
+    screen_parser.add_argument(
+        "--mode",
+        default=LinterMode.NONSTRICT,
+        choices=[LinterMode.STRICT, LinterMode.NONSTRICT],
+        help="Linter mode (default: non-strict)",
+    )
+    screen_parser.add_argument(
+        "--ids", action="store_true", help="Print record IDs instead of records"
+    )
+    screen_parser.add_argument(
+        "--id-key", default="ID", help="Record field with the ID (default: ID)"
+    )
+    screen_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the matches and time per query node (stderr)",
+    )
+    screen_parser.set_defaults(func=_screen)
+
+    corpus_parser = subparsers.add_parser(
+        "build-corpus",
+        help="Convert records (JSONL) to a memory-mapped columnar corpus.",
+    )
+    corpus_parser.add_argument("records", help="Records (JSONL file)")
+    corpus_parser.add_argument("corpus", help="Corpus directory")
+    corpus_parser.add_argument(
+        "--id-key", default="ID", help="Record field with the ID (default: ID)"
+    )
+    corpus_parser.set_defaults(func=_build_corpus)
+
+    return parser
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> None:
+    """Main entrypoint for the search-query command"""
+    args = _get_argument_parser().parse_args(argv)
+    raise SystemExit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""Memory-mapped columnar corpus."""
+from __future__ import annotations
+
+import bisect
+import json
+import mmap
+import re
+import sys
+import typing
+from array import array
+from pathlib import Path
+
+from search_query.constants import Operators
+from search_query.field_accessors import get_field_keys
+from search_query.field_accessors import get_field_text
+from search_query.field_accessors import RECORD_KEYS
+from search_query.matcher import normalize_term
+from search_query.matcher import PROXIMITY_OPERATORS
+from search_query.matcher import RecordMatcher
+from search_query.record_index import bitset_to_ids
+
+if typing.TYPE_CHECKING:  # pragma: no
+    from search_query.query import Query
+
+FORMAT_VERSION = 1
+META_FILE = "corpus.json"
+TEXT_SUFFIX = ".txt"
+OFFSETS_SUFFIX = ".offsets"
+# Column with the record IDs (not lowercased)
+ID_COLUMN = "_id"
+# Rows are separated by newlines (not matched by "." in wildcard regexes)
+ROW_SEPARATOR = b"\n"
+# Characters that could let a regex match across rows of a column
+_UNSAFE_PATTERN_CHARS = ("\\", "[", "^", "$", "(?", "\n")
+# Terms are checked row by row if fewer than 1/SPARSE_FACTOR rows are candidates
+SPARSE_FACTOR = 16
+
+
+def build_corpus(
+    records: typing.Iterable[dict],
+    directory: typing.Union[str, Path],
+    *,
+    id_key: str = "ID",
+) -> int:
+    """Write records to a columnar corpus (directory) and return their number.
+
+    Each record field that a search field refers to is stored as a column:
+    the lowercased values (UTF-8, separated by newlines) and the byte offsets
+    of the rows (uint64, native byte order). Columns that are empty for all
+    records are omitted. The IDs of the records (id_key, or the position of
+    the record if the field is missing) are stored in an additional column.
+    The records are processed one at a time.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    keys = (*RECORD_KEYS, ID_COLUMN)
+    text_files = {key: open(directory / f"{key}{TEXT_SUFFIX}", "wb") for key in keys}
+    offsets_files = {
+        key: open(directory / f"{key}{OFFSETS_SUFFIX}", "wb") for key in keys
+    }
+    positions = dict.fromkeys(keys, 0)
+    nr_records = 0
+    try:
+        for key in keys:
+            array("Q", [0]).tofile(offsets_files[key])
+        for nr_records, record in enumerate(records, start=1):
+            for key in keys:
+                if key == ID_COLUMN:
+                    text = str(record.get(id_key, nr_records - 1))
+                else:
+                    text = get_field_text(record, key)
+                data = text.encode("utf-8") + ROW_SEPARATOR
+                text_files[key].write(data)
+                positions[key] += len(data)
+                array("Q", [positions[key]]).tofile(offsets_files[key])
+    finally:
+        for file in (*text_files.values(), *offsets_files.values()):
+            file.close()
+
+    # Omit columns without any values (only separators)
+    columns = [ID_COLUMN]
+    for key in RECORD_KEYS:
+        if positions[key] > nr_records:
+            columns.append(key)
+        else:
+            (directory / f"{key}{TEXT_SUFFIX}").unlink()
+            (directory / f"{key}{OFFSETS_SUFFIX}").unlink()
+
+    meta = {
+        "format": FORMAT_VERSION,
+        "nr_records": nr_records,
+        "columns": columns,
+        "byteorder": sys.byteorder,
+    }
+    (directory / META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return nr_records
+
+
+def is_corpus(path: typing.Union[str, Path]) -> bool:
+    """Check whether a path is a columnar corpus."""
+    return (Path(path) / META_FILE).is_file()
+
+
+class MappedColumn:
+    """A column of a corpus, memory-mapped (read-only)."""
+
+    def __init__(self, text_path: Path, offsets_path: Path) -> None:
+        self._files: typing.List[typing.BinaryIO] = []
+        self.text = self._map(text_path)
+        self._view = memoryview(self.text)
+        self._offsets_view = memoryview(self._map(offsets_path))
+        self.offsets = self._offsets_view.cast("Q")
+
+    def _map(self, path: Path) -> typing.Union[mmap.mmap, bytes]:
+        file = open(path, "rb")
+        self._files.append(file)
+        if not path.stat().st_size:
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def row(self, row: int) -> memoryview:
+        """Get the (lowercased, UTF-8) value of a row (without copying)."""
+        return self._view[self.offsets[row] : self.offsets[row + 1] - 1]
+
+    def find_rows(self, value: bytes, start: int, end: int) -> typing.List[int]:
+        """Rows (in [start, end)) containing the value."""
+        rows = []
+        text, offsets = self.text, self.offsets
+        end_pos = offsets[end]
+        pos = text.find(value, offsets[start], end_pos)
+        while pos != -1:
+            row = bisect.bisect_right(offsets, pos) - 1
+            rows.append(row)
+            if row + 1 >= end:
+                break
+            pos = text.find(value, offsets[row + 1], end_pos)
+        return rows
+
+    def search_rows(
+        self, pattern: typing.Pattern[bytes], start: int, end: int
+    ) -> typing.List[int]:
+        """Rows (in [start, end)) in which the regex pattern matches."""
+        rows = []
+        text, offsets = self.text, self.offsets
+        end_pos = offsets[end]
+        match = pattern.search(text, offsets[start], end_pos)
+        while match is not None:
+            row = bisect.bisect_right(offsets, match.start()) - 1
+            rows.append(row)
+            if row + 1 >= end:
+                break
+            match = pattern.search(text, offsets[row + 1], end_pos)
+        return rows
+
+    def filter_rows(
+        self,
+        value: typing.Union[bytes, typing.Pattern[bytes]],
+        rows: typing.Iterable[int],
+    ) -> typing.List[int]:
+        """Rows (of the given rows) containing the value or regex pattern."""
+        text, offsets = self.text, self.offsets
+        if isinstance(value, bytes):
+            find = text.find
+            return [
+                row for row in rows if find(value, offsets[row], offsets[row + 1]) != -1
+            ]
+        search = value.search
+        return [
+            row
+            for row in rows
+            if search(text, offsets[row], offsets[row + 1] - 1) is not None
+        ]
+
+    def close(self) -> None:
+        """Unmap the column."""
+        mapped = self._offsets_view.obj
+        self.offsets.release()
+        self._offsets_view.release()
+        self._view.release()
+        for data in (self.text, mapped):
+            if isinstance(data, mmap.mmap):
+                data.close()
+        for file in self._files:
+            file.close()
+
+
+class ColumnarCorpus:
+    """Columnar corpus (see build_corpus()) that evaluates queries in place.
+
+    The columns are memory-mapped: terms are located by scanning the
+    lowercased columns (bytes find/regex) without decoding or copying the
+    records, and processes that open the same corpus share the page cache.
+    Results are bitsets (int) over the rows (records) of the corpus.
+    Terms match as in Query.selects() (substrings of the lowercased fields).
+    """
+
+    def __init__(self, directory: typing.Union[str, Path]) -> None:
+        self.directory = Path(directory)
+        meta = self.read_meta(directory)
+        self.nr_records: int = meta["nr_records"]
+        self.columns = {
+            key: MappedColumn(
+                self.directory / f"{key}{TEXT_SUFFIX}",
+                self.directory / f"{key}{OFFSETS_SUFFIX}",
+            )
+            for key in meta["columns"]
+        }
+
+    @staticmethod
+    def read_meta(directory: typing.Union[str, Path]) -> dict:
+        """Read the metadata of a corpus (number of records, columns)."""
+        meta = json.loads((Path(directory) / META_FILE).read_text(encoding="utf-8"))
+        if meta["format"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported corpus format: {meta['format']}")
+        if meta["byteorder"] != sys.byteorder:
+            raise ValueError(f"Corpus has a different byte order: {meta['byteorder']}")
+        return meta
+
+    def __enter__(self) -> ColumnarCorpus:
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the columns."""
+        for column in self.columns.values():
+            column.close()
+
+    def get_id(self, row: int) -> str:
+        """Get the ID of a record."""
+        return bytes(self.columns[ID_COLUMN].row(row)).decode("utf-8")
+
+    def search(self, query: Query) -> typing.List[int]:
+        """Get the rows of the records selected by the query."""
+        return bitset_to_ids(self.evaluate(query))
+
+    def count(self, query: Query) -> int:
+        """Count the records selected by the query."""
+        return bin(self.evaluate(query)).count("1")
+
+    def evaluate(
+        self, node: Query, *, start: int = 0, end: typing.Optional[int] = None
+    ) -> int:
+        """Evaluate a node on the rows in [start, end).
+
+        Bit i of the result corresponds to the row start + i.
+        """
+        end = self.nr_records if end is None else min(end, self.nr_records)
+        start = min(start, end)
+        return self._evaluate(node, start, end, (1 << (end - start)) - 1)
+
+    def _evaluate(self, node: Query, start: int, end: int, candidates: int) -> int:
+        """Evaluate a node on the candidate rows (bitset) of [start, end).
+
+        Operands of AND/OR are evaluated on the rows that can still change
+        the result, so that terms are checked on these rows only (instead of
+        scanning the columns) once the candidates are sparse.
+        """
+        if not candidates:
+            return 0
+
+        if node.value == Operators.NOT:
+            return candidates ^ self._evaluate(node.children[0], start, end, candidates)
+
+        if node.value == Operators.AND:
+            result = candidates
+            for child in node.children:
+                if not result:
+                    break
+                result &= self._evaluate(child, start, end, result)
+            return result
+
+        if node.value == Operators.OR:
+            result = 0
+            for child in node.children:
+                result |= self._evaluate(child, start, end, candidates & ~result)
+            return result
+
+        if node.value in PROXIMITY_OPERATORS:
+            return self._evaluate_rows(node, start, end, candidates)
+
+        if node.operator:
+            raise ValueError(f"Operator not supported: {node.value}")
+
+        return self.evaluate_term(node, start, end, candidates)
+
+    def evaluate_term(
+        self, node: Query, start: int, end: int, candidates: typing.Optional[int] = None
+    ) -> int:
+        """Evaluate a term on the (candidate) rows in [start, end) (bitset)."""
+        sparse_rows: typing.Optional[typing.List[int]] = None
+        if candidates is not None:
+            if bin(candidates).count("1") * SPARSE_FACTOR < end - start:
+                sparse_rows = [start + i for i in bitset_to_ids(candidates)]
+        else:
+            candidates = (1 << (end - start)) - 1
+
+        value = normalize_term(node.value)
+        rows: typing.List[int] = []
+        # Composite search fields match if one of their fields matches
+        for key in get_field_keys(node):
+            if key not in self.columns:
+                # Empty for all records
+                continue
+            column = self.columns[key]
+            if "*" in value:
+                pattern = re.compile(value.replace("*", ".*").encode("utf-8"))
+                if any(char in value for char in _UNSAFE_PATTERN_CHARS):
+                    # Patterns that may span rows are evaluated row by row
+                    rows.extend(
+                        row
+                        for row in (
+                            range(start, end) if sparse_rows is None else sparse_rows
+                        )
+                        if pattern.search(column.row(row)) is not None
+                    )
+                elif sparse_rows is not None:
+                    rows.extend(column.filter_rows(pattern, sparse_rows))
+                else:
+                    rows.extend(column.search_rows(pattern, start, end))
+            elif "\n" in value:
+                # Never matches within a row
+                continue
+            elif sparse_rows is not None:
+                rows.extend(column.filter_rows(value.encode("utf-8"), sparse_rows))
+            else:
+                rows.extend(column.find_rows(value.encode("utf-8"), start, end))
+        return self._to_bitset(rows, start, end) & candidates
+
+    def _evaluate_rows(self, node: Query, start: int, end: int, candidates: int) -> int:
+        """Evaluate a node row by row (on the decoded fields)."""
+        matcher = RecordMatcher(node)
+        columns = [
+            (key, self.columns[key]) for key in matcher.keys if key in self.columns
+        ]
+        rows = [
+            start + i
+            for i in bitset_to_ids(candidates)
+            if matcher(
+                {
+                    key: bytes(column.row(start + i)).decode("utf-8")
+                    for key, column in columns
+                }
+            )
+        ]
+        return self._to_bitset(rows, start, end)
+
+    @staticmethod
+    def _to_bitset(rows: typing.Iterable[int], start: int, end: int) -> int:
+        bits = bytearray((end - start + 7) // 8)
+        for row in rows:
+            row -= start
+            bits[row >> 3] |= 1 << (row & 7)
+        return int.from_bytes(bits, "little")
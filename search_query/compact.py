@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Compact (picklable) form of query trees."""
+from __future__ import annotations
+
+import hashlib
+import typing
+
+from search_query.constants import Operators
+from search_query.matcher import normalize_term
+from search_query.query import Query
+from search_query.query import SearchField
+
+# Terms: (value, search_field)
+# Operators: (value, search_field, distance, (child, ...))
+CompactQuery = tuple
+
+
+def to_compact(
+    query: Query, *, memo: typing.Optional[typing.Dict[int, CompactQuery]] = None
+) -> CompactQuery:
+    """Convert a query tree to nested tuples of strings and ints.
+
+    The compact form covers the values, operators, search fields and
+    distances of the nodes (positions are not included).
+    It is small to pickle and hashable. Shared subtrees are converted once
+    and remain shared (pickle stores them once).
+    """
+    if memo is None:
+        memo = {}
+    if id(query) in memo:
+        return memo[id(query)]
+    search_field = query.search_field.value if query.search_field else None
+    data: CompactQuery
+    if not query.operator:
+        data = (query.value, search_field)
+    else:
+        data = (
+            query.value,
+            search_field,
+            query.distance if query.distance != -1 else None,
+            tuple(to_compact(child, memo=memo) for child in query.children),
+        )
+    memo[id(query)] = data
+    return data
+
+
+def fingerprint(
+    query: Query,
+    *,
+    memo: typing.Optional[typing.Dict[int, bytes]] = None,
+    normalized: bool = False,
+) -> bytes:
+    """Get a structural fingerprint of a query tree.
+
+    Trees with the same compact form have the same fingerprint (a digest
+    computed bottom-up from the compact form of the nodes). If memo is given,
+    it is filled with the fingerprints of all subtrees (by id of the node).
+
+    Normalized fingerprints are also equal for trees that only differ in
+    the order (or repetition) of AND/OR operands and in the capitalization
+    and quotes of terms.
+    """
+    if memo is not None and id(query) in memo:
+        return memo[id(query)]
+    search_field = query.search_field.value if query.search_field else None
+    data: CompactQuery
+    if not query.operator:
+        value = normalize_term(query.value) if normalized else query.value
+        data = (value, search_field)
+    else:
+        children: typing.Iterable[bytes] = [
+            fingerprint(child, memo=memo, normalized=normalized)
+            for child in query.children
+        ]
+        if normalized and query.value in {Operators.AND, Operators.OR}:
+            children = sorted(set(children))
+        data = (
+            query.value,
+            search_field,
+            query.distance if query.distance != -1 else None,
+            tuple(children),
+        )
+    digest = hashlib.blake2b(repr(data).encode("utf-8"), digest_size=16).digest()
+    if memo is not None:
+        memo[id(query)] = digest
+    return digest
+
+
+def share_subtrees(query: Query) -> Query:
+    """Share structurally identical subtrees (hash-consing, in place).
+
+    Subtrees with the same fingerprint are replaced by a single node, so that
+    evaluation (compiled matchers, RecordIndex) and the compact form process
+    each distinct subtree once. The positions of the replaced subtrees are
+    dropped, and changes to a shared node apply to all of its occurrences.
+    """
+    fingerprints: typing.Dict[int, bytes] = {}
+    fingerprint(query, memo=fingerprints)
+    canonical: typing.Dict[bytes, Query] = {}
+    processed: typing.Set[int] = set()
+
+    def _share(node: Query) -> Query:
+        node = canonical.setdefault(fingerprints[id(node)], node)
+        if id(node) not in processed:
+            processed.add(id(node))
+            # Shared nodes are structurally identical (no cycle check)
+            node.children[:] = [_share(child) for child in node.children]
+        return node
+
+    return _share(query)
+
+
+def count_nodes(query: Query) -> int:
+    """Count the distinct nodes of a query (shared subtrees count once)."""
+    seen = {id(query)}
+    nodes = [query]
+    while nodes:
+        for child in nodes.pop().children:
+            if id(child) not in seen:
+                seen.add(id(child))
+                nodes.append(child)
+    return len(seen)
+
+
+def from_compact(
+    data: CompactQuery, *, memo: typing.Optional[typing.Dict[int, Query]] = None
+) -> Query:
+    """Create a query tree from its compact form.
+
+    Shared subtrees of the compact form are shared in the query tree.
+    """
+    if memo is None:
+        memo = {}
+    if id(data) in memo:
+        return memo[id(data)]
+    search_field: typing.Optional[SearchField] = None
+    if data[1] is not None:
+        search_field = SearchField(data[1])
+    if len(data) == 2:
+        query = Query(data[0], operator=False, search_field=search_field)
+    else:
+        query = Query(
+            data[0],
+            operator=True,
+            search_field=search_field,
+            distance=data[2],
+            children=[from_compact(child, memo=memo) for child in data[3]],
+        )
+    memo[id(data)] = query
+    return query
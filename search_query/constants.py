@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 """Constants for search-query"""
 from dataclasses import dataclass
+from dataclasses import field
 from enum import Enum
 from typing import Tuple
 
@@ -32,6 +33,25 @@ class TokenTypes(Enum):
     UNKNOWN = "UNKNOWN"
 
 
+# Flags of the token types (precomputed for each token when its type is set)
+TOKEN_OPERATOR = 1
+TOKEN_LOGIC_OPERATOR = 2
+TOKEN_PROXIMITY_OPERATOR = 4
+TOKEN_PARENTHESIS = 8
+TOKEN_SEARCH_TERM = 16
+TOKEN_FIELD = 32
+
+TOKEN_TYPE_FLAGS = {
+    TokenTypes.LOGIC_OPERATOR: TOKEN_OPERATOR | TOKEN_LOGIC_OPERATOR,
+    TokenTypes.PROXIMITY_OPERATOR: TOKEN_OPERATOR | TOKEN_PROXIMITY_OPERATOR,
+    TokenTypes.FIELD: TOKEN_FIELD,
+    TokenTypes.SEARCH_TERM: TOKEN_SEARCH_TERM,
+    TokenTypes.PARENTHESIS_OPEN: TOKEN_PARENTHESIS,
+    TokenTypes.PARENTHESIS_CLOSED: TOKEN_PARENTHESIS,
+    TokenTypes.UNKNOWN: 0,
+}
+
+
 class OperatorNodeTokenTypes(Enum):
     """Operator node token types (list queries)"""
 
@@ -49,27 +69,44 @@ class ListTokenTypes(Enum):
 
 @dataclass
 class Token:
-    """Token class"""
+    """Token class
+
+    The flags of the type (see TOKEN_TYPE_FLAGS) are set when the token is
+    created, so that the predicates do not compare types (or match values).
+    Tokens are not retyped: create a new token to change the type.
+    """
 
     value: str
     type: TokenTypes
     position: Tuple[int, int]
+    flags: int = field(init=False, repr=False, compare=False, default=0)
+
+    def __post_init__(self) -> None:
+        self.flags = TOKEN_TYPE_FLAGS.get(self.type, 0)
 
     def is_parenthesis(self) -> bool:
         """Check if token is a parenthesis"""
-        return self.type in (TokenTypes.PARENTHESIS_OPEN, TokenTypes.PARENTHESIS_CLOSED)
+        return bool(self.flags & TOKEN_PARENTHESIS)
 
     def is_search_term(self) -> bool:
         """Check if token is a search term"""
-        return self.type == TokenTypes.SEARCH_TERM
+        return bool(self.flags & TOKEN_SEARCH_TERM)
 
     def is_field(self) -> bool:
         """Check if token is a field"""
-        return self.type == TokenTypes.FIELD
+        return bool(self.flags & TOKEN_FIELD)
 
     def is_operator(self) -> bool:
         """Check if token is an operator"""
-        return self.type in (TokenTypes.LOGIC_OPERATOR, TokenTypes.PROXIMITY_OPERATOR)
+        return bool(self.flags & TOKEN_OPERATOR)
+
+    def is_logic_operator(self) -> bool:
+        """Check if token is a logic operator"""
+        return bool(self.flags & TOKEN_LOGIC_OPERATOR)
+
+    def is_proximity_operator(self) -> bool:
+        """Check if token is a proximity operator"""
+        return bool(self.flags & TOKEN_PROXIMITY_OPERATOR)
 
 
 @dataclass
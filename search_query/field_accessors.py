@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Record fields of the search fields."""
+from __future__ import annotations
+
+import typing
+
+from search_query.constants import Fields
+from search_query.constants import PLATFORM_COMBINED_FIELDS_MAP
+
+if typing.TYPE_CHECKING:  # pragma: no
+    from search_query.query import Query
+
+# Record keys of the (single) search fields
+FIELD_KEYS: typing.Dict[str, typing.Tuple[str, ...]] = {
+    Fields.TITLE: ("title",),
+    Fields.ABSTRACT: ("abstract",),
+    Fields.AUTHOR: ("author",),
+    Fields.KEYWORDS: ("keywords",),
+    Fields.LANGUAGE: ("language",),
+    Fields.YEAR: ("year",),
+    Fields.DOI: ("doi",),
+    Fields.EDITOR: ("editor",),
+    Fields.JOURNAL: ("journal",),
+    Fields.PUBLICATION_NAME: ("journal", "booktitle"),
+    Fields.ISSN_ISBN: ("issn", "isbn"),
+    Fields.ISBN: ("isbn",),
+}
+
+# Search fields that cover several search fields
+COMPOSITE_FIELDS: typing.Dict[str, typing.List[str]] = {
+    # WoS TS=: title, abstract and keywords
+    Fields.TOPIC: [Fields.TITLE, Fields.ABSTRACT, Fields.KEYWORDS],
+    # PubMed [tw]: title, abstract and (MeSH) terms
+    Fields.TEXT_WORD: [Fields.TITLE, Fields.ABSTRACT, Fields.KEYWORDS],
+    Fields.ALL: list(FIELD_KEYS),
+}
+for _combined_fields in PLATFORM_COMBINED_FIELDS_MAP.values():
+    COMPOSITE_FIELDS.update(_combined_fields)
+
+for _field, _fields in COMPOSITE_FIELDS.items():
+    FIELD_KEYS[_field] = tuple(
+        dict.fromkeys(key for field in _fields for key in FIELD_KEYS[field])
+    )
+
+# Record keys of all search fields
+RECORD_KEYS = tuple(dict.fromkeys(key for keys in FIELD_KEYS.values() for key in keys))
+
+
+def get_field_keys(node: Query) -> typing.Tuple[str, ...]:
+    """Get the record keys for the search field of a term node.
+
+    A term matches a record if it matches in one of the fields.
+    """
+    if node.search_field is None:
+        raise ValueError("Search field not set")
+    if node.search_field.value not in FIELD_KEYS:
+        raise ValueError(f"Invalid search field: {node.search_field}")
+    return FIELD_KEYS[node.search_field.value]
+
+
+def get_field_text(record_dict: dict, key: str) -> str:
+    """Get the lowercased value of a record field.
+
+    Values that are lists (e.g., keywords) are joined, other values
+    (e.g., years) are converted to strings.
+    """
+    value = record_dict.get(key, "")
+    if isinstance(value, str):
+        return value.lower()
+    if isinstance(value, (list, tuple)):
+        return "; ".join(str(item) for item in value).lower()
+    return str(value).lower()
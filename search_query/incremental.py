@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Incremental re-evaluation of edited queries."""
+from __future__ import annotations
+
+import typing
+
+from search_query.compact import fingerprint
+from search_query.constants import Operators
+from search_query.record_index import bitset_to_ids
+
+if typing.TYPE_CHECKING:  # pragma: no
+    from search_query.query import Query
+    from search_query.record_index import RecordIndex
+
+
+class IncrementalEvaluator:
+    """Evaluates successive versions of a query on a RecordIndex.
+
+    The result bitset of every subtree is cached, keyed by its structural
+    fingerprint. After an edit (e.g., of a single term), only the subtrees
+    whose fingerprints changed (the path from the edited node to the root)
+    are recomputed; the results of the other subtrees are reused:
+
+        evaluator = IncrementalEvaluator(index)
+        evaluator.count(query)
+        query.children[0].value = "robot*"
+        evaluator.count(query)  # recomputes the term and the root
+
+    The cache holds the subtrees of the last query that was evaluated
+    and is cleared when records are added to the index.
+    """
+
+    def __init__(self, index: RecordIndex) -> None:
+        self.index = index
+        # Number of subtrees computed/reused (by the last evaluation)
+        self.computed = 0
+        self.reused = 0
+        self._results: typing.Dict[bytes, int] = {}
+        self._nr_records = index.nr_records
+
+    def evaluate(self, query: Query) -> int:
+        """Evaluate the query (bitset of records)."""
+        if self.index.nr_records != self._nr_records:
+            self.clear()
+            self._nr_records = self.index.nr_records
+        self.computed = self.reused = 0
+
+        fingerprints: typing.Dict[int, bytes] = {}
+        fingerprint(query, memo=fingerprints)
+        results: typing.Dict[bytes, int] = {}
+        result = self._evaluate(query, fingerprints, results)
+        # Keep the results of the current subtrees only
+        self._results = results
+        return result
+
+    def search(self, query: Query) -> typing.List[int]:
+        """Get the ids of the records selected by the query."""
+        return bitset_to_ids(self.evaluate(query))
+
+    def count(self, query: Query) -> int:
+        """Count the records selected by the query."""
+        return bin(self.evaluate(query)).count("1")
+
+    def clear(self) -> None:
+        """Remove the cached results."""
+        self._results = {}
+
+    def _evaluate(
+        self,
+        node: Query,
+        fingerprints: typing.Dict[int, bytes],
+        results: typing.Dict[bytes, int],
+    ) -> int:
+        key = fingerprints[id(node)]
+        if key in results:
+            return results[key]
+        if key in self._results:
+            self.reused += 1
+            results[key] = self._results[key]
+            return results[key]
+        self.computed += 1
+
+        if node.value == Operators.NOT:
+            result = self.index.universe ^ self._evaluate(
+                node.children[0], fingerprints, results
+            )
+        elif node.value == Operators.AND:
+            result = self.index.universe
+            for child in node.children:
+                if not result:
+                    break
+                result &= self._evaluate(child, fingerprints, results)
+        elif node.value == Operators.OR:
+            result = 0
+            for child in node.children:
+                result |= self._evaluate(child, fingerprints, results)
+        else:
+            # Terms and proximity operators
+            result = self.index.evaluate(node)
+
+        results[key] = result
+        return result
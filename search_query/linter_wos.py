@@ -26,15 +26,37 @@ class QueryLinter:
         "LANGUAGE",
     ]
     WILDCARD_CHARS = ["?", "$", "*"]
+    UNSUPPORTED_WILDCARD_PATTERN = re.compile(r"\!+")
 
     def __init__(self, parser: "search_query.parser_wos.WOSParser"):
         self.search_str = parser.query_str
         self.parser = parser
+        # Search terms that are years and search fields (set in pre_linting())
+        self.year_count = 0
+        self.search_field_count = 0
 
     def pre_linting(self) -> None:
         """Performs a pre-linting"""
 
         self.check_search_fields_from_json()
+        self.check_tokens()
+
+        # The last token is not considered
+        self.year_count, self.search_field_count = self.count_years_and_fields(
+            self.parser.tokens[:-1]
+        )
+        self.check_year_without_search_field()
+
+        self.check_unmatched_parentheses()
+
+    def check_tokens(
+        self, span: typing.Optional[typing.Tuple[int, int]] = None
+    ) -> None:
+        """Performs the checks of the pre-linting that only depend on
+        the tokens and their neighbors (see WOSParser.apply_edit())
+
+        span: part of the search_str with the tokens (default: all)"""
+
         self.check_unknown_token_types()
         self.check_operator_capitalization()
         self.check_implicit_near()
@@ -42,38 +64,39 @@ class QueryLinter:
         self.check_fields()
         self.check_order_of_tokens()
 
-        index = 0
-        year_search_field_detected = False
-        count_search_fields = 0
-        while index < len(self.parser.tokens) - 1:
-            token = self.parser.tokens[index]
-
-            if "NEAR" in token.value:
+        for index, token in enumerate(self.parser.tokens[:-1]):
+            if token.is_proximity_operator():
                 self.check_near_distance_in_range(index=index)
 
-            if re.match(self.parser.YEAR_REGEX, token.value):
-                year_search_field_detected = True
-
-            if re.match(self.parser.SEARCH_FIELD_REGEX, token.value):
-                count_search_fields += 1
-
             self.check_wildcards(token=token)
 
-            index += 1
-
-        self.check_unsupported_wildcards()
+        self.check_unsupported_wildcards(span=span)
 
         self.handle_multiple_same_level_operators(tokens=self.parser.tokens, index=0)
 
-        if year_search_field_detected and count_search_fields < 2:
+    def count_years_and_fields(
+        self, tokens: typing.List[Token]
+    ) -> typing.Tuple[int, int]:
+        """Count the search terms that are years and the search fields."""
+        year_count = 0
+        search_field_count = 0
+        for token in tokens:
+            if token.is_search_term() and re.match(self.parser.YEAR_REGEX, token.value):
+                year_count += 1
+            elif token.is_field():
+                search_field_count += 1
+        return year_count, search_field_count
+
+    def check_year_without_search_field(self) -> None:
+        """Check for years without other search fields
+        (based on the counts of pre_linting())."""
+        if self.year_count and self.search_field_count < 2:
             # Year detected without other search fields
             self.parser.add_linter_message(
                 QueryErrorCode.YEAR_WITHOUT_SEARCH_FIELD,
-                position=token.position,
+                position=self.parser.tokens[-2].position,
             )
 
-        self.check_unmatched_parentheses()
-
     def check_search_fields_from_json(
         self,
     ) -> None:
@@ -129,7 +152,7 @@ class QueryLinter:
     def check_operator_capitalization(self) -> None:
         """Check if operators are capitalized."""
         for token in self.parser.tokens:
-            if re.match(self.parser.OPERATOR_REGEX, token.value):
+            if token.is_operator():
                 if token.value != token.value.upper():
                     self.parser.add_linter_message(
                         QueryErrorCode.OPERATOR_CAPITALIZATION,
@@ -283,11 +306,16 @@ class QueryLinter:
                 position=self.parser.tokens[index].position,
             )
 
-    def check_unsupported_wildcards(self) -> None:
+    def check_unsupported_wildcards(
+        self, span: typing.Optional[typing.Tuple[int, int]] = None
+    ) -> None:
         """Check for unsupported characters in the search string."""
 
+        start, end = span or (0, len(self.search_str))
         # Web of Science does not support "!"
-        for match in re.finditer(r"\!+", self.search_str):
+        for match in self.UNSUPPORTED_WILDCARD_PATTERN.finditer(
+            self.search_str, start, end
+        ):
             self.parser.add_linter_message(
                 QueryErrorCode.WILDCARD_UNSUPPORTED,
                 position=(match.start(), match.end()),
@@ -377,23 +405,38 @@ class QueryLinter:
         # This function introduces additional parantheses to the query tree
         # based on the precedence of the operators.
         # Precedence: NEAR > SAME > NOT > AND > OR
+        # Operator lists of the enclosing parentheses (explicit stack)
+        stack: typing.List[typing.List[str]] = []
         operator_list: typing.List[str] = []
         clear_list = False
-        while index < len(tokens):
+        while True:
+            if index >= len(tokens):
+                if not stack:
+                    return index
+                # Unclosed parenthesis: continue with the enclosing level
+                operator_list = stack.pop()
+                index += 1
+                continue
+
             token = tokens[index]
 
             if token.value == "(":
-                index = self.handle_multiple_same_level_operators(
-                    tokens=tokens, index=index + 1
-                )
+                stack.append(operator_list)
+                operator_list = []
+                index += 1
+                continue
 
             if token.value == ")":
-                return index
+                if not stack:
+                    return index
+                operator_list = stack.pop()
+                index += 1
+                continue
 
             # Operator change
             if (
                 operator_list
-                and re.match(self.parser.OPERATOR_REGEX, token.value.upper())
+                and token.is_operator()
                 and token.value.upper() not in operator_list
                 and token.value.upper() != "NOT"
             ):
@@ -409,10 +452,6 @@ class QueryLinter:
                 operator_list.clear()
                 clear_list = False
 
-            if (
-                token.value.upper() in ["NEAR", "AND", "OR", "NOT"]
-                or "NEAR" in token.value.upper()
-            ):
+            if token.is_operator():
                 operator_list.append(token.value.upper())
             index += 1
-        return index
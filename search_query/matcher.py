@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""Compiled record matcher."""
+from __future__ import annotations
+
+import re
+import typing
+
+from search_query.constants import Operators
+from search_query.field_accessors import get_field_keys
+from search_query.field_accessors import get_field_text
+from search_query.positions import compile_term_tokens
+from search_query.positions import merge_spans
+from search_query.positions import proximity_spans
+from search_query.positions import Span
+from search_query.positions import TokenPositions
+from search_query.term_scanner import TermScanner
+
+if typing.TYPE_CHECKING:  # pragma: no
+    from search_query.planner import QueryPlanner
+    from search_query.profiling import QueryProfile
+    from search_query.query import Query
+
+# Proximity operators (ordered or not)
+PROXIMITY_OPERATORS = {Operators.NEAR: False, Operators.WITHIN: True}
+
+# An evaluator receives the lowercased field values of a record (by record key),
+# the token positions of the fields (by (key, POSITIONS), created on first use),
+# the results of shared subtrees (by (SHARED, node id), set on first use)
+# and, for multi-term matching, the terms found in the fields (by (key, HITS))
+Evaluator = typing.Callable[[dict], bool]
+SpanEvaluator = typing.Callable[[TokenPositions], typing.List[Span]]
+HITS = "hits"
+POSITIONS = "positions"
+SHARED = "shared"
+
+
+class RecordMatcher:
+    """Reusable matcher that gives the same answers as Query.selects().
+
+    The query tree is compiled once: search terms are normalized,
+    wildcard regexes are compiled and the tree is turned into nested closures.
+    Each field of a record is lowercased once per record (not once per leaf),
+    and the record fields of each search field are resolved at compile time.
+    If a planner is given, it determines the order in which the children of
+    AND/OR nodes are evaluated. If a profile is given, the evaluation of each
+    node is counted and timed.
+
+    Shared subtrees (see compact.share_subtrees()) are compiled once and
+    evaluated at most once per record.
+
+    Proximity operators (NEAR/n, WITHIN/n) are evaluated on the token positions
+    of the field, which are indexed once per record and field (on first use).
+    Their operands match whole tokens (see RecordIndex).
+    """
+
+    def __init__(
+        self,
+        query: Query,
+        *,
+        planner: typing.Optional[QueryPlanner] = None,
+        profile: typing.Optional[QueryProfile] = None,
+    ) -> None:
+        self.query = query
+        self.planner = planner
+        self.profile = profile
+        self._keys: typing.Set[str] = set()
+        self._shared = _find_shared(query)
+        self._compiled: typing.Dict[int, Evaluator] = {}
+        self._evaluate = self._compile(query)
+        self.keys = tuple(sorted(self._keys))
+
+    def __call__(self, record_dict: dict) -> bool:
+        """Indicates whether the query selects a given record."""
+        return self._evaluate(
+            {key: get_field_text(record_dict, key) for key in self.keys}
+        )
+
+    def _compile(self, node: Query) -> Evaluator:
+        if id(node) in self._compiled:
+            return self._compiled[id(node)]
+        evaluator = self._compile_node(node)
+        if self.profile is not None:
+            evaluator = self.profile.wrap(node, evaluator)
+        if id(node) in self._shared:
+            evaluator = _memoize((SHARED, id(node)), evaluator)
+        self._compiled[id(node)] = evaluator
+        return evaluator
+
+    def _compile_node(self, node: Query) -> Evaluator:
+        if node.value == Operators.NOT:
+            return self._compile_not(node)
+        if node.value == Operators.AND:
+            return self._compile_and(node)
+        if node.value == Operators.OR:
+            return self._compile_or(node)
+        if node.value in PROXIMITY_OPERATORS:
+            return self._compile_proximity(node)
+        if node.operator:
+            raise ValueError(f"Operator not supported: {node.value}")
+        return self._compile_term(node)
+
+    def _compile_not(self, node: Query) -> Evaluator:
+        child = self._compile(node.children[0])
+
+        def _not(texts: dict) -> bool:
+            return not child(texts)
+
+        return _not
+
+    def _compile_children(self, node: Query) -> typing.Tuple[Evaluator, ...]:
+        children = node.children
+        if self.planner is not None:
+            children = self.planner.order_children(node)
+        return tuple(self._compile(child) for child in children)
+
+    def _compile_and(self, node: Query) -> Evaluator:
+        children = self._compile_children(node)
+
+        def _and(texts: dict) -> bool:
+            for child in children:
+                if not child(texts):
+                    return False
+            return True
+
+        return _and
+
+    def _compile_or(self, node: Query) -> Evaluator:
+        return _any_of(self._compile_children(node))
+
+    def _compile_term(self, node: Query) -> Evaluator:
+        keys = get_field_keys(node)
+        self._keys.update(keys)
+        value = normalize_term(node.value)
+        # Composite search fields match if one of their fields matches
+        return _any_of([self._compile_field_term(key, value) for key in keys])
+
+    def _compile_field_term(self, key: str, value: str) -> Evaluator:
+        # Handle wildcards
+        if "*" in value:
+            search = compile_wildcard(value).search
+
+            def _wildcard(texts: dict) -> bool:
+                return search(texts[key]) is not None
+
+            return _wildcard
+
+        # Match exact word
+        def _term(texts: dict) -> bool:
+            return value in texts[key]
+
+        return _term
+
+    def _compile_proximity(self, node: Query) -> Evaluator:
+        keys = get_proximity_keys(node)
+        self._keys.update(keys)
+        spans = self._compile_spans(node)
+
+        def _proximity(texts: dict) -> bool:
+            # All operands must match in the same field
+            for key in keys:
+                positions = texts.get((key, POSITIONS))
+                if positions is None:
+                    positions = texts[(key, POSITIONS)] = TokenPositions(texts[key])
+                if spans(positions):
+                    return True
+            return False
+
+        return _proximity
+
+    def _compile_spans(self, node: Query) -> SpanEvaluator:
+        """Compile an operand of a proximity operator (spans of its matches)."""
+        if node.value in PROXIMITY_OPERATORS:
+            ordered = PROXIMITY_OPERATORS[node.value]
+            distance = get_distance(node)
+            operands = [self._compile_spans(child) for child in node.children]
+
+            def _near(positions: TokenPositions) -> typing.List[Span]:
+                spans = operands[0](positions)
+                for operand in operands[1:]:
+                    if not spans:
+                        break
+                    spans = proximity_spans(
+                        spans, operand(positions), distance, ordered=ordered
+                    )
+                return spans
+
+            return _near
+
+        if node.value == Operators.OR:
+            alternatives = [self._compile_spans(child) for child in node.children]
+
+            def _or(positions: TokenPositions) -> typing.List[Span]:
+                return merge_spans(
+                    alternative(positions) for alternative in alternatives
+                )
+
+            return _or
+
+        if node.operator:
+            raise ValueError(
+                f"Operator not supported in proximity search: {node.value}"
+            )
+
+        tokens = compile_term_tokens(node.value)
+
+        def _phrase(positions: TokenPositions) -> typing.List[Span]:
+            return positions.find_phrase(tokens)
+
+        return _phrase
+
+
+class MultiTermMatcher(RecordMatcher):
+    """Record matcher that scans each field once for all of its terms.
+
+    The (non-wildcard) terms of each field are collected in a TermScanner,
+    which finds all of them in one pass over the field. The query tree is then
+    evaluated on the sets of terms found. This pays off for queries with many
+    (OR'd) synonyms, which would otherwise require one substring search per term.
+    """
+
+    def __init__(
+        self,
+        query: Query,
+        *,
+        planner: typing.Optional[QueryPlanner] = None,
+        profile: typing.Optional[QueryProfile] = None,
+    ) -> None:
+        self._terms: typing.Dict[str, typing.Set[str]] = {}
+        super().__init__(query, planner=planner, profile=profile)
+        self._scanners = {key: TermScanner(terms) for key, terms in self._terms.items()}
+
+    def __call__(self, record_dict: dict) -> bool:
+        """Indicates whether the query selects a given record."""
+        texts: dict = {key: get_field_text(record_dict, key) for key in self.keys}
+        for key, scanner in self._scanners.items():
+            texts[(key, HITS)] = scanner.scan(texts[key])
+        return self._evaluate(texts)
+
+    def _compile_field_term(self, key: str, value: str) -> Evaluator:
+        if "*" in value or not value:
+            return super()._compile_field_term(key, value)
+
+        self._terms.setdefault(key, set()).add(value)
+        hits_key = (key, HITS)
+
+        def _hit(texts: dict) -> bool:
+            return value in texts[hits_key]
+
+        return _hit
+
+
+def _any_of(evaluators: typing.Sequence[Evaluator]) -> Evaluator:
+    if len(evaluators) == 1:
+        return evaluators[0]
+
+    def _or(texts: dict) -> bool:
+        for evaluator in evaluators:
+            if evaluator(texts):
+                return True
+        return False
+
+    return _or
+
+
+def _memoize(key: typing.Tuple[str, int], evaluator: Evaluator) -> Evaluator:
+    """Evaluate once per record (the result is stored in the texts)."""
+
+    def _shared(texts: dict) -> bool:
+        result = texts.get(key)
+        if result is None:
+            result = texts[key] = evaluator(texts)
+        return result
+
+    return _shared
+
+
+def _find_shared(query: Query) -> typing.Set[int]:
+    """Get the ids of the nodes with several parents (shared subtrees)."""
+    seen: typing.Set[int] = set()
+    shared: typing.Set[int] = set()
+    nodes = [query]
+    while nodes:
+        for child in nodes.pop().children:
+            if id(child) in seen:
+                shared.add(id(child))
+            else:
+                seen.add(id(child))
+                nodes.append(child)
+    return shared
+
+
+def get_proximity_keys(node: Query) -> typing.Tuple[str, ...]:
+    """Get the record keys of a proximity operator from the keys of its terms.
+
+    Terms without a search field inherit the search field of the operator.
+    """
+    keys = set()
+    nodes = list(node.children)
+    while nodes:
+        child = nodes.pop()
+        if child.operator:
+            nodes.extend(child.children)
+        elif child.search_field is not None:
+            keys.add(get_field_keys(child))
+    if not keys:
+        return get_field_keys(node)
+    if len(keys) > 1:
+        raise ValueError(f"Proximity search across search fields: {sorted(keys)}")
+    (field_keys,) = keys
+    return field_keys
+
+
+def get_distance(node: Query) -> int:
+    """Get the distance of a proximity operator."""
+    if node.distance is None or node.distance < 0:
+        raise ValueError(f"Distance of {node.value} operator not set")
+    return node.distance
+
+
+def normalize_term(value: str) -> str:
+    """Lowercase a search term and strip its quotes."""
+    return value.lower().lstrip('"').rstrip('"')
+
+
+def compile_wildcard(value: str) -> typing.Pattern:
+    """Compile a (normalized) search term with * wildcards to a regex."""
+    return re.compile(value.replace("*", ".*"))
+
+
+def compile_matcher(
+    query: Query,
+    *,
+    planner: typing.Optional[QueryPlanner] = None,
+    multi_term: bool = False,
+    profile: typing.Optional[QueryProfile] = None,
+) -> RecordMatcher:
+    """Compile a query into a reusable record matcher."""
+    if multi_term:
+        return MultiTermMatcher(query, planner=planner, profile=profile)
+    return RecordMatcher(query, planner=planner, profile=profile)
@@ -26,11 +26,12 @@ class NEARQuery(Query):
         """
 
         super().__init__(
-            value=(Operators.NEAR + "/" + str(near_distance)),
+            value=Operators.NEAR,
             operator=True,
             children=children,
             search_field=search_field
             if isinstance(search_field, SearchField)
             else SearchField(search_field),
             position=position,
+            distance=near_distance,
         )
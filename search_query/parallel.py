@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Parallel selection of records."""
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import typing
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from search_query.columnar import ColumnarCorpus
+from search_query.columnar import is_corpus
+from search_query.compact import CompactQuery
+from search_query.compact import from_compact
+from search_query.compact import to_compact
+from search_query.record_index import bitset_to_ids
+
+if typing.TYPE_CHECKING:  # pragma: no
+    from search_query.matcher import RecordMatcher
+    from search_query.query import Query
+
+# Query and matcher of the worker process (set once by the initializer)
+_QUERY: typing.Optional[Query] = None
+_MATCHER: typing.Optional[RecordMatcher] = None
+# Columnar corpora opened by the worker process (by directory)
+_CORPORA: typing.Dict[str, ColumnarCorpus] = {}
+
+
+def _init_worker(compact_query: CompactQuery) -> None:
+    global _QUERY, _MATCHER  # pylint: disable=global-statement
+    _QUERY = from_compact(compact_query)
+    _MATCHER = _QUERY.compile_matcher()
+
+
+def _select_chunk(records: typing.List[dict]) -> typing.Tuple[int, typing.List[int]]:
+    assert _MATCHER is not None
+    return len(records), [i for i, record in enumerate(records) if _MATCHER(record)]
+
+
+def _select_file_chunk(
+    path: str, start: int, end: int
+) -> typing.Tuple[int, typing.List[int]]:
+    with open(path, "rb") as file:
+        file.seek(start)
+        lines = file.read(end - start).split(b"\n")
+    records = [json.loads(line) for line in lines if line.strip()]
+    return _select_chunk(records)
+
+
+def _select_corpus_chunk(
+    directory: str, start: int, end: int
+) -> typing.Tuple[int, typing.List[int]]:
+    assert _QUERY is not None
+    if directory not in _CORPORA:
+        _CORPORA[directory] = ColumnarCorpus(directory)
+    corpus = _CORPORA[directory]
+    return end - start, bitset_to_ids(corpus.evaluate(_QUERY, start=start, end=end))
+
+
+def _chunks(
+    records: typing.Iterable[dict], chunk_size: int
+) -> typing.Iterator[typing.List[dict]]:
+    iterator = iter(records)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _file_chunks(
+    path: typing.Union[str, Path], chunk_bytes: int
+) -> typing.Iterator[typing.Tuple[int, int]]:
+    """Split a JSONL file into byte ranges of complete lines."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as file:
+        start = 0
+        while start < size:
+            file.seek(min(start + chunk_bytes, size))
+            file.readline()
+            end = min(file.tell(), size)
+            yield start, end
+            start = end
+
+
+def _results_in_order(
+    tasks: typing.Iterator[Future], max_pending: int
+) -> typing.Iterator[typing.Any]:
+    """Submit the tasks lazily and yield their results in order."""
+    pending: typing.Deque[Future] = deque()
+    for task in tasks:
+        pending.append(task)
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def iter_select_parallel(
+    query: Query,
+    records: typing.Union[typing.Iterable[dict], str, Path],
+    *,
+    max_workers: typing.Optional[int] = None,
+    chunk_size: int = 1000,
+) -> typing.Iterator[int]:
+    """Yield the indices of the records selected by the query (in order).
+
+    The records (an iterable of dicts or the path of a JSONL file) are
+    partitioned into chunks that are evaluated in a process pool.
+    The query is sent to each worker once (in compact form) and compiled there.
+    Chunks of a JSONL file are byte ranges that the workers read and decode
+    themselves (chunk_size records are approximated by chunk_size kB).
+    Chunks of a columnar corpus (see build_corpus()) are ranges of
+    chunk_size records: the workers map the corpus once and share its pages.
+    Only a bounded number of chunks is in flight, so the records are
+    read lazily.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    max_workers = max_workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(to_compact(query),),
+    ) as executor:
+        tasks: typing.Iterator[Future]
+        if isinstance(records, (str, Path)) and is_corpus(records):
+            nr_records = ColumnarCorpus.read_meta(records)["nr_records"]
+            tasks = (
+                executor.submit(
+                    _select_corpus_chunk,
+                    str(records),
+                    start,
+                    min(start + chunk_size, nr_records),
+                )
+                for start in range(0, nr_records, chunk_size)
+            )
+        elif isinstance(records, (str, Path)):
+            tasks = (
+                executor.submit(_select_file_chunk, str(records), start, end)
+                for start, end in _file_chunks(records, chunk_size * 1024)
+            )
+        else:
+            tasks = (
+                executor.submit(_select_chunk, chunk)
+                for chunk in _chunks(records, chunk_size)
+            )
+
+        offset = 0
+        for nr_records, selected in _results_in_order(tasks, 2 * max_workers):
+            yield from (offset + i for i in selected)
+            offset += nr_records
+
+
+def select_parallel(
+    query: Query,
+    records: typing.Union[typing.Iterable[dict], str, Path],
+    *,
+    max_workers: typing.Optional[int] = None,
+    chunk_size: int = 1000,
+) -> typing.List[int]:
+    """Get the indices of the records selected by the query (in parallel)."""
+    return list(
+        iter_select_parallel(
+            query, records, max_workers=max_workers, chunk_size=chunk_size
+        )
+    )
@@ -2,7 +2,10 @@
 """Query parser."""
 from __future__ import annotations
 
-from abc import ABCMeta
+import copy
+import inspect
+import typing
+from collections import OrderedDict
 
 from search_query.constants import LinterMode
 from search_query.constants import PLATFORM
@@ -27,6 +30,70 @@ LIST_PARSERS = {
 }
 
 
+# Parse cache keys: (query_str, search_field_general, syntax, mode)
+ParseKey = typing.Tuple[str, str, str, str]
+
+
+class ParseResult(typing.NamedTuple):
+    """Parsed query tree with the messages of the linter."""
+
+    query: Query
+    # List parsers report the messages by list position (dict)
+    linter_messages: typing.Union[typing.List[dict], dict]
+
+
+class ParseCache:
+    """LRU cache of parsed queries (opt-in, see parse()).
+
+    Results are keyed on (query_str, search_field_general, syntax, mode).
+    The cache stores a private copy of each result and hands out copies,
+    so that callers can modify the returned query trees.
+    Failed parses (exceptions) are not cached, and the linter messages
+    of cached results are not printed again.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict[ParseKey, ParseResult] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def get(self, key: ParseKey) -> typing.Optional[ParseResult]:
+        """Get a copy of a cached result or None."""
+        result = self._results.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._results.move_to_end(key)
+        return _copy_result(result)
+
+    def put(self, key: ParseKey, result: ParseResult) -> None:
+        """Cache (a copy of) a result, evicting the least recently used one."""
+        if self.maxsize <= 0:
+            return
+        self._results[key] = _copy_result(result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all results (the counters are kept)."""
+        self._results.clear()
+
+    def stats(self) -> typing.Dict[str, int]:
+        """Get the counters of the cache."""
+        return {"entries": len(self._results), "hits": self.hits, "misses": self.misses}
+
+
+def _copy_result(result: ParseResult) -> ParseResult:
+    # Copied together: shared subtrees and search fields remain shared
+    return ParseResult(*copy.deepcopy(tuple(result)))
+
+
 # pylint: disable=too-many-return-statements
 def parse(
     query_str: str,
@@ -34,25 +101,73 @@ def parse(
     *,
     syntax: str = "wos",
     mode: str = LinterMode.STRICT,
+    cache: typing.Optional[ParseCache] = None,
+    max_workers: int = 1,
 ) -> Query:
-    """Parse a query string."""
+    """Parse a query string.
+
+    If a cache is given, queries that were parsed before are not parsed again.
+    Lines of list queries can be parsed in a process pool (max_workers > 1).
+    """
+    return parse_with_messages(
+        query_str,
+        search_field_general,
+        syntax=syntax,
+        mode=mode,
+        cache=cache,
+        max_workers=max_workers,
+    ).query
+
+
+def parse_with_messages(
+    query_str: str,
+    search_field_general: str,
+    *,
+    syntax: str = "wos",
+    mode: str = LinterMode.STRICT,
+    cache: typing.Optional[ParseCache] = None,
+    max_workers: int = 1,
+) -> ParseResult:
+    """Parse a query string and return the query with the linter messages."""
     syntax = syntax.lower()
+    if cache is None:
+        return _parse(query_str, search_field_general, syntax, mode, max_workers)
+
+    # The number of workers does not change the result
+    key = (query_str, search_field_general, syntax, mode)
+    result = cache.get(key)
+    if result is None:
+        result = _parse(query_str, search_field_general, syntax, mode, max_workers)
+        cache.put(key, result)
+    return result
+
 
+def _parse(
+    query_str: str,
+    search_field_general: str,
+    syntax: str,
+    mode: str,
+    max_workers: int = 1,
+) -> ParseResult:
     if "1." in query_str[:10]:
         if syntax not in LIST_PARSERS:
             raise ValueError(f"Invalid syntax: {syntax}")
 
-        return LIST_PARSERS[syntax](query_str, search_field_general, mode).parse()
+        list_parser = LIST_PARSERS[syntax](
+            query_str, search_field_general, mode, max_workers=max_workers
+        )
+        return ParseResult(list_parser.parse(), list_parser.linter_messages)
 
     if syntax not in PARSERS:
         raise ValueError(f"Invalid syntax: {syntax}")
 
     parser_class = PARSERS[syntax]
-    if isinstance(parser_class, ABCMeta):  # Check if it's an abstract class
+    if inspect.isabstract(parser_class):
         raise NotImplementedError(
             f"Cannot instantiate {parser_class} because it is abstract."
         )
-    return parser_class(query_str, search_field_general, mode).parse()
+    parser = parser_class(query_str, search_field_general, mode)
+    return ParseResult(parser.parse(), parser.linter_messages)
 
 
 def get_platform(platform_str: str) -> str:
@@ -6,15 +6,35 @@ import re
 import typing
 from abc import ABC
 from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor
 
 import search_query.exception as search_query_exception
 from search_query.constants import Colors
 from search_query.constants import LinterMode
 from search_query.constants import ListTokenTypes
+from search_query.constants import Operators
 from search_query.constants import QueryErrorCode
 from search_query.constants import Token
 from search_query.constants import TokenTypes
 from search_query.query import Query
+from search_query.query import SearchField
+
+
+def compile_token_pattern(
+    token_regexes: typing.Sequence[typing.Tuple[TokenTypes, str]], flags: int = 0
+) -> typing.Pattern:
+    """Combine the regexes of the token types into a single pattern.
+
+    Each regex is wrapped in a group named after its token type, so that
+    the type of a match is given by match.lastgroup (the first regex that
+    matches at a position wins).
+    """
+    return re.compile(
+        "|".join(
+            f"(?P<{token_type.name}>{regex})" for token_type, regex in token_regexes
+        ),
+        flags,
+    )
 
 
 class QueryStringParser(ABC):
@@ -23,6 +43,9 @@ class QueryStringParser(ABC):
     # Higher number=higher precedence
     PRECEDENCE = {"NOT": 2, "AND": 1, "OR": 0}
 
+    # Pattern of the tokens (see compile_token_pattern()), set by subclasses
+    TOKEN_PATTERN: typing.Optional[typing.Pattern] = None
+
     def __init__(
         self,
         query_str: str,
@@ -59,14 +82,24 @@ class QueryStringParser(ABC):
             }
         )
 
-    def get_token_types(self, tokens: list, *, legend: bool = False) -> str:
+    def lex(self) -> typing.Iterator[Token]:
+        """Split the query_str into typed tokens (single pass)."""
+        assert self.TOKEN_PATTERN is not None
+        for match in self.TOKEN_PATTERN.finditer(self.query_str):
+            yield Token(
+                value=match.group(),
+                type=TokenTypes[match.lastgroup],
+                position=match.span(),
+            )
+
+    def get_token_types(self, tokens: list[Token], *, legend: bool = False) -> str:
         """Print the token types"""
 
         mismatch = False
 
         for i in range(len(tokens) - 1):
-            _, (_, current_end) = tokens[i]
-            _, (next_start, _) = tokens[i + 1]
+            current_end = tokens[i].position[1]
+            next_start = tokens[i + 1].position[0]
             if current_end + 1 != next_start:
                 if re.match(r"\s*", self.query_str[current_end:next_start]):
                     continue
@@ -79,17 +112,17 @@ class QueryStringParser(ABC):
                 mismatch = True
 
         output = ""
-        for token, _ in tokens:
-            if self.is_term(token):
-                output += token
-            elif self.is_search_field(token):
-                output += f"{Colors.GREEN}{token}{Colors.END}"
-            elif self.is_operator(token):
-                output += f" {Colors.ORANGE}{token}{Colors.END} "
-            elif self.is_parenthesis(token):
-                output += f"{Colors.BLUE}{token}{Colors.END}"
+        for token in tokens:
+            if token.is_search_term():
+                output += token.value
+            elif token.is_field():
+                output += f"{Colors.GREEN}{token.value}{Colors.END}"
+            elif token.is_operator():
+                output += f" {Colors.ORANGE}{token.value}{Colors.END} "
+            elif token.is_parenthesis():
+                output += f"{Colors.BLUE}{token.value}{Colors.END}"
             else:
-                output += f"{Colors.RED}{token}{Colors.END}"
+                output += f"{Colors.RED}{token.value}{Colors.END}"
 
         if legend:
             output += f"\n Term\n {Colors.BLUE}Parenthesis{Colors.END}"
@@ -100,18 +133,19 @@ class QueryStringParser(ABC):
             raise ValueError
         return output
 
+    # Predicates for strings (e.g., values of query nodes).
+    # Tokens carry their type (set by the lexer), see Token.is_operator() etc.
     @abstractmethod
     def is_search_field(self, token: str) -> bool:
         """Token is search field"""
 
-    # TODO: should be attributes of Token  # pylint: disable=fixme
     def is_parenthesis(self, token: str) -> bool:
         """Token is parenthesis"""
         return token in ["(", ")"]
 
     def is_operator(self, token: str) -> bool:
         """Token is operator"""
-        return bool(re.match(r"^(AND|OR|NOT)$", token, re.IGNORECASE))
+        return token.upper() in {"AND", "OR", "NOT"}
 
     def is_term(self, token: str) -> bool:
         """Check if a token is a term."""
@@ -156,92 +190,40 @@ class QueryStringParser(ABC):
             return self.PRECEDENCE[token]
         return -1  # Not an operator
 
-    def add_higher_value(
-        self,
-        output: list[Token],
-        current_value: int,
-        value: int,
-        art_par: int,
-    ) -> tuple[list[Token], int]:
-        """Adds open parenthesis to higher value operators"""
-        temp: list[Token] = []
-        depth_lvl = 0  # Counter for actual parenthesis
-
-        while output:
-            # Get previous tokens until right operator has been reached
-            token = output.pop()
-
-            # Track already existing and correct query blocks
-            if token.type == TokenTypes.PARENTHESIS_CLOSED:
-                depth_lvl += 1
-            elif token.type == TokenTypes.PARENTHESIS_OPEN:
-                depth_lvl -= 1
-
-            temp.insert(0, token)
-
-            if (
-                token.type in [TokenTypes.LOGIC_OPERATOR, TokenTypes.PROXIMITY_OPERATOR]
-                and depth_lvl == 0
-            ):
-                # Insert open parenthesis
-                # depth_lvl ensures that already existing blocks are ignored
-
-                # Insert open parenthesis after operator
-                while current_value < value:
-                    self.add_linter_message(
-                        QueryErrorCode.IMPLICIT_PRECEDENCE,
-                        position=(-1, -1),
-                    )
-                    # Insert open parenthesis after operator
-                    temp.insert(
-                        1,
-                        Token(
-                            value="(",
-                            type=TokenTypes.PARENTHESIS_OPEN,
-                            position=(-1, -1),
-                        ),
-                    )
-                    current_value += 1
-                    art_par += 1
-                break
-
-        return temp, art_par
-
-    # pylint: disable=too-many-branches
-    def add_artificial_parentheses_for_operator_precedence(
-        self,
-        index: int = 0,
-        output: typing.Optional[list] = None,
-    ) -> tuple[int, list[Token]]:
+    def add_artificial_parentheses_for_operator_precedence(self) -> None:
         """
         Adds artificial parentheses with position (-1, -1)
         to enforce operator precedence.
+
+        Operators of higher precedence are grouped with their operands, e.g.,
+        a OR b AND c NOT d -> a OR (b AND (c NOT d)) and
+        a AND b OR c -> (a AND b) OR c (operators with the same precedence
+        remain at the same level). The tokens are processed in one pass:
+        each level of (real) parentheses keeps a stack of groups
+        (precedence, index of the first output token, artificial).
+        The positions of the artificial opening parentheses are recorded and
+        inserted when the tokens are replaced.
         """
-        if output is None:
-            output = []
-        # Value of operator
-        value = 0
-        # Value of previous operator
-        current_value = -1
-        # Added artificial parentheses
-        art_par = 0
-
-        while index < len(self.tokens):
-            # Forward iteration through tokens
-
-            if self.tokens[index].type == TokenTypes.PARENTHESIS_OPEN:
-                output.append(self.tokens[index])
-                index += 1
-                index, output = self.add_artificial_parentheses_for_operator_precedence(
-                    index, output
-                )
-                continue
 
-            if self.tokens[index].type == TokenTypes.PARENTHESIS_CLOSED:
-                output.append(self.tokens[index])
-                index += 1
-                # Add closed parenthesis in case there are still open ones
-                while art_par > 0:
+        output: list[Token] = []
+        # Number of artificial opening parentheses before output[i]
+        opening: typing.Dict[int, int] = {}
+        # Enclosing levels of real parentheses
+        levels: list[tuple[list, int, int]] = []
+        # Current level: groups, start of the level, start of the last operand
+        groups: list[tuple[int, int, bool]] = []
+        level_start = 0
+        operand_start = 0
+        expect_operand = True
+        implicit_precedence = False
+
+        def open_before(index: int) -> None:
+            opening[index] = opening.get(index, 0) + 1
+
+        def close_groups() -> None:
+            # Close the artificial groups of the level
+            for _, _, artificial in groups:
+                if artificial:
                     output.append(
                         Token(
                             value=")",
@@ -249,149 +231,129 @@ class QueryStringParser(ABC):
                             position=(-1, -1),
                         )
                     )
-                    art_par -= 1
-                return index, output
-
-            if self.tokens[index].type in [
-                TokenTypes.LOGIC_OPERATOR,
-                TokenTypes.PROXIMITY_OPERATOR,
-            ]:
-                value = self.get_precedence(self.tokens[index].value)
-
-                if current_value in (value, -1):
-                    # Same precedence → just add to output
-                    output.append(self.tokens[index])
-                    current_value = value
-
-                elif value > current_value:
-                    # Higher precedence → wrap previous part in parentheses
-                    temp, art_par = self.add_higher_value(
-                        output, current_value, value, art_par
-                    )
 
-                    output.extend(temp)
-                    output.append(self.tokens[index])
-                    current_value = value
-
-                elif value < current_value:
-                    # Insert close parenthesis for each point in value difference
-                    while current_value > value:
-                        # Lower precedence → close parenthesis
-                        output.append(
-                            Token(
-                                value=")",
-                                type=TokenTypes.PARENTHESIS_CLOSED,
-                                position=(-1, -1),
-                            )
-                        )
-                        current_value -= 1
-                        art_par -= 1
-                    output.append(self.tokens[index])
-                    current_value = value
+        for token in self.tokens:
+            if token.type == TokenTypes.PARENTHESIS_OPEN:
+                if expect_operand:
+                    operand_start = len(output)
+                output.append(token)
+                levels.append((groups, level_start, operand_start))
+                groups, level_start, expect_operand = [], len(output), True
+                continue
 
-                index += 1
+            if token.type == TokenTypes.PARENTHESIS_CLOSED:
+                if not levels:
+                    # Unmatched parenthesis (reported by the linter)
+                    return
+                close_groups()
+                output.append(token)
+                groups, level_start, operand_start = levels.pop()
+                expect_operand = False
                 continue
 
-            # Default: search terms, fields, etc.
-            output.append(self.tokens[index])
-            index += 1
+            if not token.is_operator():
+                # Search terms, fields, etc.
+                if expect_operand:
+                    operand_start = len(output)
+                    expect_operand = False
+                output.append(token)
+                continue
 
-        # Add parenthesis in case there are missing ones
-        if art_par > 0:
-            while art_par > 0:
-                output.append(
-                    Token(
-                        value=")", type=TokenTypes.PARENTHESIS_CLOSED, position=(-1, -1)
+            value = self.get_precedence(token.value)
+            if value == -1:
+                # Precedence not defined: remains at the current level
+                pass
+            elif not groups:
+                # First operator: starts with the first operand of the level
+                groups.append((value, level_start, False))
+            elif value > groups[-1][0]:
+                # Higher precedence: group with the previous operand
+                if not implicit_precedence:
+                    self.add_linter_message(
+                        QueryErrorCode.IMPLICIT_PRECEDENCE,
+                        position=(-1, -1),
                     )
-                )
-                art_par -= 1
-        if art_par < 0:
-            while art_par < 0:
-                output.insert(
-                    0,
-                    Token(
-                        value="(", type=TokenTypes.PARENTHESIS_OPEN, position=(-1, -1)
-                    ),
-                )
-                art_par += 1
-
-        if index == len(self.tokens):
-            output = self.flatten_redundant_artificial_nesting(output)
-            self.tokens = output
-
-        return index, output
+                    implicit_precedence = True
+                groups.append((value, operand_start, True))
+                open_before(operand_start)
+            elif value < groups[-1][0]:
+                # Lower precedence: close the groups of higher precedence
+                while groups and groups[-1][0] > value:
+                    _, operand_start, artificial = groups.pop()
+                    if not artificial:
+                        open_before(operand_start)
+                    output.append(
+                        Token(
+                            value=")",
+                            type=TokenTypes.PARENTHESIS_CLOSED,
+                            position=(-1, -1),
+                        )
+                    )
+                if not groups:
+                    groups.append((value, operand_start, False))
+                elif groups[-1][0] < value:
+                    groups.append((value, operand_start, True))
+                    open_before(operand_start)
 
-    def flatten_redundant_artificial_nesting(self, tokens: list[Token]) -> list[Token]:
-        """
-        Flattens redundant artificial nesting:
-        If two artificial open parens are followed eventually by
-        two artificial close parens at the same level, removes the outer ones.
-        """
+            output.append(token)
+            expect_operand = True
 
+        # Unclosed parentheses
         while True:
-            len_initial = len(tokens)
-
-            output = []
-            i = 0
-            while i < len(tokens):
-                # Look ahead for double artificial opening
-                if (
-                    i + 1 < len(tokens)
-                    and tokens[i].type == TokenTypes.PARENTHESIS_OPEN
-                    and tokens[i + 1].type == TokenTypes.PARENTHESIS_OPEN
-                    and tokens[i].position == (-1, -1)
-                    and tokens[i + 1].position == (-1, -1)
-                ):
-                    # Look for matching double closing
-                    inner_start = i + 2
-                    depth = 2
-                    j = inner_start
-                    while j < len(tokens) and depth > 0:
-                        if tokens[j].type == TokenTypes.PARENTHESIS_OPEN and tokens[
-                            j
-                        ].position == (-1, -1):
-                            depth += 1
-                        elif tokens[j].type == TokenTypes.PARENTHESIS_CLOSED and tokens[
-                            j
-                        ].position == (-1, -1):
-                            depth -= 1
-                        j += 1
-
-                    # Check for double artificial closing
-                    if (
-                        j < len(tokens)
-                        and tokens[j - 1].type == TokenTypes.PARENTHESIS_CLOSED
-                        and tokens[j - 2].type == TokenTypes.PARENTHESIS_CLOSED
-                        and tokens[j - 1].position == (-1, -1)
-                        and tokens[j - 2].position == (-1, -1)
-                    ):
-                        # Skip outer pair
-                        output.extend(tokens[i + 1 : j - 1])
-                        i = j
-
-                        continue
-
-                output.append(tokens[i])
-                i += 1
-
-            # Repeat for multiple nestings
-            if len_initial == len(output):
+            close_groups()
+            if not levels:
                 break
-            tokens = output
+            groups = levels.pop()[0]
 
-        return output
+        tokens: list[Token] = []
+        for index, token in enumerate(output):
+            for _ in range(opening.get(index, 0)):
+                tokens.append(
+                    Token(
+                        value="(",
+                        type=TokenTypes.PARENTHESIS_OPEN,
+                        position=(-1, -1),
+                    )
+                )
+            tokens.append(token)
+        self.tokens = tokens
 
     @abstractmethod
     def parse(self) -> Query:
         """Parse the query."""
 
 
+def _parse_list_line(
+    parser_class: type[QueryStringParser],
+    query_str: str,
+    search_field_general: str,
+    mode: str,
+) -> typing.Tuple[typing.Optional[Query], typing.List[dict]]:
+    """Parse a line of a list query (in a worker process).
+
+    Returns the query (None if parsing failed) and the linter messages.
+    """
+    parser = parser_class(query_str, search_field_general, mode=mode)
+    try:
+        return parser.parse(), parser.linter_messages
+    except search_query_exception.SearchQueryException:
+        return None, parser.linter_messages
+
+
 class QueryListParser:
-    """QueryListParser"""
+    """QueryListParser
+
+    If max_workers > 1, the lines that do not refer to other lines are
+    parsed in a process pool before the references are resolved.
+    """
 
     LIST_ITEM_REGEX = r"^(\d+).\s+(.*)$"
     GENERAL_ERROR_POSITION = -1
 
+    # Operators in the lines combining list items (e.g., "#1 OR #2 AND #3")
+    OPERATOR_PRECEDENCE = {Operators.NOT: 2, Operators.AND: 1, Operators.OR: 0}
+    OPERATOR_ALIASES = {"&": Operators.AND, "|": Operators.OR}
+
     def __init__(
         self,
         *,
@@ -399,13 +361,17 @@ class QueryListParser:
         parser_class: type[QueryStringParser],
         search_field_general: str,
         mode: str = LinterMode.STRICT,
+        max_workers: int = 1,
     ) -> None:
         self.query_list = query_list
         self.parser_class = parser_class
         self.search_field_general = search_field_general
         self.mode = mode
+        self.max_workers = max_workers
         self.linter_messages: dict = {}
         self.fatal_linter_err = False
+        self.query_dict: dict = {}
+        self.references: typing.Dict[str, str] = {}
 
     def add_linter_message(
         self,
@@ -468,87 +434,256 @@ class QueryListParser:
             "get_token_str method must be implemented by inheriting classes"
         )
 
-    def _replace_token_nr_by_query(
-        self, query_list: list, token_nr: str, token_content: dict
-    ) -> None:
-        for i, (content, pos) in enumerate(query_list):
-            token_str = self.get_token_str(token_nr)
-            if token_str in content:
-                query_list.pop(i)
-
-                content_before = content[: content.find(token_str)]
-                content_before_pos = (pos[0], pos[0] + len(content_before))
-                content_after = content[content.find(token_str) + len(token_str) :]
-                content_after_pos = (
-                    content_before_pos[1] + len(token_str),
-                    content_before_pos[1] + len(content_after) + len(token_str),
-                )
+    def get_operator_search_field(self) -> typing.Optional[SearchField]:
+        """Search field of the operators combining list items.
+
+        Corresponds to the search field of operators in the platform parser.
+        """
+        return None
+
+    def _shift_positions(self, query: Query, offset: int) -> None:
+        """Shift the positions of a line query to positions in the list query."""
+        shifted: typing.Set[int] = set()
+        stack = [query]
+        while stack:
+            node = stack.pop()
+            # Search fields (and subtrees) may be shared by several nodes
+            for item in (node, node.search_field):
+                if item is None or id(item) in shifted:
+                    continue
+                shifted.add(id(item))
+                if item.position is not None and item.position[0] >= 0:
+                    item.position = (
+                        item.position[0] + offset,
+                        item.position[1] + offset,
+                    )
+                if item is node:
+                    stack.extend(node.children)
+
+    def _compile_line_pattern(self) -> typing.Pattern:
+        """Compile the pattern of the tokens in the lines of the list."""
+        references = sorted(map(re.escape, self.references), key=len, reverse=True)
+        # Undefined references (#n) are reported when they are parsed
+        references.append(r"#\d+")
+        return re.compile(
+            rf"(?P<reference>(?<![\w#])(?:{'|'.join(references)})(?!\w))"
+            r"|(?P<operator>\b(?:AND|OR|NOT)\b|&|\|)"
+            r"|(?P<parenthesis_open>\()"
+            r"|(?P<parenthesis_closed>\))"
+            r'|(?P<term>"[^"]*"|\[[^\]]*\]|[^\s()"\[\]]+)',
+            re.IGNORECASE,
+        )
+
+    def _tokenize_line(self, content: str, pattern: typing.Pattern) -> list:
+        """Tokenize a line (consecutive terms are combined in one token)."""
+        line_tokens: list = []
+        for match in pattern.finditer(content):
+            token_type = match.lastgroup
+            if token_type == "term" and line_tokens and line_tokens[-1][0] == "term":
+                start = line_tokens[-1][1][0]
+                line_tokens[-1] = ("term", (start, match.end()))
+                continue
+            line_tokens.append((token_type, match.span()))
+        return line_tokens
+
+    def _syntax_error(
+        self, error: QueryErrorCode, node: dict, span: tuple
+    ) -> search_query_exception.QuerySyntaxError:
+        """Create the exception for a span of a line."""
+        offset = node["content_pos"][0]
+        return search_query_exception.QuerySyntaxError(
+            msg=error.message,
+            query_string=self.query_list,
+            position=(span[0] + offset, span[1] + offset),
+        )
+
+    def _parse_query_string(self, node: dict, span: tuple) -> Query:
+        """Parse (a part of) a line with the parser of the platform."""
+        offset = node["content_pos"][0] + span[0]
+        query_string = node["node_content"][span[0] : span[1]]
+        try:
+            query = self.parser_class(
+                query_string, self.search_field_general, mode=self.mode
+            ).parse()
+        except search_query_exception.QuerySyntaxError as exc:
+            # The positions of the error refer to the (list) query
+            position = exc.position
+            if position[0] >= 0:
+                position = (position[0] + offset, position[1] + offset)
+            raise search_query_exception.QuerySyntaxError(
+                msg=exc.message.split("\n", maxsplit=1)[0],
+                query_string=self.query_list,
+                position=position,
+            ) from exc
+        self._shift_positions(query, offset)
+        return query
 
-                new_content = token_content["node_content"]
-                new_pos = token_content["content_pos"]
+    def _combine_operands(self, operands: list, operators: list) -> Query:
+        """Combine operands connected by operators (OPERATOR_PRECEDENCE)"""
+        if not operators:
+            return operands[0]
+
+        # Split at the operators of the lowest precedence
+        lowest = min(self.OPERATOR_PRECEDENCE[operator] for operator in operators)
+        groups = []
+        split_operators = []
+        start = 0
+        for i, operator in enumerate(operators):
+            if self.OPERATOR_PRECEDENCE[operator] == lowest:
+                groups.append(
+                    self._combine_operands(operands[start : i + 1], operators[start:i])
+                )
+                split_operators.append(operator)
+                start = i + 1
+        groups.append(self._combine_operands(operands[start:], operators[start:]))
+
+        # Operators of the same precedence are applied from left to right,
+        # consecutive operators of the same type are combined in one query
+        query = groups[0]
+        current_operator = ""
+        children: typing.List[Query] = []
+        for operator, group in zip(split_operators, groups[1:]):
+            if operator != current_operator and children:
+                query = Query(
+                    value=current_operator,
+                    operator=True,
+                    search_field=self.get_operator_search_field(),
+                    children=[query] + children,
+                )
+                children = []
+            current_operator = operator
+            children.append(group)
+        return Query(
+            value=current_operator,
+            operator=True,
+            search_field=self.get_operator_search_field(),
+            children=[query] + children,
+        )
 
-                if content_after:
-                    query_list.insert(i, (content_after, content_after_pos))
+    def _parse_line_operand(self, node: dict, line_tokens: list, index: int) -> tuple:
+        """Parse a list reference, a term or a parenthesized expression."""
+        if index >= len(line_tokens):
+            end = len(node["node_content"])
+            raise self._syntax_error(
+                QueryErrorCode.INVALID_TOKEN_SEQUENCE, node, (end, end)
+            )
 
-                # Insert the sub-query from the list with "artificial parentheses"
-                # (positions with length 0)
-                query_list.insert(i, (")", (-1, -1)))
-                query_list.insert(i, (new_content, new_pos))
-                query_list.insert(i, ("(", (-1, -1)))
+        token_type, span = line_tokens[index]
+        if token_type == "reference":
+            reference = node["node_content"][span[0] : span[1]].upper()
+            referenced_node = self.query_dict.get(self.references.get(reference, ""))
+            # Lines can only refer to preceding lines (parsed before)
+            if not referenced_node or "query" not in referenced_node:
+                raise self._syntax_error(
+                    QueryErrorCode.INVALID_LIST_REFERENCE, node, span
+                )
+            return referenced_node["query"], index + 1
 
-                if content_before:
-                    query_list.insert(i, (content_before, content_before_pos))
+        if token_type == "term":
+            return self._parse_query_string(node, span), index + 1
 
+        if token_type == "parenthesis_open":
+            query, index = self._parse_line_expression(node, line_tokens, index + 1)
+            if (
+                index < len(line_tokens)
+                and line_tokens[index][0] == "parenthesis_closed"
+            ):
+                return query, index + 1
+            if index < len(line_tokens):
+                span = line_tokens[index][1]
+
+        raise self._syntax_error(QueryErrorCode.INVALID_TOKEN_SEQUENCE, node, span)
+
+    def _parse_line_expression(
+        self, node: dict, line_tokens: list, index: int
+    ) -> tuple:
+        """Parse operands connected by operators, starting at index."""
+        operands = []
+        operators = []
+        while True:
+            operand, index = self._parse_line_operand(node, line_tokens, index)
+            operands.append(operand)
+            if index >= len(line_tokens) or line_tokens[index][0] != "operator":
                 break
+            span = line_tokens[index][1]
+            operator = node["node_content"][span[0] : span[1]].upper()
+            operators.append(self.OPERATOR_ALIASES.get(operator, operator))
+            index += 1
 
-    def dict_to_positioned_list(self, tokens: dict) -> list:
-        """Convert a node to a positioned list."""
+        return self._combine_operands(operands, operators), index
 
-        root_node = list(tokens.values())[-1]
-        query_list = [(root_node["node_content"], root_node["content_pos"])]
+    def _parse_reference_line(self, node: dict, line_tokens: list) -> Query:
+        """Parse a line combining list items (e.g., "#1 AND (#2 OR #3)")."""
+        query, index = self._parse_line_expression(node, line_tokens, 0)
+        if index < len(line_tokens):
+            raise self._syntax_error(
+                QueryErrorCode.INVALID_TOKEN_SEQUENCE, node, line_tokens[index][1]
+            )
+        return query
 
-        for token_nr, token_content in reversed(tokens.items()):
-            # iterate over query_list if token_nr is in the content,
-            # split the content and insert the token_content, updating the content_pos
-            self._replace_token_nr_by_query(query_list, token_nr, token_content)
+    def _parse_lines(self, node_nrs: typing.List[str]) -> dict:
+        """Parse lines of the list in a process pool (if max_workers > 1).
 
-        return query_list
+        Returns the query (None if parsing failed) and the linter messages
+        of each line (by node_nr).
+        """
+        if self.max_workers <= 1 or len(node_nrs) < 2:
+            return {}
+
+        contents = [self.query_dict[node_nr]["node_content"] for node_nr in node_nrs]
+        nr_lines = len(contents)
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(
+                _parse_list_line,
+                [self.parser_class] * nr_lines,
+                contents,
+                [self.search_field_general] * nr_lines,
+                [self.mode] * nr_lines,
+                chunksize=max(1, nr_lines // (4 * self.max_workers)),
+            )
+            return dict(zip(node_nrs, results))
 
     def parse(self) -> Query:
-        """Parse the query in list format."""
+        """Parse the query in list format.
 
-        tokens = self.tokenize_list()
+        Each line is parsed once. Lines combining list items refer to the
+        queries of the preceding lines, which are shared (not copied) when
+        they are referenced more than once. The last line is the root.
 
-        query_list = self.dict_to_positioned_list(tokens)
-        query_string = "".join([query[0] for query in query_list])
-        search_field_general = self.search_field_general
-
-        try:
-            query = self.parser_class(query_string, search_field_general).parse()
+        Positions of nodes and search fields refer to the list query.
+        The operators combining list items have no position.
+        """
 
-        except search_query_exception.QuerySyntaxError as exc:
-            # Correct positions and query string
-            # to display the error for the original (list) query
-            new_pos = exc.position
-            for content, position in query_list:
-                # Note: artificial parentheses cannot be ignored here
-                # because they were counted in teh query_string
-                segment_length = len(content)
-
-                if new_pos[0] - segment_length >= 0:
-                    new_pos = (new_pos[0] - segment_length, new_pos[1] - segment_length)
-                    continue
-                segment_beginning = position[0]
-                new_pos = (
-                    new_pos[0] + segment_beginning,
-                    new_pos[1] + segment_beginning,
-                )
-                exc.position = new_pos
-                break
+        self.query_dict = self.tokenize_list()
+        self.references = {
+            self.get_token_str(node_nr).upper(): node_nr for node_nr in self.query_dict
+        }
+        pattern = self._compile_line_pattern()
+
+        line_tokens = {
+            node_nr: self._tokenize_line(node["node_content"], pattern)
+            for node_nr, node in self.query_dict.items()
+        }
+        reference_lines = {
+            node_nr
+            for node_nr, tokens in line_tokens.items()
+            if any(token_type == "reference" for token_type, _ in tokens)
+        }
+        parsed_lines = self._parse_lines(
+            [node_nr for node_nr in self.query_dict if node_nr not in reference_lines]
+        )
 
-            exc.query_string = self.query_list
-            raise search_query_exception.QuerySyntaxError(
-                msg="", query_string=self.query_list, position=exc.position
-            )
+        for node_nr, node in self.query_dict.items():
+            if node_nr in reference_lines:
+                node["query"] = self._parse_reference_line(node, line_tokens[node_nr])
+                continue
+            query, _ = parsed_lines.get(node_nr, (None, []))
+            if query is None:
+                # Errors are reported (with their positions in the list)
+                # when the line is parsed here
+                query = self._parse_query_string(node, (0, len(node["node_content"])))
+            else:
+                self._shift_positions(query, node["content_pos"][0])
+            node["query"] = query
 
-        return query
+        return list(self.query_dict.values())[-1]["query"]
@@ -11,6 +11,7 @@ from search_query.constants import QueryErrorCode
 from search_query.constants import Token
 from search_query.constants import TokenTypes
 from search_query.linter_ebsco import EBSCOQueryStringValidator
+from search_query.parser_base import compile_token_pattern
 from search_query.parser_base import QueryListParser
 from search_query.parser_base import QueryStringParser
 from search_query.parser_validation import QueryStringValidator
@@ -29,13 +30,14 @@ class EBSCOParser(QueryStringParser):
     SEARCH_FIELD_REGEX = r"\b(TI|AU|TX|AB|SO|SU|IS|IB|DE|LA|KW)\b"
     SEARCH_TERM_REGEX = r"\"[^\"]*\"|\b(?!S\d+\b)[^()\s]+[\*\+\?]?"
 
-    pattern = "|".join(
+    TOKEN_PATTERN = compile_token_pattern(
         [
-            PARENTHESIS_REGEX,
-            LOGIC_OPERATOR_REGEX,
-            PROXIMITY_OPERATOR_REGEX,
-            SEARCH_FIELD_REGEX,
-            SEARCH_TERM_REGEX,
+            (TokenTypes.PARENTHESIS_OPEN, r"\("),
+            (TokenTypes.PARENTHESIS_CLOSED, r"\)"),
+            (TokenTypes.LOGIC_OPERATOR, LOGIC_OPERATOR_REGEX),
+            (TokenTypes.PROXIMITY_OPERATOR, PROXIMITY_OPERATOR_REGEX),
+            (TokenTypes.FIELD, SEARCH_FIELD_REGEX),
+            (TokenTypes.SEARCH_TERM, SEARCH_TERM_REGEX),
         ]
     )
 
@@ -159,42 +161,16 @@ class EBSCOParser(QueryStringParser):
         validator.check_search_field_general(strict=self.mode)
 
         previous_token_type = None
-        token_type = TokenTypes.UNKNOWN
-
-        for match in re.finditer(self.pattern, self.query_str):
-            value = match.group()
-            value = value.strip()
-            start, end = match.span()
-
-            # Determine token type
-            if re.fullmatch(self.PARENTHESIS_REGEX, value):
-                if value == "(":
-                    token_type = TokenTypes.PARENTHESIS_OPEN
-                else:
-                    token_type = TokenTypes.PARENTHESIS_CLOSED
-            elif re.fullmatch(self.LOGIC_OPERATOR_REGEX, value):
-                token_type = TokenTypes.LOGIC_OPERATOR
-            elif re.fullmatch(self.PROXIMITY_OPERATOR_REGEX, value):
-                token_type = TokenTypes.PROXIMITY_OPERATOR
-            elif re.fullmatch(self.SEARCH_FIELD_REGEX, value):
-                token_type = TokenTypes.FIELD
-            elif re.fullmatch(self.SEARCH_TERM_REGEX, value):
-                token_type = TokenTypes.SEARCH_TERM
-            else:
-                self.add_linter_message(QueryErrorCode.TOKENIZING_FAILED, (start, end))
-                continue
 
+        for token in self.lex():
             # Validate token positioning to ensure logical structure
             validator.validate_token_position(
-                token_type, previous_token_type, (start, end)
+                token.type, previous_token_type, token.position
             )
             # Set token_type for continoued validation
-            previous_token_type = token_type
+            previous_token_type = token.type
 
-            # Append token with its type and position to self.tokens
-            self.tokens.append(
-                Token(value=value, type=token_type, position=(start, end))
-            )
+            self.tokens.append(token)
 
         # Combine subsequent search_terms in case of no quotation marks
         self.combine_subsequent_tokens()
@@ -407,13 +383,21 @@ class EBSCOParser(QueryStringParser):
 class EBSCOListParser(QueryListParser):
     """Parser for EBSCO (list format) queries."""
 
-    def __init__(self, query_list: str, search_field_general: str, mode: str) -> None:
+    def __init__(
+        self,
+        query_list: str,
+        search_field_general: str,
+        mode: str,
+        *,
+        max_workers: int = 1,
+    ) -> None:
         """Initialize with a query list and use EBSCOParser for parsing each query."""
         super().__init__(
             query_list=query_list,
             parser_class=EBSCOParser,
             search_field_general=search_field_general,
             mode=mode,
+            max_workers=max_workers,
         )
 
     def get_token_str(self, token_nr: str) -> str:
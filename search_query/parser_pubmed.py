@@ -3,6 +3,7 @@
 import re
 
 from search_query.constants import Fields
+from search_query.constants import LinterMode
 from search_query.constants import Operators
 from search_query.constants import PLATFORM
 from search_query.constants import PLATFORM_FIELD_TRANSLATION_MAP
@@ -153,125 +154,93 @@ class PubmedParser(QueryStringParser):
     def parse_query_tree(self, tokens: list) -> Query:
         """Parse a query from a list of tokens"""
 
-        if self.is_compound_query(tokens):
-            query = self._parse_compound_query(tokens)
-
-        elif self.is_nested_query(tokens):
-            query = self._parse_nested_query(tokens)
-
-        elif self.is_term_query(tokens):
-            query = self._parse_search_term(tokens)
-
-        else:
+        query, index = self._parse_compound_query(tokens, 0)
+        # All tokens must belong to the query (e.g., no unmatched parenthesis)
+        if index != len(tokens):
             raise ValueError()
-
         return query
 
-    def is_term_query(self, tokens: list) -> bool:
-        """Check if the query is a search term"""
-        return tokens[0].type == TokenTypes.SEARCH_TERM and len(tokens) <= 2
-
-    def is_compound_query(self, tokens: list) -> bool:
-        """Check if the query is a compound query"""
-        return bool(self._get_operator_indices(tokens))
-
-    def is_nested_query(self, tokens: list) -> bool:
-        """Check if the query is nested in parentheses"""
-        return (
-            tokens[0].type == TokenTypes.PARENTHESIS_OPEN
-            and tokens[-1].type == TokenTypes.PARENTHESIS_CLOSED
-        )
-
-    def _get_operator_indices(self, tokens: list) -> list:
-        """Get indices of top-level operators in the token list"""
-        operator_indices = []
-
-        i = 0
-        first_operator_found = False
-        first_operator = ""
-        # Iterate over tokens in reverse
-        # to find and save positions of consecutive top-level operators
-        # matching the first encountered until a different type is found.
-        for token in reversed(tokens):
-            token_index = tokens.index(token)
-
-            if token.type == TokenTypes.PARENTHESIS_OPEN:
-                i = i + 1
-            elif token.type == TokenTypes.PARENTHESIS_CLOSED:
-                i = i - 1
-
-            if i == 0 and token.type == TokenTypes.LOGIC_OPERATOR:
-                operator = self.get_operator_type(token.value)
-                if not first_operator_found:
-                    first_operator = operator
-                    first_operator_found = True
-                if operator == first_operator:
-                    operator_indices.append(token_index)
-                else:
-                    break
-
-        return operator_indices
-
-    def _parse_compound_query(self, tokens: list) -> Query:
-        """Parse a compound query
-        consisting of two or more subqueries connected by a boolean operator"""
-
-        operator_indices = self._get_operator_indices(tokens)
-
-        # Divide tokens into separate lists based on top-level operator positions.
-        token_lists = []
-        i = 0
-        for position in reversed(operator_indices):
-            token_lists.append(tokens[i:position])
-            i = position + 1
-        token_lists.append(tokens[i:])
-
-        # The token lists represent the subqueries (children
-        # of the compound query and are parsed individually.
-        children = []
-        for token_list in token_lists:
-            query = self.parse_query_tree(token_list)
-            children.append(query)
-
-        operator_type = self.get_operator_type(tokens[operator_indices[0]].value)
-
-        query_start_pos = tokens[0].position[0]
-        query_end_pos = tokens[-1].position[1]
-
+    def _parse_compound_query(self, tokens: list, index: int) -> tuple:
+        """Parse subqueries connected by boolean operators, starting at index.
+
+        Operators are applied from left to right (no precedence), and
+        consecutive operators of the same type are combined in one query:
+        'a OR b OR c AND d' is parsed as AND[OR[a, b, c], d].
+        Returns the query and the index of the first token after it
+        (the closing parenthesis or the end of the tokens).
+        """
+        query_start_pos = tokens[index].position[0] if index < len(tokens) else -1
+        query, index = self._parse_subquery(tokens, index)
+
+        operator_type = ""
+        children: list = []
+        while index < len(tokens) and tokens[index].type == TokenTypes.LOGIC_OPERATOR:
+            operator = self.get_operator_type(tokens[index].value)
+            if operator != operator_type:
+                query = self._combine(operator_type, query, children, query_start_pos)
+                operator_type, children = operator, []
+            child, index = self._parse_subquery(tokens, index + 1)
+            children.append((child, tokens[index - 1].position[1]))
+
+        query = self._combine(operator_type, query, children, query_start_pos)
+        return query, index
+
+    def _combine(
+        self, operator_type: str, query: Query, children: list, start_pos: int
+    ) -> Query:
+        """Combine a query with the subqueries following it (same operator)"""
+        if not children:
+            return query
         return Query(
             value=operator_type,
             operator=True,
             search_field=SearchField(value=Fields.ALL),
-            children=list(children),
-            position=(query_start_pos, query_end_pos),
+            children=[query] + [child for child, _ in children],
+            position=(start_pos, children[-1][1]),
         )
 
-    def _parse_nested_query(self, tokens: list) -> Query:
+    def _parse_subquery(self, tokens: list, index: int) -> tuple:
+        """Parse a search term or a query nested inside a pair of parentheses"""
+        if index >= len(tokens):
+            raise ValueError()
+
+        if tokens[index].type == TokenTypes.PARENTHESIS_OPEN:
+            return self._parse_nested_query(tokens, index)
+        if tokens[index].type == TokenTypes.SEARCH_TERM:
+            return self._parse_search_term(tokens, index)
+        raise ValueError()
+
+    def _parse_nested_query(self, tokens: list, index: int) -> tuple:
         """Parse a query nested inside a pair of parentheses"""
-        inner_query = self.parse_query_tree(tokens[1:-1])
-        return inner_query
+        inner_query, index = self._parse_compound_query(tokens, index + 1)
+        if index >= len(tokens) or tokens[index].type != TokenTypes.PARENTHESIS_CLOSED:
+            raise ValueError()
+        return inner_query, index + 1
 
-    def _parse_search_term(self, tokens: list) -> Query:
+    def _parse_search_term(self, tokens: list, index: int) -> tuple:
         """Parse a search term"""
-        search_term_token = tokens[0]
-        query_end_pos = tokens[0].position[1]
+        search_term_token = tokens[index]
+        query_end_pos = search_term_token.position[1]
+        index += 1
 
         # Determine the search field of the search term.
-        if len(tokens) > 1 and tokens[1].type == TokenTypes.FIELD:
+        if index < len(tokens) and tokens[index].type == TokenTypes.FIELD:
             search_field = SearchField(
-                value=tokens[1].value, position=tokens[1].position
+                value=tokens[index].value, position=tokens[index].position
             )
-            query_end_pos = tokens[1].position[1]
+            query_end_pos = tokens[index].position[1]
+            index += 1
         else:
             # Select default field "all" if no search field is found.
             search_field = SearchField(value=Fields.ALL)
 
-        return Query(
+        query = Query(
             value=search_term_token.value,
             operator=False,
             search_field=search_field,
-            position=(tokens[0].position[0], query_end_pos),
+            position=(search_term_token.position[0], query_end_pos),
         )
+        return query, index
 
     def translate_search_fields(self, query: Query) -> None:
         """Translate search fields"""
@@ -407,56 +376,27 @@ class PubmedListParser(QueryListParser):
     """Parser for Pubmed (list format) queries."""
 
     LIST_ITEM_REGEX = r"^(\d+).\s+(.*)$"
-
-    def __init__(self, query_list: str, search_field_general: str) -> None:
+    # Pubmed applies operators from left to right (no precedence)
+    OPERATOR_PRECEDENCE = {Operators.NOT: 0, Operators.AND: 0, Operators.OR: 0}
+
+    def __init__(
+        self,
+        query_list: str,
+        search_field_general: str,
+        mode: str = LinterMode.STRICT,
+        *,
+        max_workers: int = 1,
+    ) -> None:
         super().__init__(
             query_list=query_list,
             parser_class=PubmedParser,
             search_field_general=search_field_general,
+            mode=mode,
+            max_workers=max_workers,
         )
 
     def get_token_str(self, token_nr: str) -> str:
         return f"#{token_nr}"
 
-    def parse(self) -> Query:
-        """Parse the query in list format."""
-
-        tokens = self.tokenize_list()
-
-        query_list = self.dict_to_positioned_list(tokens)
-        query_string = "".join([query[0] for query in query_list])
-
-        try:
-            query = self.parser_class(query_string, self.search_field_general).parse()
-
-        except QuerySyntaxError as exc:
-            # pylint: disable=duplicate-code
-            # Correct positions and query string
-            # to display the error for the original (list) query
-            new_pos = exc.position
-            for content, pos in query_list:
-                # Note: artificial parentheses cannot be ignored here
-                # because they were counted in the query_string
-                segment_length = len(content)
-
-                if new_pos[0] - segment_length >= 0:
-                    new_pos = (new_pos[0] - segment_length, new_pos[1] - segment_length)
-                    continue
-                segment_beginning = pos[0]
-                new_pos = (
-                    new_pos[0] + segment_beginning,
-                    new_pos[1] + segment_beginning,
-                )
-                exc.position = new_pos
-                break
-
-            exc.query_string = self.query_list
-
-            exception_type = type(exc)
-            raise exception_type(
-                msg=exc.message.split("\n", maxsplit=1)[0],
-                query_string=exc.query_string,
-                position=exc.position,
-            ) from None
-
-        return query
+    def get_operator_search_field(self) -> SearchField:
+        return SearchField(value=Fields.ALL)
@@ -19,12 +19,31 @@ from search_query.constants import TokenTypes
 from search_query.constants import WOSSearchFieldList
 from search_query.exception import FatalLintingException
 from search_query.linter_wos import QueryLinter
+from search_query.parser_base import compile_token_pattern
 from search_query.parser_base import QueryListParser
 from search_query.parser_base import QueryStringParser
 from search_query.query import Query
 from search_query.query import SearchField
 
 
+def _first_position(
+    items: typing.Sequence[typing.Any], value: int, index: int = 0
+) -> int:
+    """Index of the first item with item.position[index] >= value
+    (items sorted by position, artificial parentheses are skipped)."""
+    low, high = 0, len(items)
+    while low < high:
+        middle = (low + high) // 2
+        probe = middle
+        while probe < high and items[probe].position == (-1, -1):
+            probe += 1
+        if probe < high and items[probe].position[index] < value:
+            low = probe + 1
+        else:
+            high = middle
+    return low
+
+
 class WOSParser(QueryStringParser):
     """Parser for Web-of-Science queries."""
 
@@ -46,14 +65,15 @@ class WOSParser(QueryStringParser):
     OPERATOR_REGEX = "|".join([LOGIC_OPERATOR_REGEX, PROXIMITY_OPERATOR_REGEX])
 
     # Combine all regex patterns into a single pattern
-    pattern = "|".join(
+    TOKEN_PATTERN = compile_token_pattern(
         [
-            SEARCH_FIELD_REGEX,
-            LOGIC_OPERATOR_REGEX,
-            PROXIMITY_OPERATOR_REGEX,
-            SEARCH_TERM_REGEX,
-            PARENTHESIS_REGEX,
-            # self.SEARCH_FIELDS_REGEX,
+            (TokenTypes.FIELD, SEARCH_FIELD_REGEX),
+            (TokenTypes.LOGIC_OPERATOR, LOGIC_OPERATOR_REGEX),
+            (TokenTypes.PROXIMITY_OPERATOR, PROXIMITY_OPERATOR_REGEX),
+            (TokenTypes.SEARCH_TERM, SEARCH_TERM_REGEX),
+            (TokenTypes.PARENTHESIS_OPEN, r"\("),
+            (TokenTypes.PARENTHESIS_CLOSED, r"\)"),
+            # (TokenTypes.FIELD, SEARCH_FIELDS_REGEX),
         ]
     )
 
@@ -68,6 +88,15 @@ class WOSParser(QueryStringParser):
             query_str=query_str, search_field_general=search_field_general, mode=mode
         )
         self.query_linter = QueryLinter(parser=self)
+        # State for apply_edit(): the lexed tokens (before combining terms),
+        # the groups of parentheses (see parse_query_tree()) and the query
+        self._lexed_tokens: typing.List[Token] = []
+        self._groups: typing.Dict[int, tuple] = {}
+        self._query: typing.Optional[Query] = None
+        # Parents, nodes and search fields with positions (see _index_query_tree())
+        self._parents: typing.Optional[typing.Dict[int, Query]] = None
+        self._nodes: typing.List[Query] = []
+        self._search_fields: typing.List[SearchField] = []
 
     def _handle_fully_quoted_query_str(self) -> None:
         if (
@@ -103,31 +132,9 @@ class WOSParser(QueryStringParser):
 
         self._handle_fully_quoted_query_str()
 
-        # Parse tokens and positions based on regex pattern
-        compile_pattern = re.compile(pattern=self.pattern)
-
-        for match in compile_pattern.finditer(self.query_str):
-            value = match.group()
-            position = match.span()
-
-            # Determine token type
-            if re.fullmatch(self.PARENTHESIS_REGEX, value):
-                if value == "(":
-                    token_type = TokenTypes.PARENTHESIS_OPEN
-                else:
-                    token_type = TokenTypes.PARENTHESIS_CLOSED
-            elif re.fullmatch(self.LOGIC_OPERATOR_REGEX, value):
-                token_type = TokenTypes.LOGIC_OPERATOR
-            elif re.fullmatch(self.PROXIMITY_OPERATOR_REGEX, value):
-                token_type = TokenTypes.PROXIMITY_OPERATOR
-            elif re.fullmatch(self.SEARCH_FIELD_REGEX, value):
-                token_type = TokenTypes.FIELD
-            elif re.fullmatch(self.SEARCH_TERM_REGEX, value):
-                token_type = TokenTypes.SEARCH_TERM
-            else:
-                token_type = TokenTypes.UNKNOWN
-
-            self.tokens.append(Token(value=value, type=token_type, position=position))
+        # Parse tokens, types and positions based on the regex pattern
+        self._lexed_tokens = list(self.lex())
+        self.tokens.extend(self._lexed_tokens)
 
         self.combine_subsequent_terms()
 
@@ -139,8 +146,9 @@ class WOSParser(QueryStringParser):
             or token in WOSSearchFieldList.language_list
         )
 
-    # Parse a query tree from tokens recursively
+    # Parse a query tree from tokens (nested parentheses with an explicit stack)
     # pylint: disable=too-many-branches
+    # pylint: disable=too-many-statements
     def parse_query_tree(
         self,
         index: int = 0,
@@ -149,14 +157,54 @@ class WOSParser(QueryStringParser):
         current_negation: bool = False,
     ) -> typing.Tuple[Query, int]:
         """Parse tokens starting at the given index,
-        handling parentheses, operators, search fields and terms recursively."""
+        handling parentheses, operators, search fields and terms.
+
+        The levels enclosing the current parentheses are kept on a stack
+        (instead of recursive calls), so that the depth of nesting is not
+        limited by the recursion limit."""
+        # Enclosing levels: (children, current_operator,
+        # search_field, superior_search_field, opening parenthesis, context)
+        stack: typing.List[
+            typing.Tuple[
+                typing.List[Query],
+                str,
+                typing.Optional[SearchField],
+                typing.Any,
+                Token,
+                tuple,
+            ]
+        ] = []
         children: typing.List[Query] = []
         current_operator = ""
 
         if current_negation:
             current_operator = "NOT"
 
-        while index < len(self.tokens):
+        while True:
+            if index >= len(self.tokens):
+                # No more tokens: complete the current level
+                sub_query = self._complete_query_tree(
+                    children, current_operator, search_field
+                )
+                if not stack:
+                    return sub_query, index
+                (
+                    children,
+                    current_operator,
+                    search_field,
+                    superior_search_field,
+                    _,
+                    _,
+                ) = stack.pop()
+                children = self.append_children(
+                    children=children,
+                    sub_query=sub_query,
+                    current_operator=current_operator,
+                )
+                current_negation = False
+                index += 1
+                continue
+
             token = self.tokens[index]
 
             # Handle nested expressions within parentheses
@@ -165,14 +213,49 @@ class WOSParser(QueryStringParser):
                     superior_search_field = self.tokens[index - 1].value
 
                 # Parse the expression inside the parentheses
-                sub_query, index = self.parse_query_tree(
-                    index=index + 1,
-                    search_field=search_field,
-                    superior_search_field=superior_search_field,
-                    current_negation=current_negation,
+                # (search fields and the negation are passed on)
+                stack.append(
+                    (
+                        children,
+                        current_operator,
+                        search_field,
+                        superior_search_field,
+                        token,
+                        self._group_context(
+                            search_field, superior_search_field, current_negation
+                        ),
+                    )
+                )
+                children = []
+                current_operator = "NOT" if current_negation else ""
+                index += 1
+                continue
+
+            # Handle closing parentheses
+            if token.type == TokenTypes.PARENTHESIS_CLOSED:
+                sub_query = self.handle_closing_parenthesis(
+                    children=children,
+                    current_operator=current_operator,
                 )
+                if not stack:
+                    return sub_query, index
 
                 # Add the parsed expression to the list of children
+                (
+                    children,
+                    current_operator,
+                    search_field,
+                    superior_search_field,
+                    open_token,
+                    context,
+                ) = stack.pop()
+                if open_token.position != (-1, -1):
+                    self._groups[id(open_token)] = (
+                        open_token,
+                        sub_query,
+                        list(sub_query.children),
+                        context,
+                    )
                 children = self.append_children(
                     children=children,
                     sub_query=sub_query,
@@ -180,17 +263,6 @@ class WOSParser(QueryStringParser):
                 )
                 current_negation = False
 
-            # Handle closing parentheses
-            elif token.type == TokenTypes.PARENTHESIS_CLOSED:
-                superior_search_field = None
-                return (
-                    self.handle_closing_parenthesis(
-                        children=children,
-                        current_operator=current_operator,
-                    ),
-                    index,
-                )
-
             # Handle operators
             elif token.type == TokenTypes.LOGIC_OPERATOR:
                 # Handle the operator
@@ -225,7 +297,7 @@ class WOSParser(QueryStringParser):
                 # Set search field to superior search field
                 # if no search field is given
                 if not search_field and superior_search_field:
-                    search_field = superior_search_field
+                    search_field = SearchField(superior_search_field, position=None)
 
                 # Set search field to ALL if no search field is given
                 if not search_field:
@@ -262,21 +334,40 @@ class WOSParser(QueryStringParser):
 
             index += 1
 
-        # Return options if there are no more tokens
+    def _group_context(
+        self,
+        search_field: typing.Optional[SearchField],
+        superior_search_field: typing.Any,
+        current_negation: bool,
+    ) -> tuple:
+        """Context of a group of parentheses (to parse it again in apply_edit()):
+        the search field (and its value before the translation),
+        the superior search field and the negation."""
+        return (
+            search_field,
+            None if search_field is None else search_field.value,
+            superior_search_field,
+            current_negation,
+        )
+
+    def _complete_query_tree(
+        self,
+        children: typing.List[Query],
+        current_operator: str,
+        search_field: typing.Optional[SearchField],
+    ) -> Query:
+        """Complete a level of the query tree when there are no more tokens."""
         # Return the children if there is only one child
         if len(children) == 1:
-            return children[0], index
+            return children[0]
 
         # Return the operator and children if there is an operator
         if current_operator:
-            return (
-                Query(
-                    value=current_operator,
-                    operator=True,
-                    children=list(children),
-                    search_field=search_field,
-                ),
-                index,
+            return Query(
+                value=current_operator,
+                operator=True,
+                children=list(children),
+                search_field=search_field,
             )
 
         # Raise an error if the code gets here
@@ -527,13 +618,18 @@ class WOSParser(QueryStringParser):
     def translate_search_fields(self, query: Query) -> None:
         """Translate search fields."""
 
-        if query.children:
-            for child in query.children:
-                self.translate_search_fields(child)
-            return
-
-        if query.search_field:
-            query.search_field.value = self._map_default_field(query.search_field.value)
+        # Terms in depth-first order (explicit stack for deeply nested queries)
+        nodes = [query]
+        while nodes:
+            node = nodes.pop()
+            if node.children:
+                nodes.extend(reversed(node.children))
+                continue
+
+            if node.search_field:
+                node.search_field.value = self._map_default_field(
+                    node.search_field.value
+                )
 
         # at this point it may be necessary to split (OR)
         # queries for combined search fields
@@ -549,6 +645,9 @@ class WOSParser(QueryStringParser):
         """Parse a query string."""
 
         self.linter_messages.clear()
+        self._groups.clear()
+        self._query = None
+        self._parents = None
         self.tokenize()
         self.add_artificial_parentheses_for_operator_precedence()
 
@@ -557,10 +656,20 @@ class WOSParser(QueryStringParser):
         if not self.fatal_linter_err:
             query, _ = self.parse_query_tree()
             self.translate_search_fields(query)
+            if not any(
+                msg["code"] == QueryErrorCode.QUERY_IN_QUOTES.code
+                for msg in self.linter_messages
+            ):
+                self._query = query
         else:
             print("\n[FATAL:] Fatal error detected in pre-linting")
 
-        # Print linter messages
+        self._report_linter_messages()
+        return query
+
+    def _report_linter_messages(self) -> None:
+        """Print the linter messages and raise an exception
+        (in strict mode or for fatal errors)."""
         if self.linter_messages:
             if self.mode != LinterMode.STRICT and not self.fatal_linter_err:
                 print(
@@ -591,7 +700,469 @@ class WOSParser(QueryStringParser):
                     linter_messages=self.linter_messages,
                 )
 
-        return query
+    def apply_edit(self, start: int, end: int, new_text: str) -> Query:
+        """Replace query_str[start:end] by new_text and return the updated query.
+
+        Only the tokens affected by the edit are lexed again (the positions
+        of the following tokens are shifted). The smallest group of
+        parentheses around the edit (with a node of its own in the query tree)
+        is parsed and linted again, the other nodes and linter messages
+        are kept. Other edits (e.g., of parentheses or quotes)
+        are parsed as a new query."""
+
+        query_str = self.query_str[:start] + new_text + self.query_str[end:]
+        if not self._update_group(start, end, query_str):
+            self.query_str = query_str
+            self.query_linter = QueryLinter(parser=self)
+            self.tokens = []
+            return self.parse()
+
+        self._report_linter_messages()
+        assert self._query is not None
+        return self._query
+
+    def _relex(
+        self, start: int, end: int, query_str: str
+    ) -> typing.Tuple[int, int, typing.List[Token]]:
+        """Lex the part of the query_str affected by an edit.
+
+        Returns the range of the (old) lexed tokens that are replaced
+        and the new tokens."""
+        tokens = self._lexed_tokens
+        delta = len(query_str) - len(self.query_str)
+
+        # The token before the first token at the edit may change
+        # (e.g., NEAR/ followed by a distance)
+        first = max(_first_position(tokens, start, 1) - 1, 0)
+
+        # Lex until a token is an old token (shifted by the edit)
+        last = first
+        new_tokens: typing.List[Token] = []
+        assert self.TOKEN_PATTERN is not None
+        for match in self.TOKEN_PATTERN.finditer(
+            query_str, tokens[first - 1].position[1] if first > 0 else 0
+        ):
+            if match.start() >= end + delta:
+                while last < len(tokens) and (
+                    tokens[last].position[0] < end
+                    or tokens[last].position[0] + delta < match.start()
+                ):
+                    last += 1
+                if (
+                    last < len(tokens)
+                    and tokens[last].position[0] + delta == match.start()
+                    and tokens[last].position[1] + delta == match.end()
+                    and tokens[last].type == TokenTypes[str(match.lastgroup)]
+                ):
+                    break
+            new_tokens.append(
+                Token(
+                    value=match.group(),
+                    type=TokenTypes[str(match.lastgroup)],
+                    position=match.span(),
+                )
+            )
+        else:
+            last = len(tokens)
+
+        # Tokens at the start and at the end that did not change
+        while (
+            first < last
+            and new_tokens
+            and tokens[first].position == new_tokens[0].position
+            and tokens[first].position[1] <= start
+            and tokens[first].type == new_tokens[0].type
+        ):
+            first += 1
+            new_tokens.pop(0)
+        while (
+            first < last
+            and new_tokens
+            and tokens[last - 1].position[0] >= end
+            and tokens[last - 1].position[0] + delta == new_tokens[-1].position[0]
+            and tokens[last - 1].position[1] + delta == new_tokens[-1].position[1]
+            and tokens[last - 1].type == new_tokens[-1].type
+        ):
+            last -= 1
+            new_tokens.pop()
+
+        return first, last, new_tokens
+
+    def _index_query_tree(self) -> None:
+        """Index the parents, the nodes and the search fields with positions
+        (sorted) of the query tree (for apply_edit())."""
+        assert self._query is not None
+        self._parents = {}
+        nodes = [self._query]
+        for node in nodes:
+            for child in node.children:
+                self._parents[id(child)] = node
+                nodes.append(child)
+        self._nodes = sorted(
+            (node for node in nodes if node.position),
+            key=lambda node: node.position[0],
+        )
+        self._search_fields = self._positioned_search_fields(
+            nodes, list(self._groups.values())
+        )
+
+    def _positioned_search_fields(
+        self, nodes: typing.List[Query], groups: typing.List[tuple]
+    ) -> typing.List[SearchField]:
+        """Search fields with positions (sorted) of the nodes and groups."""
+        search_fields = {
+            id(search_field): search_field
+            for search_field in [node.search_field for node in nodes]
+            + [group[3][0] for group in groups]
+            if search_field is not None and search_field.position
+        }
+        return sorted(
+            search_fields.values(),
+            key=lambda search_field: search_field.position[0],  # type: ignore
+        )
+
+    def _enclosing_group(self, first: int, last: int) -> typing.Tuple[int, int]:
+        """Indices of the parentheses of the smallest group around the
+        lexed tokens[first:last] that has a node of its own in the query tree
+        (-1, -1 if there is no such group)."""
+        tokens = self._lexed_tokens
+        opening, closing = first - 1, last
+        while True:
+            depth = 0
+            while opening >= 0:
+                if tokens[opening].type == TokenTypes.PARENTHESIS_CLOSED:
+                    depth += 1
+                elif tokens[opening].type == TokenTypes.PARENTHESIS_OPEN:
+                    if depth == 0:
+                        break
+                    depth -= 1
+                opening -= 1
+            depth = 0
+            while closing < len(tokens):
+                if tokens[closing].type == TokenTypes.PARENTHESIS_OPEN:
+                    depth += 1
+                elif tokens[closing].type == TokenTypes.PARENTHESIS_CLOSED:
+                    if depth == 0:
+                        break
+                    depth -= 1
+                closing += 1
+            if opening < 0 or closing >= len(tokens):
+                return -1, -1
+
+            # The node of the group must not be merged with other nodes
+            # (see append_children() and add_term_node())
+            group = self._groups.get(id(tokens[opening]))
+            if group is not None and (
+                (group[1] is self._query or id(group[1]) in self._parents)
+                and len(group[1].children) == len(group[2])
+                and all(a is b for a, b in zip(group[1].children, group[2]))
+            ):
+                return opening, closing
+            opening, closing = opening - 1, closing + 1
+
+    def _token_index(self, token: Token) -> int:
+        """Index of a (lexed) token in the tokens."""
+        index = _first_position(self.tokens, token.position[0])
+        while self.tokens[index] is not token:
+            index += 1
+        return index
+
+    def _group_tokens(
+        self, tokens: typing.List[Token]
+    ) -> typing.Tuple[typing.List[Token], bool]:
+        """Combine the terms and add the artificial parentheses for the
+        tokens of a group (returns whether the precedence was implicit)."""
+        parser = WOSParser(self.query_str, self.search_field_general, mode=self.mode)
+        parser.tokens = tokens
+        parser.combine_subsequent_terms()
+        parser.add_artificial_parentheses_for_operator_precedence()
+        return parser.tokens, bool(parser.linter_messages)
+
+    # pylint: disable=too-many-arguments
+    def _shift_positions(
+        self,
+        end: int,
+        delta: int,
+        closing: int,
+        closing_index: int,
+        span: typing.Tuple[int, int],
+    ) -> typing.Tuple[int, int]:
+        """Shift the positions after the edit (tokens, nodes, search fields,
+        linter messages) and remove the nodes, search fields and linter
+        messages of the group in the span. Returns the indices
+        of the nodes and search fields of the group."""
+
+        def shift(position: typing.Any) -> typing.Any:
+            if position is None or position[0] < end:
+                return position
+            return (position[0] + delta, position[1] + delta)
+
+        # All positions after the group are shifted. The lexed tokens
+        # are also in the tokens (or combined to a term of the tokens).
+        lexed_tokens = self._lexed_tokens
+        lexed_index = closing
+        for token in self.tokens[closing_index:]:
+            if token.position == (-1, -1):
+                continue
+            while (
+                lexed_index < len(lexed_tokens)
+                and lexed_tokens[lexed_index].position[0] < token.position[1]
+            ):
+                lexed_token = lexed_tokens[lexed_index]
+                if lexed_token is not token:
+                    lexed_token.position = (
+                        lexed_token.position[0] + delta,
+                        lexed_token.position[1] + delta,
+                    )
+                lexed_index += 1
+            token.position = (token.position[0] + delta, token.position[1] + delta)
+
+        nodes_start = _first_position(self._nodes, span[0])
+        del self._nodes[nodes_start : _first_position(self._nodes, span[1])]
+        for node in self._nodes[nodes_start:]:
+            node.position = (node.position[0] + delta, node.position[1] + delta)
+        search_fields_start = _first_position(self._search_fields, span[0])
+        del self._search_fields[
+            search_fields_start : _first_position(self._search_fields, span[1])
+        ]
+        for search_field in self._search_fields[search_fields_start:]:
+            search_field.position = (
+                search_field.position[0] + delta,  # type: ignore
+                search_field.position[1] + delta,  # type: ignore
+            )
+
+        messages = []
+        for msg in self.linter_messages:
+            if (
+                msg["code"]
+                in [
+                    QueryErrorCode.SEARCH_FIELD_MISSING.code,
+                    QueryErrorCode.YEAR_WITHOUT_SEARCH_FIELD.code,
+                ]
+                or span[0] <= msg["position"][0]
+                and msg["position"][1] <= span[1]
+            ):
+                # Checked again for the group (and the query)
+                continue
+            messages.append(dict(msg, position=shift(msg["position"])))
+        self.linter_messages = messages
+
+        return nodes_start, search_fields_start
+
+    def _replace_node(
+        self,
+        old_node: Query,
+        node: Query,
+        starts: typing.Tuple[int, int],
+        group_tokens: typing.List[Token],
+    ) -> bool:
+        """Replace the node of a group in the query tree (and the indices).
+        Returns False if the node is not in the query tree."""
+        assert self._parents is not None
+        parent = self._parents.pop(id(old_node), None)
+        if old_node is self._query:
+            self._query = node
+        elif parent is None or not any(child is old_node for child in parent.children):
+            return False
+        else:
+            parent.children[:] = [
+                node if child is old_node else child for child in parent.children
+            ]
+            self._parents[id(node)] = parent
+
+        # Enclosing groups may have the same node (e.g., "((a AND b))")
+        # or the parent node (children that are replaced)
+        for key, (token, group_node, children, context) in self._groups.items():
+            if group_node is old_node:
+                self._groups[key] = (token, node, list(node.children), context)
+            elif group_node is parent:
+                self._groups[key] = (
+                    token,
+                    group_node,
+                    [node if child is old_node else child for child in children],
+                    context,
+                )
+
+        nodes = [old_node]
+        for old in nodes:
+            for child in old.children:
+                self._parents.pop(id(child), None)
+                nodes.append(child)
+        nodes = [node]
+        for new in nodes:
+            for child in new.children:
+                self._parents[id(child)] = new
+                nodes.append(child)
+        self._nodes[starts[0] : starts[0]] = sorted(
+            (new for new in nodes if new.position),
+            key=lambda new: new.position[0],
+        )
+
+        # Search fields in the group (the other search fields remain indexed)
+        start, end = group_tokens[0].position[0], group_tokens[-1].position[1]
+        self._search_fields[starts[1] : starts[1]] = [
+            search_field
+            for search_field in self._positioned_search_fields(
+                nodes,
+                [
+                    self._groups[id(token)]
+                    for token in group_tokens
+                    if token.type == TokenTypes.PARENTHESIS_OPEN
+                    and id(token) in self._groups
+                ],
+            )
+            if start <= search_field.position[0] < end  # type: ignore
+        ]
+        return True
+
+    # pylint: disable=too-many-locals
+    # pylint: disable=too-many-return-statements
+    def _update_group(self, start: int, end: int, query_str: str) -> bool:
+        """Update the tokens, the query tree and the linter messages for an edit
+        (see apply_edit()). Returns False if the query must be parsed again."""
+
+        delta = len(query_str) - len(self.query_str)
+        if (
+            self._query is None
+            or any(
+                char in self.query_str[start:end] + query_str[start : end + delta]
+                for char in '"()'
+            )
+            or query_str[:1] == '"'
+            and query_str[-1:] == '"'
+        ):
+            return False
+
+        first, last, new_tokens = self._relex(start, end, query_str)
+        tokens = self._lexed_tokens
+        if any(token.is_parenthesis() for token in new_tokens + tokens[first:last]):
+            return False
+
+        if self._parents is None:
+            self._index_query_tree()
+        opening, closing = self._enclosing_group(first, last)
+        if opening == -1:
+            return False
+        open_token, closing_token = tokens[opening], tokens[closing]
+        _, old_node, _, context = self._groups[id(open_token)]
+
+        # Implicit precedence is reported once (position -1, -1):
+        # whether it is due to the group or the rest of the query is not known
+        implicit_precedence = any(
+            msg["code"] == QueryErrorCode.IMPLICIT_PRECEDENCE.code
+            and msg["position"] == (-1, -1)
+            for msg in self.linter_messages
+        )
+        if (
+            implicit_precedence
+            and self._group_tokens(
+                [
+                    Token(
+                        value=self.query_str[slice(*token.position)],
+                        type=token.type,
+                        position=token.position,
+                    )
+                    for token in tokens[opening : closing + 1]
+                ]
+            )[1]
+        ):
+            return False
+
+        index = self._token_index(open_token)
+        closing_index = self._token_index(closing_token)
+        old_group = self.tokens[index + 1 : closing_index]
+        starts = self._shift_positions(
+            end,
+            delta,
+            closing,
+            closing_index,
+            (open_token.position[0], closing_token.position[1]),
+        )
+        for token in tokens[opening + 1 : closing]:
+            self._groups.pop(id(token), None)
+
+        # Tokens of the group (the values of the tokens that were not lexed again
+        # are copied from the query_str because the linter changes the values)
+        self.query_str = query_str
+        self.query_linter.search_str = query_str
+        group_tokens = [
+            Token(
+                value=query_str[slice(*token.position)],
+                type=token.type,
+                position=token.position,
+            )
+            for token in tokens[opening + 1 : first]
+        ]
+        group_tokens.extend(new_tokens)
+        for token in tokens[last:closing]:
+            position = (token.position[0] + delta, token.position[1] + delta)
+            group_tokens.append(
+                Token(
+                    value=query_str[slice(*position)],
+                    type=token.type,
+                    position=position,
+                )
+            )
+        tokens[opening + 1 : closing] = group_tokens
+
+        group, group_implicit_precedence = self._group_tokens(
+            [open_token, *group_tokens, closing_token]
+        )
+        self.tokens[index : closing_index + 1] = group
+
+        # Lint the group (and the transition to its opening parenthesis)
+        span = (open_token.position[0], closing_token.position[1])
+        parser = WOSParser(query_str, self.search_field_general, mode=self.mode)
+        parser.tokens = group
+        parser.query_linter.check_tokens(span=span)
+        parser.tokens = self.tokens[max(index - 2, 0) : index + 1]
+        parser.query_linter.check_order_of_tokens()
+        if any(msg["is_fatal"] for msg in parser.linter_messages):
+            return False
+        self.linter_messages.extend(
+            msg
+            for msg in parser.linter_messages
+            if span[0] <= msg["position"][0] and msg["position"][1] <= span[1]
+        )
+
+        # Parse the group (with the value of the search field before the translation)
+        search_field, value, superior_search_field, negation = context
+        if search_field is not None:
+            value, search_field.value = search_field.value, value
+        try:
+            node, _ = self.parse_query_tree(
+                index + 1, search_field, superior_search_field, negation
+            )
+        except (ValueError, NotImplementedError, IndexError):
+            return False
+        finally:
+            if search_field is not None:
+                search_field.value = value
+        if (node.value, node.operator, bool(node.children)) != (
+            old_node.value,
+            old_node.operator,
+            bool(old_node.children),
+        ):
+            # The group may be merged differently with the enclosing nodes
+            return False
+        self.translate_search_fields(node)
+        if not self._replace_node(old_node, node, starts, group):
+            return False
+
+        # Checks that depend on the whole query
+        self.query_linter.check_search_fields_from_json()
+        old_counts = self.query_linter.count_years_and_fields(old_group)
+        new_counts = self.query_linter.count_years_and_fields(group[1:-1])
+        self.query_linter.year_count += new_counts[0] - old_counts[0]
+        self.query_linter.search_field_count += new_counts[1] - old_counts[1]
+        self.query_linter.check_year_without_search_field()
+        if group_implicit_precedence and not implicit_precedence:
+            self.add_linter_message(
+                QueryErrorCode.IMPLICIT_PRECEDENCE, position=(-1, -1)
+            )
+
+        self.fatal_linter_err = any(e["is_fatal"] for e in self.linter_messages)
+        return not self.fatal_linter_err
 
 
 class WOSListParser(QueryListParser):
@@ -602,12 +1173,20 @@ class WOSListParser(QueryListParser):
     OPERATOR_NODE_REGEX = r"#\d+|AND|OR"
     query_dict: dict
 
-    def __init__(self, query_list: str, search_field_general: str, mode: str) -> None:
+    def __init__(
+        self,
+        query_list: str,
+        search_field_general: str,
+        mode: str,
+        *,
+        max_workers: int = 1,
+    ) -> None:
         super().__init__(
             query_list=query_list,
             parser_class=WOSParser,
             search_field_general=search_field_general,
             mode=mode,
+            max_workers=max_workers,
         )
 
     def get_token_str(self, token_nr: str) -> str:
@@ -658,21 +1237,28 @@ class WOSListParser(QueryListParser):
                         )
 
     def _check_query_tokenization(self) -> None:
-        for ind, query_node in enumerate(self.query_dict.values()):
-            query_parser = WOSParser(
-                query_str=query_node["node_content"],
-                search_field_general=self.search_field_general,
-                mode=self.mode,
-            )
-            try:
-                query_parser.parse()
-            except FatalLintingException:  # add more specific message?""
-                self.add_linter_message(
-                    QueryErrorCode.TOKENIZING_FAILED,
-                    list_position=ind,
-                    position=(-1, -1),
+        # The queries are kept for building the query tree (see _parse_list_query())
+        parsed_lines = self._parse_lines(list(self.query_dict))
+        for ind, (node_nr, query_node) in enumerate(self.query_dict.items()):
+            query, linter_messages = parsed_lines.get(node_nr, (None, []))
+            if query is not None:
+                query_node["query"] = query
+            else:
+                query_parser = WOSParser(
+                    query_str=query_node["node_content"],
+                    search_field_general=self.search_field_general,
+                    mode=self.mode,
                 )
-            for msg in query_parser.linter_messages:
+                try:
+                    query_node["query"] = query_parser.parse()
+                except FatalLintingException:  # add more specific message?""
+                    self.add_linter_message(
+                        QueryErrorCode.TOKENIZING_FAILED,
+                        list_position=ind,
+                        position=(-1, -1),
+                    )
+                linter_messages = query_parser.linter_messages
+            for msg in linter_messages:
                 if ind not in self.linter_messages:
                     self.linter_messages[ind] = []
                 self.linter_messages[ind].append(msg)
@@ -758,37 +1344,11 @@ class WOSListParser(QueryListParser):
         )
         return operator_query
 
-    def _parse_queries(self) -> typing.Tuple[typing.List[Query], dict]:
-        """Parse the queries from the list of queries."""
-        queries: typing.List[Query] = []
-        operator_nodes = {}
-
-        for node_nr, node_content in self.query_dict.items():
-            if "#" in node_content["node_content"]:
-                operator_nodes[node_nr] = node_content["node_content"]
-                queries.append(Query("Filler for combine queries"))
-            else:
-                query_parser = WOSParser(
-                    query_str=node_content["node_content"],
-                    search_field_general=self.search_field_general,
-                    mode=self.mode,
-                )
-                query = query_parser.parse()
-                queries.append(query)
-        return queries, operator_nodes
-
     def _parse_list_query(self) -> Query:
+        # The queries of the QUERY_NODEs were parsed when linting
+        # (see _check_query_tokenization())
         for node_nr, node_content in self.query_dict.items():
-            if node_content["type"] == ListTokenTypes.QUERY_NODE:
-                query_parser = WOSParser(
-                    query_str=node_content["node_content"],
-                    search_field_general=self.search_field_general,
-                    mode=self.mode,
-                )
-                query = query_parser.parse()
-                node_content["query"] = query
-
-            elif node_content["type"] == ListTokenTypes.OPERATOR_NODE:
+            if node_content["type"] == ListTokenTypes.OPERATOR_NODE:
                 tokens = self.tokenize_operator_node(
                     node_content["node_content"], node_nr
                 )
@@ -835,7 +1395,6 @@ class WOSListParser(QueryListParser):
                         linter_messages=linter_messages,
                     )
 
-        self.tokenize_list()
         query = self._parse_list_query()
         return query
 
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Selectivity-aware planning of query evaluation."""
+from __future__ import annotations
+
+import typing
+
+from search_query.constants import Operators
+from search_query.field_accessors import get_field_keys
+from search_query.matcher import normalize_term
+from search_query.matcher import PROXIMITY_OPERATORS
+from search_query.matcher import RecordMatcher
+
+if typing.TYPE_CHECKING:  # pragma: no
+    from search_query.query import Query
+
+
+class Estimate(typing.NamedTuple):
+    """Estimated evaluation cost and selectivity of a (sub)query."""
+
+    # Expected cost of evaluating the node for one record (exact term = 1)
+    cost: float
+    # Expected share of records selected by the node
+    selectivity: float
+
+
+class QueryPlanner:
+    """Orders the children of AND/OR nodes for short-circuit evaluation.
+
+    AND nodes evaluate the children that are cheap and rarely true first,
+    OR nodes evaluate the children that are cheap and often true first.
+    The order does not change the results.
+
+    Without a sample, selectivities are estimated from the terms (longer terms
+    are more selective, wildcards less). With a sample of records,
+    the selectivity of each term is measured on the sample.
+    """
+
+    TERM_COST = 1.0
+    WILDCARD_COST = 4.0
+    # Indexing the token positions of a field
+    POSITIONS_COST = 8.0
+    MIN_SELECTIVITY = 0.001
+    MAX_SELECTIVITY = 0.999
+
+    def __init__(self, sample: typing.Optional[typing.Iterable[dict]] = None) -> None:
+        self.sample = list(sample) if sample is not None else None
+        self._term_selectivity: typing.Dict[
+            typing.Tuple[typing.Tuple[str, ...], str], float
+        ] = {}
+
+    def estimate(self, node: Query) -> Estimate:
+        """Estimate the cost and selectivity of a node."""
+        if node.value == Operators.NOT:
+            child = self.estimate(node.children[0])
+            return Estimate(child.cost, 1 - child.selectivity)
+
+        if node.value == Operators.AND:
+            cost, selectivity = 0.0, 1.0
+            for child in self._ordered_estimates(node):
+                # A child is only evaluated if the previous ones are true
+                cost += selectivity * child.cost
+                selectivity *= child.selectivity
+            return Estimate(cost, selectivity)
+
+        if node.value == Operators.OR:
+            cost, rejected = 0.0, 1.0
+            for child in self._ordered_estimates(node):
+                # A child is only evaluated if the previous ones are false
+                cost += rejected * child.cost
+                rejected *= 1 - child.selectivity
+            return Estimate(cost, 1 - rejected)
+
+        if node.value in PROXIMITY_OPERATORS:
+            # All operands are evaluated (at most as selective as AND)
+            cost, selectivity = self.POSITIONS_COST, 1.0
+            for child in node.children:
+                estimate = self.estimate(child)
+                cost += estimate.cost
+                selectivity *= estimate.selectivity
+            return Estimate(cost, selectivity)
+
+        return self._estimate_term(node)
+
+    def order_children(self, node: Query) -> typing.List[Query]:
+        """Get the children of a node in the order of evaluation."""
+        if node.value not in {Operators.AND, Operators.OR}:
+            return list(node.children)
+        estimates = [self.estimate(child) for child in node.children]
+        order = sorted(
+            range(len(node.children)),
+            key=lambda i: self._rank(node.value, estimates[i]),
+        )
+        return [node.children[i] for i in order]
+
+    def _ordered_estimates(self, node: Query) -> typing.List[Estimate]:
+        estimates = [self.estimate(child) for child in node.children]
+        return sorted(estimates, key=lambda e: self._rank(node.value, e))
+
+    @staticmethod
+    def _rank(operator: str, estimate: Estimate) -> float:
+        """Cost per decided record (lower ranks are evaluated first)."""
+        if operator == Operators.AND:
+            return estimate.cost / max(1 - estimate.selectivity, 1e-12)
+        return estimate.cost / max(estimate.selectivity, 1e-12)
+
+    def _estimate_term(self, node: Query) -> Estimate:
+        value = normalize_term(node.value)
+        cost = self.WILDCARD_COST if "*" in value else self.TERM_COST
+        key = (get_field_keys(node), value)
+        if key not in self._term_selectivity:
+            if self.sample is None:
+                selectivity = self._guess_selectivity(value)
+            else:
+                selectivity = self._measure_selectivity(node)
+            self._term_selectivity[key] = min(
+                max(selectivity, self.MIN_SELECTIVITY), self.MAX_SELECTIVITY
+            )
+        return Estimate(cost, self._term_selectivity[key])
+
+    @staticmethod
+    def _guess_selectivity(value: str) -> float:
+        # Each (literal) character makes a term about 16% more selective
+        selectivity = 0.5 ** (len(value.replace("*", "")) / 4)
+        if "*" in value:
+            selectivity *= 2
+        return selectivity
+
+    def _measure_selectivity(self, node: Query) -> float:
+        assert self.sample is not None
+        matcher = RecordMatcher(node)
+        selected = sum(1 for record in self.sample if matcher(record))
+        # Laplace smoothing (small samples, no matches)
+        return (selected + 1) / (len(self.sample) + 2)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Token positions and proximity search."""
+from __future__ import annotations
+
+import bisect
+import re
+import typing
+
+TOKEN_REGEX = re.compile(r"\w+")
+# Search terms may contain wildcards: * (any number of characters),
+# ? (exactly one character) and $ (zero or one character)
+TERM_TOKEN_REGEX = re.compile(r"[\w*?$]+")
+WILDCARD_REGEXES = {"*": r"\w*", "?": r"\w", "$": r"\w?"}
+
+# Positions of the first and the last token of a match
+Span = typing.Tuple[int, int]
+# A token of a search term: exact token or regex (wildcards)
+TermToken = typing.Union[str, typing.Pattern]
+
+
+def tokenize(text: str) -> typing.List[str]:
+    """Split a text into lowercased tokens."""
+    return TOKEN_REGEX.findall(text.lower())
+
+
+def tokenize_term(value: str) -> typing.List[str]:
+    """Split a search term into lowercased tokens (keeping wildcards).
+
+    Quotes are not part of the tokens.
+    """
+    return TERM_TOKEN_REGEX.findall(value.lower())
+
+
+def has_wildcard(token: str) -> bool:
+    """Check whether a token of a search term contains a wildcard."""
+    return any(char in token for char in WILDCARD_REGEXES)
+
+
+def compile_token_wildcard(token: str) -> typing.Pattern:
+    """Compile a token with wildcards to a regex (matching whole tokens)."""
+    return re.compile(
+        "".join(WILDCARD_REGEXES.get(char, re.escape(char)) for char in token)
+    )
+
+
+def compile_term_tokens(value: str) -> typing.List[TermToken]:
+    """Split a search term into tokens (wildcard tokens are compiled)."""
+    return [
+        compile_token_wildcard(token) if has_wildcard(token) else token
+        for token in tokenize_term(value)
+    ]
+
+
+class TokenPositions:
+    """Positional index of a single text: token -> sorted positions."""
+
+    def __init__(self, text: str) -> None:
+        self.positions: typing.Dict[str, typing.List[int]] = {}
+        for position, token in enumerate(tokenize(text)):
+            self.positions.setdefault(token, []).append(position)
+
+    def find(self, token: TermToken) -> typing.List[int]:
+        """Get the positions of a token (of all tokens matching a wildcard)."""
+        if isinstance(token, str):
+            return self.positions.get(token, [])
+        return sorted(
+            position
+            for tok, positions in self.positions.items()
+            if token.fullmatch(tok)
+            for position in positions
+        )
+
+    def find_phrase(self, tokens: typing.Sequence[TermToken]) -> typing.List[Span]:
+        """Get the spans of a phrase (consecutive tokens)."""
+        return phrase_spans([self.find(token) for token in tokens])
+
+
+def phrase_spans(
+    position_lists: typing.Sequence[typing.Sequence[int]],
+) -> typing.List[Span]:
+    """Get the spans of a phrase from the sorted positions of its tokens."""
+    if not position_lists:
+        return []
+    starts: typing.Sequence[int] = position_lists[0]
+    for offset, positions in enumerate(position_lists[1:], start=1):
+        if not starts:
+            break
+        following = set(positions)
+        starts = [start for start in starts if start + offset in following]
+    last = len(position_lists) - 1
+    return [(start, start + last) for start in starts]
+
+
+def merge_spans(span_lists: typing.Iterable[typing.List[Span]]) -> typing.List[Span]:
+    """Unite sorted span lists (OR)."""
+    return sorted(set(span for spans in span_lists for span in spans))
+
+
+def proximity_spans(
+    left: typing.List[Span],
+    right: typing.List[Span],
+    distance: int,
+    *,
+    ordered: bool = False,
+) -> typing.List[Span]:
+    """Merge two sorted span lists: get the spans covering a left and a right
+    span with at most distance tokens between them.
+
+    NEAR/n matches in any order, WITHIN/n (ordered=True) only if the right
+    span follows the left span. Overlapping spans do not match.
+    """
+    if not left or not right:
+        return []
+    right_starts = [start for start, _ in right]
+    max_length = max(end - start for start, end in right)
+
+    matches = set()
+    for left_start, left_end in left:
+        if ordered:
+            low = left_end + 1
+        else:
+            # The end of the right span must be >= left_start - distance - 1
+            low = left_start - distance - 1 - max_length
+        high = left_end + distance + 1
+        for i in range(
+            bisect.bisect_left(right_starts, low),
+            bisect.bisect_right(right_starts, high),
+        ):
+            right_start, right_end = right[i]
+            if right_start > left_end:
+                gap = right_start - left_end - 1
+            elif right_end < left_start and not ordered:
+                gap = left_start - right_end - 1
+            else:
+                continue
+            if gap <= distance:
+                matches.add((min(left_start, right_start), max(left_end, right_end)))
+    return sorted(matches)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Profiling of query evaluation."""
+from __future__ import annotations
+
+import time
+import typing
+from dataclasses import dataclass
+
+from search_query.serializer_structured import to_string_structured
+
+if typing.TYPE_CHECKING:  # pragma: no
+    from search_query.matcher import Evaluator
+    from search_query.query import Query
+
+
+@dataclass
+class NodeStats:
+    """Evaluation statistics of a query node."""
+
+    # Number of records on which the node was evaluated
+    evaluated: int = 0
+    # Number of records selected by the node
+    matched: int = 0
+    # Cumulative evaluation time (including the children)
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        share = self.matched / self.evaluated if self.evaluated else 0.0
+        return (
+            f"evaluated: {self.evaluated}, matched: {self.matched} ({share:.1%}), "
+            f"time: {self.seconds * 1000:.1f} ms"
+        )
+
+
+class QueryProfile:
+    """Per-node statistics of the evaluation of a query.
+
+    Pass a profile to compile_matcher() to record, for every node, on how many
+    records it was evaluated, how many it matched and the time spent:
+
+        profile = QueryProfile()
+        matcher = query.compile_matcher(profile=profile)
+        selected = [r for r in records if matcher(r)]
+        print(profile.to_string(query))
+
+    Nodes skipped by short-circuit evaluation are not evaluated on a record.
+    Without a profile, the matcher is not instrumented (no overhead).
+    """
+
+    def __init__(self) -> None:
+        self._stats: typing.Dict[int, NodeStats] = {}
+
+    def __getitem__(self, node: Query) -> NodeStats:
+        """Get the statistics of a node."""
+        return self._stats.setdefault(id(node), NodeStats())
+
+    def __contains__(self, node: Query) -> bool:
+        return id(node) in self._stats
+
+    def wrap(self, node: Query, evaluator: Evaluator) -> Evaluator:
+        """Instrument the evaluator of a node."""
+        stats = self[node]
+        perf_counter = time.perf_counter
+
+        def _profiled(texts: dict) -> bool:
+            start = perf_counter()
+            result = evaluator(texts)
+            stats.seconds += perf_counter() - start
+            stats.evaluated += 1
+            if result:
+                stats.matched += 1
+            return result
+
+        return _profiled
+
+    def to_string(self, query: Query) -> str:
+        """Render the query tree (structured) with the statistics of the nodes."""
+
+        def _annotate(node: Query) -> str:
+            if node not in self:
+                return ""
+            return f"\t{self[node]}"
+
+        # Align the statistics in a column next to the tree
+        lines = to_string_structured(query, annotate=_annotate).split("\n")
+        width = max(len(line.split("\t")[0]) for line in lines)
+        for i, line in enumerate(lines):
+            if "\t" in line:
+                tree, stats = line.split("\t", 1)
+                lines[i] = f"{tree.ljust(width)}  # {stats}"
+        return "\n".join(lines)
@@ -5,14 +5,22 @@ from __future__ import annotations
 import re
 import typing
 
-from search_query.constants import Fields
 from search_query.constants import Operators
 from search_query.constants import PLATFORM
+from search_query.field_accessors import get_field_keys
+from search_query.field_accessors import get_field_text
+from search_query.matcher import compile_matcher
+from search_query.matcher import RecordMatcher
 from search_query.serializer_ebsco import to_string_ebsco
 from search_query.serializer_pre_notation import to_string_pre_notation
 from search_query.serializer_pubmed import to_string_pubmed
 from search_query.serializer_structured import to_string_structured
 from search_query.serializer_wos import to_string_wos
+from search_query.vectorized import select_many
+
+if typing.TYPE_CHECKING:  # pragma: no
+    from search_query.planner import QueryPlanner
+    from search_query.profiling import QueryProfile
 
 # pylint: disable=too-few-public-methods
 
@@ -27,17 +35,36 @@ class SearchField:
         position: typing.Optional[tuple] = None,
     ) -> None:
         """init method"""
-        self.value = value
+        self._value = value
         self.position = position
 
+    @property
+    def value(self) -> str:
+        """Value property."""
+        return self._value
+
+    @value.setter
+    def value(self, v: str) -> None:
+        """Set value property."""
+        self._value = v
+        Query.nr_edits += 1
+
     def __str__(self) -> str:
         return self.value
 
+    def __deepcopy__(self, memo: dict) -> SearchField:
+        clone = SearchField(self.value, position=self.position)
+        memo[id(self)] = clone
+        return clone
+
 
 # pylint: disable=too-many-instance-attributes
 class Query:
     """Query class."""
 
+    # Number of edits of query nodes and search fields (invalidates compiled matchers)
+    nr_edits = 0
+
     # pylint: disable=too-many-arguments
     def __init__(
         self,
@@ -60,13 +87,37 @@ class Query:
         self.distance = distance
         self.search_field = search_field
         self.position = position
-        self.marked = False
-
-        if children:
-            for child in children:
-                self.add_child(child)
-
-        self._ensure_children_not_circular()
+        # Compiled matcher of proximity operators (and nr_edits when it was compiled)
+        self._proximity_matcher: typing.Optional[
+            typing.Tuple[int, RecordMatcher]
+        ] = None
+
+        # A new node cannot be a descendant of its children (no cycle check)
+        for child in children or []:
+            self._children.append(self._to_child(child))
+
+    def __deepcopy__(self, memo: dict) -> Query:
+        """Copy the query tree (shared subtrees and search fields remain shared)."""
+        clone = self.__class__.__new__(self.__class__)
+        memo[id(self)] = clone
+        clone.__dict__.update(self.__dict__)
+        clone._proximity_matcher = None
+        clone._children = [
+            memo[id(child)] if id(child) in memo else child.__deepcopy__(memo)
+            for child in self._children
+        ]
+        if self._search_field is not None:
+            search_field = memo.get(id(self._search_field))
+            if search_field is None:
+                search_field = self._search_field.__deepcopy__(memo)
+            clone._search_field = search_field
+        return clone
+
+    def __getstate__(self) -> dict:
+        # The compiled matcher (closures) cannot be pickled
+        state = self.__dict__.copy()
+        state["_proximity_matcher"] = None
+        return state
 
     @property
     def value(self) -> str:
@@ -88,6 +139,7 @@ class Query:
         ]:
             raise ValueError(f"Invalid operator value: {v}")
         self._value = v
+        Query.nr_edits += 1
 
     @property
     def operator(self) -> bool:
@@ -100,6 +152,7 @@ class Query:
         if not isinstance(is_op, bool):
             raise TypeError("operator must be a boolean")
         self._operator = is_op
+        Query.nr_edits += 1
 
     @property
     def distance(self) -> typing.Optional[int]:
@@ -109,15 +162,15 @@ class Query:
     @distance.setter
     def distance(self, dist: typing.Optional[int]) -> None:
         """Set distance property."""
-        if not dist:
-            return
         if self.operator and self.value in {Operators.NEAR, Operators.WITHIN}:
             if dist is None:
                 raise ValueError(f"{self.value} operator requires a distance")
         else:
-            if dist is not None:
-                raise ValueError(f"{self.value} operator cannot have a distance")
+            if dist is None:
+                return
+            raise ValueError(f"{self.value} operator cannot have a distance")
         self._distance = dist
+        Query.nr_edits += 1
 
     @property
     def children(self) -> typing.List[Query]:
@@ -129,18 +182,23 @@ class Query:
         """Set children property."""
         if not isinstance(children, list):
             raise TypeError("children must be a list of Query objects")
+        self._ensure_children_not_circular(children)
         self._children = children
+        Query.nr_edits += 1
 
     def add_child(self, child: typing.Union[str, Query]) -> None:
         """Add child to the query."""
+        child = self._to_child(child)
+        self._ensure_children_not_circular([child])
+        self._children.append(child)
+        Query.nr_edits += 1
+
+    def _to_child(self, child: typing.Union[str, Query]) -> Query:
         if isinstance(child, str):
-            self._children.append(
-                Query(child, operator=False, search_field=self.search_field)
-            )
-        elif isinstance(child, Query):
-            self._children.append(child)
-        else:
-            raise TypeError("Children must be Query objects or strings")
+            return Query(child, operator=False, search_field=self.search_field)
+        if isinstance(child, Query):
+            return child
+        raise TypeError("Children must be Query objects or strings")
 
     @property
     def search_field(self) -> typing.Optional[SearchField]:
@@ -151,6 +209,7 @@ class Query:
     def search_field(self, sf: typing.Optional[SearchField]) -> None:
         """Set search field property."""
         self._search_field = sf
+        Query.nr_edits += 1
 
     def selects(self, *, record_dict: dict) -> bool:
         """Indicates whether the query selects a given record."""
@@ -164,28 +223,70 @@ class Query:
         if self.value == Operators.OR:
             return any(x.selects(record_dict=record_dict) for x in self.children)
 
-        assert not self.operator
+        if self.value in {Operators.NEAR, Operators.WITHIN}:
+            # Evaluated on the token positions of the field, compiled again
+            # after edits (in-place changes of children lists are not
+            # detected: use compile_matcher() for queries edited in place)
+            if (
+                self._proximity_matcher is None
+                or self._proximity_matcher[0] != Query.nr_edits
+            ):
+                self._proximity_matcher = (Query.nr_edits, compile_matcher(self))
+            return self._proximity_matcher[1](record_dict)
 
-        if self.search_field is None:
-            raise ValueError("Search field not set")
+        assert not self.operator
 
-        if self.search_field.value == Fields.TITLE:
-            field_value = record_dict.get("title", "").lower()
-        elif self.search_field.value == Fields.ABSTRACT:
-            field_value = record_dict.get("abstract", "").lower()
-        else:
-            raise ValueError(f"Invalid search field: {self.search_field}")
+        # Composite search fields (e.g., TS=) match if one of their fields matches
+        field_values = [
+            get_field_text(record_dict, key) for key in get_field_keys(self)
+        ]
 
         value = self.value.lower().lstrip('"').rstrip('"')
 
         # Handle wildcards
         if "*" in value:
             pattern = re.compile(value.replace("*", ".*").lower())
-            match = pattern.search(field_value)
-            return match is not None
+            return any(pattern.search(field_value) for field_value in field_values)
 
         # Match exact word
-        return value.lower() in field_value
+        return any(value.lower() in field_value for field_value in field_values)
+
+    def compile_matcher(
+        self,
+        *,
+        planner: typing.Optional[QueryPlanner] = None,
+        multi_term: bool = False,
+        profile: typing.Optional[QueryProfile] = None,
+    ) -> RecordMatcher:
+        """Compile the query into a reusable record matcher.
+
+        The matcher gives the same answers as selects() but normalizes
+        terms and compiles wildcard regexes only once:
+
+            matcher = query.compile_matcher()
+            selected = [r for r in records if matcher(r)]
+
+        A QueryPlanner can reorder AND/OR children for short-circuit evaluation:
+
+            matcher = query.compile_matcher(planner=QueryPlanner(sample))
+
+        For queries with many terms per field (e.g., long lists of synonyms),
+        multi_term=True finds all terms of a field in one pass over the field.
+
+        A QueryProfile records the evaluation counts and times of each node:
+
+            matcher = query.compile_matcher(profile=profile)
+        """
+        return compile_matcher(
+            self, planner=planner, multi_term=multi_term, profile=profile
+        )
+
+    def select_many(self, records: typing.Iterable[dict]) -> typing.Any:
+        """Indicates which records of a collection the query selects.
+
+        Returns a NumPy boolean array (one entry per record, requires numpy).
+        """
+        return select_many(self, records)
 
     def is_operator(self) -> bool:
         """Check whether the SearchQuery is an operator."""
@@ -204,29 +305,21 @@ class Query:
             self._get_nr_leaves_from_node(n) if n.operator else 1 for n in node.children
         )
 
-    def _ensure_children_not_circular(
-        self,
-    ) -> None:
-        """parse the query provided, build nodes&tree structure"""
-
-        # Mark nodes to prevent circular references
-        self.mark()
-        # Remove marks
-        self.remove_marks()
-
-    def mark(self) -> None:
-        """marks the node"""
-        if self.marked:
-            raise ValueError("Building Query Tree failed")
-        self.marked = True
-        for child in self.children:
-            child.mark()
-
-    def remove_marks(self) -> None:
-        """removes the mark from the node"""
-        self.marked = False
-        for child in self.children:
-            child.remove_marks()
+    def _ensure_children_not_circular(self, children: typing.List[Query]) -> None:
+        """Ensure that the (re-attached) children do not contain the node.
+
+        Subtrees may be shared (see compact.share_subtrees()),
+        but a node must not be its own descendant.
+        """
+        visited: typing.Set[int] = set()
+        stack = list(children)
+        while stack:
+            node = stack.pop()
+            if node is self:
+                raise ValueError("Building Query Tree failed")
+            if id(node) not in visited:
+                visited.add(id(node))
+                stack.extend(node.children)
 
     def print_node(self) -> str:
         """returns a string with all information to the node"""
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Inverted index over record corpora."""
+from __future__ import annotations
+
+import typing
+import uuid
+from array import array
+
+from search_query.compact import fingerprint
+from search_query.constants import Operators
+from search_query.field_accessors import get_field_keys
+from search_query.field_accessors import get_field_text
+from search_query.field_accessors import RECORD_KEYS
+from search_query.matcher import get_distance
+from search_query.matcher import get_proximity_keys
+from search_query.matcher import PROXIMITY_OPERATORS
+from search_query.positions import has_wildcard
+from search_query.positions import merge_spans
+from search_query.positions import phrase_spans
+from search_query.positions import proximity_spans
+from search_query.positions import Span
+from search_query.positions import tokenize
+from search_query.positions import tokenize_term
+from search_query.vocabulary import SortedVocabulary
+
+if typing.TYPE_CHECKING:  # pragma: no
+    from search_query.query import Query
+    from search_query.result_cache import ResultCache
+
+# Occurrences are encoded as (record_id << POSITION_BITS) | position
+POSITION_BITS = 32
+
+
+def bitset_to_ids(bitset: int) -> typing.List[int]:
+    """Get the (sorted) record ids of a bitset."""
+    bits = format(bitset, "b")[::-1]
+    record_ids = []
+    pos = bits.find("1")
+    while pos != -1:
+        record_ids.append(pos)
+        pos = bits.find("1", pos + 1)
+    return record_ids
+
+
+class RecordIndex:
+    """Inverted index over the record fields that Query.selects() understands.
+
+    The index is built once and executes queries by intersecting (AND),
+    uniting (OR) and complementing (NOT) posting lists instead of scanning
+    the records. Results are bitsets (int) over the record ids, i.e.,
+    the positions of the records in the indexed collection.
+
+    In contrast to the substring matching of Query.selects(),
+    search terms match whole tokens (as in the literature databases):
+    phrases match consecutive tokens and wildcards match within a token.
+    Proximity operators (NEAR/n, WITHIN/n) are evaluated by merging the
+    position lists of their operands.
+    """
+
+    def __init__(self, records: typing.Iterable[dict] = ()) -> None:
+        self.nr_records = 0
+        self._corpus_id = uuid.uuid4().hex
+        # Positional postings: record key -> token -> [record_id, position, ...]
+        self._postings: typing.Dict[str, typing.Dict[str, array]] = {
+            key: {} for key in RECORD_KEYS
+        }
+        # Sorted vocabularies of the fields (built when wildcards are expanded)
+        self._vocabularies: typing.Dict[str, SortedVocabulary] = {}
+        for record in records:
+            self.add(record)
+
+    def add(self, record_dict: dict) -> int:
+        """Add a record to the index and return its record id."""
+        record_id = self.nr_records
+        for key, postings in self._postings.items():
+            if key not in record_dict:
+                continue
+            self._vocabularies.pop(key, None)
+            text = get_field_text(record_dict, key)
+            for position, token in enumerate(tokenize(text)):
+                posting = postings.get(token)
+                if posting is None:
+                    posting = postings[token] = array("I")
+                posting.append(record_id)
+                posting.append(position)
+        self.nr_records += 1
+        return record_id
+
+    def vocabulary(self, key: str) -> typing.List[str]:
+        """Get the (sorted) tokens of a record field."""
+        return list(self._get_vocabulary(key).tokens)
+
+    def _get_vocabulary(self, key: str) -> SortedVocabulary:
+        if key not in self._vocabularies:
+            self._vocabularies[key] = SortedVocabulary(self._postings[key])
+        return self._vocabularies[key]
+
+    @property
+    def version(self) -> str:
+        """Version of the indexed corpus (changes when records are added)."""
+        return f"{self._corpus_id}:{self.nr_records}"
+
+    @property
+    def universe(self) -> int:
+        """Bitset of all records."""
+        return (1 << self.nr_records) - 1
+
+    def search(
+        self, query: Query, *, cache: typing.Optional[ResultCache] = None
+    ) -> typing.List[int]:
+        """Get the ids of the records selected by the query."""
+        return bitset_to_ids(self.evaluate(query, cache=cache))
+
+    def count(self, query: Query, *, cache: typing.Optional[ResultCache] = None) -> int:
+        """Count the records selected by the query."""
+        return bin(self.evaluate(query, cache=cache)).count("1")
+
+    def evaluate(
+        self, node: Query, *, cache: typing.Optional[ResultCache] = None
+    ) -> int:
+        """Evaluate a node of the query tree (bitset of records).
+
+        Shared subtrees (see compact.share_subtrees()) are evaluated once.
+        If a cache is given, the results of subtrees that were evaluated before
+        (on the same version of the corpus) are reused.
+        """
+        fingerprints: typing.Dict[int, bytes] = {}
+        if cache is not None:
+            fingerprint(node, memo=fingerprints, normalized=True)
+        return self._evaluate(node, {}, cache, fingerprints)
+
+    def _evaluate(
+        self,
+        node: Query,
+        results: typing.Dict[int, int],
+        cache: typing.Optional[ResultCache] = None,
+        fingerprints: typing.Optional[typing.Dict[int, bytes]] = None,
+    ) -> int:
+        if id(node) in results:
+            return results[id(node)]
+        if cache is not None:
+            assert fingerprints is not None
+            cache_key = (fingerprints[id(node)], self.version)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                results[id(node)] = cached
+                return cached
+
+        if node.value == Operators.NOT:
+            result = self.universe ^ self._evaluate(
+                node.children[0], results, cache, fingerprints
+            )
+
+        elif node.value == Operators.AND:
+            result = self.universe
+            for child in node.children:
+                if not result:
+                    break
+                result &= self._evaluate(child, results, cache, fingerprints)
+
+        elif node.value == Operators.OR:
+            result = 0
+            for child in node.children:
+                result |= self._evaluate(child, results, cache, fingerprints)
+
+        elif node.value in PROXIMITY_OPERATORS:
+            # All operands must match in the same field
+            result = 0
+            for key in get_proximity_keys(node):
+                result |= self._to_bitset(self._evaluate_spans(node, key))
+
+        elif node.operator:
+            raise ValueError(f"Operator not supported: {node.value}")
+
+        else:
+            result = self.evaluate_term(node)
+
+        results[id(node)] = result
+        if cache is not None:
+            cache.put(cache_key, result)
+        return result
+
+    def evaluate_term(self, node: Query) -> int:
+        """Evaluate a term (bitset of records)."""
+        tokens = tokenize_term(node.value)
+        if not tokens:
+            return 0
+        # Composite search fields match if one of their fields matches
+        result = 0
+        for key in get_field_keys(node):
+            result |= self._evaluate_field_term(key, tokens)
+        return result
+
+    def _evaluate_field_term(self, key: str, tokens: typing.List[str]) -> int:
+        if len(tokens) == 1:
+            record_ids: typing.Iterable[int] = set(
+                record_id
+                for posting in self._get_postings(key, tokens[0])
+                for record_id in posting[0::2]
+            )
+        else:
+            record_ids = (
+                occurrence >> POSITION_BITS
+                for occurrence in self._match_phrase(key, tokens)
+            )
+        return self._to_bitset(record_ids)
+
+    def _get_postings(self, key: str, token: str) -> typing.List[array]:
+        """Get the postings of a token (of all tokens matching a wildcard)."""
+        postings = self._postings[key]
+        if not has_wildcard(token):
+            return [postings[token]] if token in postings else []
+        return [postings[tok] for tok in self._get_vocabulary(key).expand(token)]
+
+    def _get_occurrences(self, key: str, token: str) -> typing.Set[int]:
+        """Get the (encoded) occurrences of a token."""
+        return {
+            record_id << POSITION_BITS | position
+            for posting in self._get_postings(key, token)
+            for record_id, position in zip(posting[0::2], posting[1::2])
+        }
+
+    def _match_phrase(self, key: str, tokens: typing.List[str]) -> typing.Set[int]:
+        """Get the occurrences of the first token that start the phrase."""
+        starts = self._get_occurrences(key, tokens[0])
+        for offset, token in enumerate(tokens[1:], start=1):
+            if not starts:
+                break
+            occurrences = self._get_occurrences(key, token)
+            starts = {start for start in starts if start + offset in occurrences}
+        return starts
+
+    def _evaluate_spans(
+        self, node: Query, key: str
+    ) -> typing.Dict[int, typing.List[Span]]:
+        """Evaluate an operand of a proximity operator (spans by record id)."""
+        if node.value in PROXIMITY_OPERATORS:
+            ordered = PROXIMITY_OPERATORS[node.value]
+            distance = get_distance(node)
+            result = self._evaluate_spans(node.children[0], key)
+            for child in node.children[1:]:
+                operand = self._evaluate_spans(child, key)
+                merged = {}
+                for record_id in result.keys() & operand.keys():
+                    spans = proximity_spans(
+                        result[record_id], operand[record_id], distance, ordered=ordered
+                    )
+                    if spans:
+                        merged[record_id] = spans
+                result = merged
+            return result
+
+        if node.value == Operators.OR:
+            alternatives = [self._evaluate_spans(child, key) for child in node.children]
+            record_ids = set().union(*alternatives)
+            return {
+                record_id: merge_spans(
+                    alternative.get(record_id, []) for alternative in alternatives
+                )
+                for record_id in record_ids
+            }
+
+        if node.operator:
+            raise ValueError(
+                f"Operator not supported in proximity search: {node.value}"
+            )
+
+        tokens = tokenize_term(node.value)
+        if not tokens:
+            return {}
+        positions = [self._get_positions(key, token) for token in tokens]
+        record_ids = set(positions[0]).intersection(*positions[1:])
+        result = {}
+        for record_id in record_ids:
+            spans = phrase_spans([by_record[record_id] for by_record in positions])
+            if spans:
+                result[record_id] = spans
+        return result
+
+    def _get_positions(
+        self, key: str, token: str
+    ) -> typing.Dict[int, typing.List[int]]:
+        """Get the (sorted) positions of a token by record id."""
+        positions: typing.Dict[int, typing.List[int]] = {}
+        for posting in self._get_postings(key, token):
+            for record_id, position in zip(posting[0::2], posting[1::2]):
+                positions.setdefault(record_id, []).append(position)
+        if has_wildcard(token):
+            for record_positions in positions.values():
+                record_positions.sort()
+        return positions
+
+    def _to_bitset(self, record_ids: typing.Iterable[int]) -> int:
+        bits = bytearray((self.nr_records + 7) // 8)
+        for record_id in record_ids:
+            bits[record_id >> 3] |= 1 << (record_id & 7)
+        return int.from_bytes(bits, "little")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Bounded cache of query results across queries."""
+from __future__ import annotations
+
+import sys
+import typing
+from array import array
+from collections import OrderedDict
+
+from search_query.record_index import bitset_to_ids
+
+# Cache keys: (normalized fingerprint of the subtree, version of the corpus)
+CacheKey = typing.Tuple[bytes, str]
+# Results are bitsets, stored as (sorted) record ids if these are smaller
+CompactResult = typing.Union[int, array]
+
+# Approximate memory of an entry without its result (key and bookkeeping)
+ENTRY_OVERHEAD = 200
+
+
+class ResultCache:
+    """LRU cache of subtree results (bitsets) keyed by fingerprint and corpus.
+
+    The cache can be shared by many queries evaluated on a RecordIndex
+    (RecordIndex.evaluate(query, cache=cache)): a subtree that was evaluated
+    before (in the same or another query) is not evaluated again. Subtrees
+    are identified by normalized fingerprints (the order of AND/OR operands,
+    quotes and capitalization of terms do not matter).
+
+    The least recently used results are evicted when the (approximate) memory
+    of the results exceeds max_bytes. Sparse results are stored as record ids.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[CacheKey, CompactResult] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: CacheKey) -> bool:
+        return key in self._entries
+
+    def get(self, key: CacheKey) -> typing.Optional[int]:
+        """Get a cached result (bitset) or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return _expand(entry)
+
+    def put(self, key: CacheKey, bitset: int) -> None:
+        """Cache a result (bitset), evicting the least recently used results."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        entry = _compress(bitset)
+        size = _size(entry)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= _size(evicted)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all results (the counters are kept)."""
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self) -> typing.Dict[str, int]:
+        """Get the counters of the cache."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def _compress(bitset: int) -> CompactResult:
+    """Store sparse bitsets as record ids (4 bytes per record)."""
+    nr_selected = bin(bitset).count("1")
+    if nr_selected * 32 >= bitset.bit_length():
+        return bitset
+    return array("I", bitset_to_ids(bitset))
+
+
+def _expand(entry: CompactResult) -> int:
+    if isinstance(entry, int):
+        return entry
+    bits = bytearray((entry[-1] >> 3) + 1 if entry else 0)
+    for record_id in entry:
+        bits[record_id >> 3] |= 1 << (record_id & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _size(entry: CompactResult) -> int:
+    return sys.getsizeof(entry) + ENTRY_OVERHEAD
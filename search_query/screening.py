@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Streaming record screening."""
+from __future__ import annotations
+
+import json
+import typing
+from pathlib import Path
+
+from search_query.columnar import ColumnarCorpus
+from search_query.columnar import is_corpus
+
+if typing.TYPE_CHECKING:  # pragma: no
+    from search_query.profiling import QueryProfile
+    from search_query.query import Query
+
+
+def read_records(path: typing.Union[str, Path]) -> typing.Iterator[dict]:
+    """Read records lazily from a JSONL file (one JSON object per line)."""
+    with open(path, encoding="utf-8") as file:
+        for line_nr, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"Invalid record in {path} (line {line_nr})") from exc
+
+
+def screen(
+    query: Query,
+    path: typing.Union[str, Path],
+    *,
+    ids: bool = False,
+    id_key: str = "ID",
+    profile: typing.Optional[QueryProfile] = None,
+) -> typing.Iterator[typing.Any]:
+    """Yield the records of a JSONL file that are selected by the query.
+
+    Records are read one at a time (constant memory).
+    If ids is set, the values of the id_key field are yielded instead of the
+    records (or the position of the record in the file if the field is missing).
+    If a profile is given, the evaluation of the query nodes is profiled.
+
+    If path is a columnar corpus (see build_corpus()), the query is evaluated
+    on the memory-mapped columns and the IDs of the records are yielded
+    (the corpus does not store the records).
+    """
+    if is_corpus(path):
+        if profile is not None:
+            raise ValueError("Profiling is not supported for columnar corpora")
+        with ColumnarCorpus(path) as corpus:
+            for row in corpus.search(query):
+                yield corpus.get_id(row)
+        return
+
+    matcher = query.compile_matcher(profile=profile)
+    for record_nr, record in enumerate(read_records(path)):
+        if not matcher(record):
+            continue
+        if ids:
+            yield record.get(id_key, record_nr)
+        else:
+            yield record
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import typing
 
+from search_query.constants import Operators
 
 if typing.TYPE_CHECKING:  # pragma: no
     from search_query.query import Query
@@ -12,23 +13,44 @@ if typing.TYPE_CHECKING:  # pragma: no
 def to_string_pre_notation(node: Query) -> str:
     """actual translation logic for pre-notation"""
 
-    if not hasattr(node, "value"):
-        return " (?) "
-
-    result = ""
-    node_content = node.value
-    if node.search_field:
-        node_content += f"[{node.search_field}]"
-
-    if hasattr(node, "near_param"):
-        node_content += f"({node.near_param})"
-    result = f"{result}{node_content}"
-    if node.children == []:
-        return result
-
-    result = f"{result}["
-    for child in node.children:
-        result = f"{result}{to_string_pre_notation(child)}"
-        if child != node.children[-1]:
-            result = f"{result}, "
-    return f"{result}]"
+    result: typing.List[str] = []
+
+    # Explicit stack (nodes, separators and ids of the nodes that are left):
+    # no recursion limit for deep queries
+    stack: typing.List[typing.Union[str, int, Query]] = [node]
+    on_path: typing.Set[int] = set()
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            result.append(item)
+            continue
+        if isinstance(item, int):
+            on_path.discard(item)
+            continue
+        node = item
+        if id(node) in on_path:
+            raise ValueError("Query tree with a circular reference")
+
+        if not hasattr(node, "value"):
+            result.append(" (?) ")
+            continue
+
+        node_content = node.value
+        if node.value in {Operators.NEAR, Operators.WITHIN}:
+            node_content += f"/{node.distance}"
+        if node.search_field:
+            node_content += f"[{node.search_field}]"
+        result.append(node_content)
+        if node.children == []:
+            continue
+
+        result.append("[")
+        on_path.add(id(node))
+        stack.append(id(node))
+        stack.append("]")
+        for i, child in enumerate(reversed(node.children)):
+            if i:
+                stack.append(", ")
+            stack.append(child)
+
+    return "".join(result)
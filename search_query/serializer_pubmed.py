@@ -18,10 +18,12 @@ def to_string_pubmed(node: Query) -> str:
     # to do combine nodes for SYNTAX_COMBINED_FIELDS_MAP
 
     result = ""
-    for child in node.children:
+    # Compare positions (not nodes): shared subtrees may occur several times
+    last = len(node.children) - 1
+    for i, child in enumerate(node.children):
         if not child.operator:
             # node is not an operator
-            if (child == node.children[0]) & (child != node.children[-1]):
+            if i == 0 and i != last:
                 # current element is first but not only child element
                 # -->operator does not need to be appended again
                 result = (
@@ -36,7 +38,7 @@ def to_string_pubmed(node: Query) -> str:
                     f"{get_search_field_pubmed(str(child.search_field))}"
                 )
 
-            if child == node.children[-1]:
+            if i == last:
                 # current Element is last Element -> closing parenthesis
                 result = f"{result})"
 
@@ -46,12 +48,12 @@ def to_string_pubmed(node: Query) -> str:
                 # current element is NOT Operator -> no parenthesis in PubMed
                 result = f"{result}{to_string_pubmed(child)}"
 
-            elif (child == node.children[0]) & (child != node.children[-1]):
+            elif i == 0 and i != last:
                 result = f"{result}({to_string_pubmed(child)}"
             else:
                 result = f"{result} {node.value} {to_string_pubmed(child)}"
 
-            if (child == node.children[-1]) & (child.value != Operators.NOT):
+            if i == last and child.value != Operators.NOT:
                 result = f"{result})"
     return f"{result}"
 
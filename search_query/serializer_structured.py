@@ -5,6 +5,7 @@ from __future__ import annotations
 import textwrap
 import typing
 
+from search_query.constants import Operators
 
 if typing.TYPE_CHECKING:  # pragma: no
     from search_query.query import Query
@@ -22,30 +23,62 @@ def _reindent(input_str: str, num_spaces: int) -> str:
     return "\n".join(lines)
 
 
-def to_string_structured(node: Query, *, level: int = 0) -> str:
-    """actual translation logic for structured syntax"""
+def to_string_structured(
+    node: Query,
+    *,
+    level: int = 0,
+    annotate: typing.Optional[typing.Callable[[Query], str]] = None,
+) -> str:
+    """actual translation logic for structured syntax
+
+    annotate: optional function returning a text appended to the line of a node
+    """
 
     indent = "   "
-    result = ""
+    result: typing.List[str] = []
+
+    # Explicit stack (nodes, closing texts and ids of the nodes that are left):
+    # no recursion limit for deep queries
+    stack: typing.List[typing.Union[str, int, typing.Tuple[Query, int]]] = [
+        (node, level)
+    ]
+    on_path: typing.Set[int] = set()
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            result.append(item)
+            continue
+        if isinstance(item, int):
+            on_path.discard(item)
+            continue
+        node, level = item
+        if id(node) in on_path:
+            raise ValueError("Query tree with a circular reference")
 
-    if not hasattr(node, "value"):
-        return f"{indent} (?)"
+        if not hasattr(node, "value"):
+            result.append(f"{indent} (?)")
+            continue
 
-    search_field = ""
-    if not node.operator:
-        search_field = f"[{node.search_field}]"
+        search_field = ""
+        if not node.operator:
+            search_field = f"[{node.search_field}]"
 
-    node_value = node.value
-    if hasattr(node, "near_param"):
-        node_value += f"/{node.near_param}"
-    result = _reindent(f"{node_value} {search_field}", level)
+        node_value = node.value
+        if node.value in {Operators.NEAR, Operators.WITHIN}:
+            node_value += f"/{node.distance}"
+        node_str = _reindent(f"{node_value} {search_field}", level)
+        annotation = annotate(node) if annotate is not None else ""
 
-    if node.children == []:
-        return result
+        if node.children == []:
+            result.append(node_str + annotation)
+            continue
 
-    result = f"{result}[\n"
-    for child in node.children:
-        result = f"{result}{to_string_structured(child, level=level + 1)}\n"
-    result = f"{result}{'|' + ' ' * level * 3 + ' '}]"
+        result.append(f"{node_str}[{annotation}\n")
+        on_path.add(id(node))
+        stack.append(id(node))
+        stack.append(f"{'|' + ' ' * level * 3 + ' '}]")
+        for child in reversed(node.children):
+            stack.append("\n")
+            stack.append((child, level + 1))
 
-    return result
+    return "".join(result)
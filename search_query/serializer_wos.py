@@ -15,10 +15,15 @@ def to_string_wos(node: Query) -> str:
     """actual translation logic for WOS syntax"""
 
     result = ""
-    for child in node.children:
+    operator = node.value
+    if node.value == Operators.NEAR:
+        operator += f"/{node.distance}"
+    # Compare positions (not nodes): shared subtrees may occur several times
+    last = len(node.children) - 1
+    for i, child in enumerate(node.children):
         if not child.operator:
             # node is not an operator
-            if (child == node.children[0]) & (child != node.children[-1]):
+            if i == 0 and i != last:
                 # current element is first but not only child element
                 # -->operator does not need to be appended again
                 result = (
@@ -29,9 +34,9 @@ def to_string_wos(node: Query) -> str:
 
             else:
                 # current element is not first child
-                result = f"{result} {node.value} {child.value}"
+                result = f"{result} {operator} {child.value}"
 
-            if child == node.children[-1]:
+            if i == last:
                 # current Element is last Element -> closing parenthesis
                 result = f"{result})"
 
@@ -41,12 +46,12 @@ def to_string_wos(node: Query) -> str:
                 # current element is NOT Operator -> no parenthesis in WoS
                 result = f"{result}{to_string_wos(child)}"
 
-            elif (child == node.children[0]) & (child != node.children[-1]):
+            elif i == 0 and i != last:
                 result = f"{result}({to_string_wos(child)}"
             else:
-                result = f"{result} {node.value} {to_string_wos(child)}"
+                result = f"{result} {operator} {to_string_wos(child)}"
 
-            if (child == node.children[-1]) & (child.value != Operators.NOT):
+            if i == last and child.value != Operators.NOT:
                 result = f"{result})"
     return f"{result}"
 
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Multi-term scanning of texts."""
+from __future__ import annotations
+
+import re
+import typing
+
+# Marks the end of a term in the trie
+_END = ""
+
+
+class TermScanner:
+    """Finds all occurrences of a set of terms in one pass over a text.
+
+    The terms are stored in a trie, which is compiled to a single regex
+    (a factorized alternation that prefers the longest term). The regex is
+    tried at every position of the text (lookahead), so overlapping terms are
+    found as well: the longest term matching at a position identifies all the
+    terms that match at this position (its prefixes in the trie).
+    The time per text grows with the length of the text, not with the number
+    of terms.
+    """
+
+    def __init__(self, terms: typing.Iterable[str]) -> None:
+        self.terms = frozenset(term for term in terms if term)
+        self._trie: dict = {}
+        for term in self.terms:
+            node = self._trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[_END] = term
+
+        self._prefix_terms: typing.Dict[str, typing.Tuple[str, ...]] = {
+            term: self._get_prefix_terms(term) for term in self.terms
+        }
+        self._pattern: typing.Optional[typing.Pattern] = None
+        if self.terms:
+            self._pattern = re.compile(f"(?=({self._to_regex(self._trie)}))")
+
+    def scan(self, text: str) -> typing.Set[str]:
+        """Get the terms that occur in the text."""
+        found: typing.Set[str] = set()
+        if self._pattern is None:
+            return found
+        longest_terms = set()
+        for match in self._pattern.finditer(text):
+            longest_terms.add(match.group(1))
+        for term in longest_terms:
+            found.update(self._prefix_terms[term])
+        return found
+
+    def _get_prefix_terms(self, term: str) -> typing.Tuple[str, ...]:
+        """Get the terms that are prefixes of the term (including the term)."""
+        prefix_terms = []
+        node = self._trie
+        for char in term:
+            node = node[char]
+            if _END in node:
+                prefix_terms.append(node[_END])
+        return tuple(prefix_terms)
+
+    @classmethod
+    def _to_regex(cls, node: dict) -> str:
+        """Compile a (sub)trie to a regex."""
+        alternatives = []
+        for char in sorted(key for key in node if key != _END):
+            # Path compression: append chains of single-child nodes
+            chars = char
+            child = node[char]
+            while len(child) == 1 and _END not in child:
+                (next_char,) = child
+                chars += next_char
+                child = child[next_char]
+            alternatives.append(re.escape(chars) + cls._to_regex(child))
+
+        if not alternatives:
+            return ""
+        regex = "|".join(alternatives)
+        if _END in node:
+            # Optional continuation (greedy: the longest term is preferred)
+            return f"(?:{regex})?"
+        if len(alternatives) > 1:
+            return f"(?:{regex})"
+        return regex
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Vectorized selection of record collections."""
+from __future__ import annotations
+
+import bisect
+import typing
+
+from search_query.constants import Operators
+from search_query.field_accessors import get_field_keys
+from search_query.field_accessors import get_field_text
+from search_query.matcher import compile_wildcard
+from search_query.matcher import normalize_term
+from search_query.matcher import PROXIMITY_OPERATORS
+from search_query.matcher import RecordMatcher
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if typing.TYPE_CHECKING:  # pragma: no
+    from search_query.query import Query
+
+# Row separator of the field columns (not matched by "." in wildcard regexes)
+ROW_SEPARATOR = "\n"
+# Characters that could let a regex match across rows of a column
+_UNSAFE_PATTERN_CHARS = ("\\", "[", "^", "$", "(?", ROW_SEPARATOR)
+
+
+class FieldColumn:
+    """Lowercased values of one record field, joined into a single string.
+
+    A search term is located with one scan over the joined string,
+    and the matches are mapped back to rows using the row offsets.
+    """
+
+    def __init__(self, records: typing.Sequence[dict], key: str) -> None:
+        self.texts = [get_field_text(record, key) for record in records]
+        self.text = ROW_SEPARATOR.join(self.texts)
+        self.offsets = [0]
+        for text in self.texts:
+            self.offsets.append(self.offsets[-1] + len(text) + len(ROW_SEPARATOR))
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def find_rows(self, value: str) -> typing.List[int]:
+        """Rows containing the (exact) value."""
+        rows = []
+        text, offsets = self.text, self.offsets
+        pos = text.find(value)
+        while pos != -1:
+            row = bisect.bisect_right(offsets, pos) - 1
+            rows.append(row)
+            if row + 1 >= len(offsets) - 1:
+                break
+            pos = text.find(value, offsets[row + 1])
+        return rows
+
+    def search_rows(self, pattern: typing.Pattern) -> typing.List[int]:
+        """Rows in which the regex pattern matches."""
+        rows = []
+        text, offsets = self.text, self.offsets
+        match = pattern.search(text)
+        while match is not None:
+            row = bisect.bisect_right(offsets, match.start()) - 1
+            rows.append(row)
+            if row + 1 >= len(offsets) - 1:
+                break
+            match = pattern.search(text, offsets[row + 1])
+        return rows
+
+
+class _Selection:
+    """Evaluates a query tree on all records at once.
+
+    Each node is evaluated on an array of candidate rows: the children of AND
+    (OR) nodes are only evaluated on the rows that are still selected (not yet
+    selected). Terms are evaluated with one scan of the field column,
+    or row by row when few candidate rows remain. Proximity operators are
+    evaluated row by row (on the token positions of the field).
+    """
+
+    # Fraction of rows below which terms are evaluated row by row
+    ROW_BY_ROW_FRACTION = 0.125
+
+    def __init__(self, records: typing.Sequence[dict]) -> None:
+        self.records = records
+        self.columns: typing.Dict[str, FieldColumn] = {}
+
+    def column(self, key: str) -> FieldColumn:
+        """Get the column of a record field (created on first use)."""
+        if key not in self.columns:
+            self.columns[key] = FieldColumn(self.records, key)
+        return self.columns[key]
+
+    def texts(self, key: str, rows: np.ndarray) -> typing.List[str]:
+        """Get the lowercased field values of the rows."""
+        if key in self.columns:
+            texts = self.columns[key].texts
+            return [texts[row] for row in rows]
+        return [get_field_text(self.records[row], key) for row in rows]
+
+    def evaluate(self, node: Query, rows: np.ndarray) -> np.ndarray:
+        """Evaluate a node of the query tree on the rows (boolean array)."""
+        if node.value == Operators.NOT:
+            return ~self.evaluate(node.children[0], rows)
+
+        if node.value == Operators.AND:
+            mask = np.ones(len(rows), dtype=bool)
+            active = np.arange(len(rows))
+            for child in node.children:
+                if not active.size:
+                    break
+                selected = self.evaluate(child, rows[active])
+                mask[active[~selected]] = False
+                active = active[selected]
+            return mask
+
+        if node.value == Operators.OR:
+            mask = np.zeros(len(rows), dtype=bool)
+            pending = np.arange(len(rows))
+            for child in node.children:
+                if not pending.size:
+                    break
+                selected = self.evaluate(child, rows[pending])
+                mask[pending[selected]] = True
+                pending = pending[~selected]
+            return mask
+
+        if node.value in PROXIMITY_OPERATORS:
+            matcher = RecordMatcher(node)
+            return np.fromiter(
+                (matcher(self.records[row]) for row in rows),
+                dtype=bool,
+                count=len(rows),
+            )
+
+        if node.operator:
+            raise ValueError(f"Operator not supported: {node.value}")
+
+        return self.evaluate_term(node, rows)
+
+    def evaluate_term(self, node: Query, rows: np.ndarray) -> np.ndarray:
+        """Evaluate a term on the rows (boolean array)."""
+        value = normalize_term(node.value)
+        keys = get_field_keys(node)
+        if len(keys) == 1:
+            return self.evaluate_field_term(keys[0], value, rows)
+
+        # Composite search fields match if one of their fields matches
+        mask = np.zeros(len(rows), dtype=bool)
+        pending = np.arange(len(rows))
+        for key in keys:
+            if not pending.size:
+                break
+            selected = self.evaluate_field_term(key, value, rows[pending])
+            mask[pending[selected]] = True
+            pending = pending[~selected]
+        return mask
+
+    def evaluate_field_term(self, key: str, value: str, rows: np.ndarray) -> np.ndarray:
+        """Evaluate a (normalized) term on a record field (boolean array)."""
+        # Handle wildcards
+        if "*" in value:
+            pattern = compile_wildcard(value)
+            if any(char in value for char in _UNSAFE_PATTERN_CHARS) or len(
+                rows
+            ) < self.ROW_BY_ROW_FRACTION * len(self.records):
+                # Patterns that may span rows are evaluated row by row
+                return np.fromiter(
+                    (
+                        pattern.search(text) is not None
+                        for text in self.texts(key, rows)
+                    ),
+                    dtype=bool,
+                    count=len(rows),
+                )
+            mask = np.zeros(len(self.records), dtype=bool)
+            mask[self.column(key).search_rows(pattern)] = True
+            return mask[rows]
+
+        # Match exact word
+        if ROW_SEPARATOR in value or len(rows) < self.ROW_BY_ROW_FRACTION * len(
+            self.records
+        ):
+            return np.fromiter(
+                (value in text for text in self.texts(key, rows)),
+                dtype=bool,
+                count=len(rows),
+            )
+        mask = np.zeros(len(self.records), dtype=bool)
+        mask[self.column(key).find_rows(value)] = True
+        return mask[rows]
+
+
+def select_many(query: Query, records: typing.Iterable[dict]) -> np.ndarray:
+    """Evaluate the query on a collection of records.
+
+    Returns a boolean array with the result of Query.selects() for each record.
+    Each term is evaluated once for the whole collection (one scan of the
+    field column), and the operators combine the resulting boolean arrays.
+    """
+    if np is None:  # pragma: no cover
+        raise ImportError(
+            "select_many() requires numpy (pip install search-query[numpy])"
+        )
+    if not isinstance(records, typing.Sequence):
+        records = list(records)
+    return _Selection(records).evaluate(query, np.arange(len(records)))
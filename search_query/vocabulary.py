@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Sorted vocabularies for the expansion of wildcard tokens."""
+from __future__ import annotations
+
+import bisect
+import typing
+
+from search_query.positions import compile_token_wildcard
+from search_query.positions import WILDCARD_REGEXES
+
+# Larger than the characters of tokens (upper bound of prefix ranges)
+_MAX_CHAR = "\U0010ffff"
+
+
+class SortedVocabulary:
+    """Sorted tokens of a record field.
+
+    Wildcard tokens (e.g., child*, wom?n, robots$) are expanded to the
+    matching tokens of the vocabulary: the candidates are the tokens sharing
+    the literal prefix (or, if it is longer, the literal suffix) of the
+    wildcard token, located by binary search in the sorted tokens (or the
+    sorted reversed tokens). Only the candidates are matched against the
+    wildcard regex, and expansions are cached.
+    """
+
+    def __init__(self, tokens: typing.Iterable[str]) -> None:
+        self.tokens = sorted(tokens)
+        self._reversed = sorted(token[::-1] for token in self.tokens)
+        self._expansions: typing.Dict[str, typing.List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def __contains__(self, token: str) -> bool:
+        i = bisect.bisect_left(self.tokens, token)
+        return i < len(self.tokens) and self.tokens[i] == token
+
+    def expand(self, token: str) -> typing.List[str]:
+        """Get the (sorted) tokens that match a token with wildcards."""
+        if token in self._expansions:
+            return self._expansions[token]
+
+        wildcards = [i for i, char in enumerate(token) if char in WILDCARD_REGEXES]
+        if not wildcards:
+            expansion = [token] if token in self else []
+        else:
+            prefix = token[: wildcards[0]]
+            suffix = token[wildcards[-1] + 1 :]
+            if len(suffix) > len(prefix):
+                candidates = sorted(
+                    candidate[::-1]
+                    for candidate in _prefix_range(self._reversed, suffix[::-1])
+                )
+            else:
+                candidates = _prefix_range(self.tokens, prefix)
+            if token == f"{prefix}*":
+                # Truncation: all tokens with the prefix match
+                expansion = candidates
+            else:
+                pattern = compile_token_wildcard(token)
+                expansion = [
+                    candidate
+                    for candidate in candidates
+                    if pattern.fullmatch(candidate)
+                ]
+
+        self._expansions[token] = expansion
+        return expansion
+
+
+def _prefix_range(tokens: typing.List[str], prefix: str) -> typing.List[str]:
+    """Get the tokens (sorted) that start with the prefix."""
+    start = bisect.bisect_left(tokens, prefix)
+    end = bisect.bisect_left(tokens, prefix + _MAX_CHAR, start)
+    return tokens[start:end]
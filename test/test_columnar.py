@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""Tests for the memory-mapped columnar corpus"""
+import json
+from pathlib import Path
+
+import pytest
+
+from search_query import columnar
+from search_query.and_query import AndQuery
+from search_query.cli import main
+from search_query.columnar import build_corpus
+from search_query.columnar import ColumnarCorpus
+from search_query.columnar import is_corpus
+from search_query.constants import Fields
+from search_query.near_query import NEARQuery
+from search_query.not_query import NotQuery
+from search_query.or_query import OrQuery
+from search_query.parallel import select_parallel
+from search_query.query import Query
+from search_query.query import SearchField
+from search_query.record_index import bitset_to_ids
+from search_query.screening import screen
+
+RECORDS = [
+    {"ID": "a", "title": "Robots in Medicine", "abstract": "ethics"},
+    {"ID": "b", "title": "Unrelated", "keywords": ["robotics", "Care"]},
+    {"title": "Medicine", "abstract": "moral questions"},
+    {"ID": "d", "title": "Health care", "abstract": "robot ethics", "year": 2020},
+    {"ID": "e"},
+]
+
+
+def _title(*values: str) -> OrQuery:
+    return OrQuery(list(values), search_field=SearchField(Fields.TITLE))
+
+
+def _abstract(*values: str) -> OrQuery:
+    return OrQuery(list(values), search_field=SearchField(Fields.ABSTRACT))
+
+
+@pytest.fixture(name="corpus_dir")
+def fixture_corpus_dir(tmp_path: Path) -> Path:
+    corpus_dir = tmp_path / "corpus"
+    assert build_corpus(RECORDS, corpus_dir) == len(RECORDS)
+    return corpus_dir
+
+
+def test_build_corpus(corpus_dir: Path) -> None:
+    assert is_corpus(corpus_dir)
+    assert not is_corpus(corpus_dir.parent)
+    meta = ColumnarCorpus.read_meta(corpus_dir)
+    assert meta["nr_records"] == len(RECORDS)
+    # Columns without values are omitted
+    assert set(meta["columns"]) == {"_id", "title", "abstract", "keywords", "year"}
+    assert (corpus_dir / "title.txt").read_bytes() == (
+        b"robots in medicine\nunrelated\nmedicine\nhealth care\n\n"
+    )
+
+    with ColumnarCorpus(corpus_dir) as corpus:
+        assert [corpus.get_id(row) for row in range(len(RECORDS))] == [
+            "a",
+            "b",
+            "2",
+            "d",
+            "e",
+        ]
+        assert bytes(corpus.columns["keywords"].row(1)) == b"robotics; care"
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        _title("medicine"),
+        _title('"Robots in"', "care"),
+        _title("robot*"),
+        _title("med*ne"),
+        _abstract("ethic*", "moral*"),
+        _abstract("ethic"),
+        NotQuery(["medicine"], search_field=SearchField(Fields.TITLE)),
+        AndQuery(
+            [_title("medicine", "health"), _abstract("ethic*")],
+            search_field=SearchField(Fields.TITLE),
+        ),
+        OrQuery(["robot*", "care"], search_field=SearchField(Fields.TOPIC)),
+        OrQuery(["2020"], search_field=SearchField(Fields.YEAR)),
+        OrQuery(["medicine"], search_field=SearchField(Fields.AUTHOR)),
+        NEARQuery(1, ["robots", "medicine"], search_field="ti"),
+    ],
+)
+@pytest.mark.parametrize("sparse_factor", [1, 1000])
+def test_corpus_search(
+    corpus_dir: Path, query: Query, sparse_factor: int, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Scan the columns / check the (sparse) candidate rows
+    monkeypatch.setattr(columnar, "SPARSE_FACTOR", sparse_factor)
+    expected = [
+        i for i, record in enumerate(RECORDS) if query.selects(record_dict=record)
+    ]
+    with ColumnarCorpus(corpus_dir) as corpus:
+        assert corpus.search(query) == expected
+        assert corpus.count(query) == len(expected)
+
+        # Ranges of rows
+        for start in range(len(RECORDS)):
+            result = bitset_to_ids(corpus.evaluate(query, start=start, end=start + 2))
+            assert [start + i for i in result] == [
+                i for i in expected if start <= i < start + 2
+            ]
+
+
+def test_corpus_screen(corpus_dir: Path) -> None:
+    query = _title("medicine")
+    assert list(screen(query, corpus_dir)) == ["a", "2"]
+    assert select_parallel(query, corpus_dir, max_workers=2, chunk_size=2) == [0, 2]
+
+
+def test_cli_build_corpus(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    records_path = tmp_path / "records.jsonl"
+    records_path.write_text(
+        "\n".join(json.dumps(record) for record in RECORDS), encoding="utf-8"
+    )
+    corpus_dir = tmp_path / "corpus"
+
+    with pytest.raises(SystemExit) as exc:
+        main(["build-corpus", str(records_path), str(corpus_dir)])
+    assert exc.value.code == 0
+
+    with pytest.raises(SystemExit) as exc:
+        main(["screen", "--query", "TI=(robot* OR care)", str(corpus_dir)])
+    assert exc.value.code == 0
+    assert capsys.readouterr().out.split() == ["a", "d"]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Tests for the compact form and the sharing of subtrees"""
+import pickle
+
+from search_query.and_query import AndQuery
+from search_query.compact import count_nodes
+from search_query.compact import from_compact
+from search_query.compact import share_subtrees
+from search_query.compact import to_compact
+from search_query.constants import Fields
+from search_query.or_query import OrQuery
+from search_query.profiling import QueryProfile
+from search_query.query import SearchField
+from search_query.record_index import RecordIndex
+
+RECORDS = [
+    {"title": "Robots in medicine", "abstract": "ethics"},
+    {"title": "Robotic surgery", "abstract": "costs"},
+    {"title": "Medicine", "abstract": "moral questions of robotics"},
+]
+
+
+def _block() -> OrQuery:
+    return OrQuery(["robot*", "surgery"], search_field=SearchField(Fields.TITLE))
+
+
+def _query() -> OrQuery:
+    # The same block occurs three times (e.g., spliced in from a search history)
+    return OrQuery(
+        [
+            AndQuery(
+                [
+                    _block(),
+                    OrQuery(["ethic*"], search_field=SearchField(Fields.ABSTRACT)),
+                ],
+                search_field=SearchField(Fields.TITLE),
+            ),
+            AndQuery(
+                [
+                    _block(),
+                    OrQuery(["moral*"], search_field=SearchField(Fields.ABSTRACT)),
+                ],
+                search_field=SearchField(Fields.TITLE),
+            ),
+            _block(),
+        ],
+        search_field=SearchField(Fields.TITLE),
+    )
+
+
+def test_share_subtrees() -> None:
+    query = _query()
+    assert count_nodes(query) == 16
+
+    shared = share_subtrees(query)
+
+    assert shared is query
+    assert count_nodes(query) == 10
+    first, second, third = query.children
+    assert first.children[0] is second.children[0] is third
+    assert to_compact(query) == to_compact(_query())
+    assert query.to_string("pre_notation") == _query().to_string("pre_notation")
+
+
+def test_shared_subtrees_evaluated_once() -> None:
+    query = share_subtrees(_query())
+    expected = [_query().selects(record_dict=record) for record in RECORDS]
+
+    profile = QueryProfile()
+    matcher = query.compile_matcher(profile=profile)
+    assert [matcher(record) for record in RECORDS] == expected
+    assert [query.selects(record_dict=record) for record in RECORDS] == expected
+    assert profile[query.children[2]].evaluated == len(RECORDS)
+
+    index = RecordIndex(RECORDS)
+    assert index.search(query) == index.search(_query())
+
+
+def test_compact_form_of_shared_subtrees() -> None:
+    query = share_subtrees(_query())
+
+    compact = to_compact(query)
+    assert compact[3][0][3][0] is compact[3][2]
+    assert len(pickle.dumps(compact)) < len(pickle.dumps(to_compact(_query())))
+
+    restored = from_compact(pickle.loads(pickle.dumps(compact)))
+    assert count_nodes(restored) == 10
+    assert to_compact(restored) == compact
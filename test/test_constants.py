@@ -3,6 +3,8 @@
 from collections import Counter
 
 from search_query.constants import QueryErrorCode
+from search_query.constants import Token
+from search_query.constants import TokenTypes
 
 # pylint: disable=line-too-long
 # flake8: noqa: E501
@@ -47,3 +49,22 @@ def test_assert_error_codes_not_none() -> None:
     codes = [e.code for e in QueryErrorCode]
 
     assert all(code is not None for code in codes), "Error codes should not be None"
+
+
+# Token predicates use the flags set with the type
+def test_token_type_flags() -> None:
+    predicates = {
+        TokenTypes.LOGIC_OPERATOR: {"is_operator", "is_logic_operator"},
+        TokenTypes.PROXIMITY_OPERATOR: {"is_operator", "is_proximity_operator"},
+        TokenTypes.FIELD: {"is_field"},
+        TokenTypes.SEARCH_TERM: {"is_search_term"},
+        TokenTypes.PARENTHESIS_OPEN: {"is_parenthesis"},
+        TokenTypes.PARENTHESIS_CLOSED: {"is_parenthesis"},
+        TokenTypes.UNKNOWN: set(),
+    }
+    names = set().union(*predicates.values())
+    for token_type, expected in predicates.items():
+        token = Token(value="x", type=token_type, position=(0, 1))
+        assert {name for name in names if getattr(token, name)()} == expected
+    # Flags are not compared
+    assert Token("x", TokenTypes.FIELD, (0, 1)) == Token("x", TokenTypes.FIELD, (0, 1))
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""Tests for the record fields of the search fields"""
+import pytest
+
+from search_query.constants import Fields
+from search_query.field_accessors import FIELD_KEYS
+from search_query.field_accessors import get_field_keys
+from search_query.field_accessors import get_field_text
+from search_query.or_query import OrQuery
+from search_query.query import Query
+from search_query.query import SearchField
+
+RECORD = {
+    "title": "Robots in Medicine",
+    "abstract": "We discuss ethics.",
+    "keywords": ["Robotics", "Care"],
+    "year": 2021,
+    "journal": "Journal of Medical Ethics",
+}
+
+
+def test_composite_fields() -> None:
+    assert FIELD_KEYS[Fields.TOPIC] == ("title", "abstract", "keywords")
+    assert FIELD_KEYS["[tiab]"] == ("title", "abstract")
+    assert set(FIELD_KEYS[Fields.ALL]) >= {"title", "abstract", "year", "doi"}
+
+
+def test_get_field_keys() -> None:
+    assert get_field_keys(Query("robot", search_field=SearchField("ti"))) == ("title",)
+    with pytest.raises(ValueError):
+        get_field_keys(Query("robot"))
+    with pytest.raises(ValueError):
+        get_field_keys(Query("robot", search_field=SearchField(Fields.MESH_TERM)))
+
+
+def test_get_field_text() -> None:
+    assert get_field_text(RECORD, "title") == "robots in medicine"
+    assert get_field_text(RECORD, "keywords") == "robotics; care"
+    assert get_field_text(RECORD, "year") == "2021"
+    assert get_field_text(RECORD, "doi") == ""
+
+
+@pytest.mark.parametrize(
+    "field, value, expected",
+    [
+        (Fields.TOPIC, "ethic*", True),
+        (Fields.TOPIC, "care", True),
+        (Fields.TOPIC, "journal", False),
+        (Fields.ALL, "journal", True),
+        (Fields.ALL, "2021", True),
+        (Fields.YEAR, "2021", True),
+        (Fields.PUBLICATION_NAME, "medical ethics", True),
+        ("[tiab]", "robots", True),
+        ("[tiab]", "robotics", False),
+    ],
+)
+def test_selects_fields(field: str, value: str, expected: bool) -> None:
+    query = OrQuery([value], search_field=SearchField(field))
+
+    assert query.selects(record_dict=RECORD) == expected
+    assert query.compile_matcher()(RECORD) == expected
+    assert query.compile_matcher(multi_term=True)(RECORD) == expected
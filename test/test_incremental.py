@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""Tests for the incremental re-evaluation of edited queries"""
+from search_query.and_query import AndQuery
+from search_query.compact import fingerprint
+from search_query.constants import Fields
+from search_query.incremental import IncrementalEvaluator
+from search_query.not_query import NotQuery
+from search_query.or_query import OrQuery
+from search_query.query import SearchField
+from search_query.record_index import RecordIndex
+
+RECORDS = [
+    {"title": "Robots in medicine", "abstract": "ethics"},
+    {"title": "Robotic surgery", "abstract": "costs"},
+    {"title": "Medicine", "abstract": "moral questions"},
+    {"title": "Unrelated", "abstract": "ethical survey"},
+]
+
+
+def _query() -> AndQuery:
+    return AndQuery(
+        [
+            OrQuery(["robots", "surgery"], search_field=SearchField(Fields.TITLE)),
+            OrQuery(["ethic*", "moral*"], search_field=SearchField(Fields.ABSTRACT)),
+            NotQuery(["survey"], search_field=SearchField(Fields.ABSTRACT)),
+        ],
+        search_field=SearchField(Fields.TITLE),
+    )
+
+
+def test_fingerprint() -> None:
+    query = _query()
+    memo: dict = {}
+
+    assert fingerprint(query, memo=memo) == fingerprint(_query())
+    assert len(memo) == 9
+    assert memo[id(query.children[0])] != memo[id(query.children[1])]
+
+    query.children[0].children[0].value = "robot*"
+    assert fingerprint(query) != fingerprint(_query())
+
+
+def test_incremental_evaluation() -> None:
+    index = RecordIndex(RECORDS)
+    evaluator = IncrementalEvaluator(index)
+    query = _query()
+
+    assert evaluator.search(query) == [0]
+    assert (evaluator.computed, evaluator.reused) == (9, 0)
+
+    # Edit one term: only the path to the root is recomputed
+    query.children[0].children[1].value = "medicine"
+    assert evaluator.search(query) == index.search(query) == [0, 2]
+    assert evaluator.computed == 3
+    assert evaluator.reused == 3
+
+    # Unchanged query
+    assert evaluator.count(query) == 2
+    assert (evaluator.computed, evaluator.reused) == (0, 1)
+
+
+def test_incremental_evaluation_new_records() -> None:
+    index = RecordIndex(RECORDS)
+    evaluator = IncrementalEvaluator(index)
+    query = _query()
+    evaluator.evaluate(query)
+
+    index.add({"title": "Surgery robots", "abstract": "moral issues"})
+    assert evaluator.search(query) == [0, 4]
+    assert evaluator.reused == 0
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+"""Tests for the compiled record matcher"""
+import typing
+
+import pytest
+
+import search_query.query
+from search_query.and_query import AndQuery
+from search_query.constants import Fields
+from search_query.near_query import NEARQuery
+from search_query.not_query import NotQuery
+from search_query.or_query import OrQuery
+from search_query.parser_ebsco import EBSCOParser
+from search_query.proximity_query_ebsco import EBSCOProximityNear
+from search_query.proximity_query_ebsco import EBSCOProximityWithin
+from search_query.query import Query
+from search_query.query import SearchField
+
+# flake8: noqa: E501
+
+RECORDS = [
+    {
+        "title": "Artificial Intelligence in Health Care",
+        "abstract": "This study explores the role of AI and machine learning in improving health outcomes.",
+    },
+    {
+        "title": "Moral Implications of Artificial Intelligence",
+        "abstract": "Examines ethical concerns in AI development.",
+    },
+    {
+        "title": "Unrelated Title",
+        "abstract": "This abstract is about something else entirely.",
+    },
+    {
+        "title": "Title with AI and medicine",
+        "abstract": "abstract containing ethics.",
+    },
+    {
+        "title": "Robots in medicine",
+    },
+    {},
+]
+
+
+def _complete_query() -> Query:
+    query_robot = NotQuery(["robot*"], search_field=SearchField(Fields.TITLE))
+    query_ai = OrQuery(
+        ['"AI"', '"Artificial Intelligence"', '"Machine Learning"', query_robot],
+        search_field=SearchField(Fields.TITLE),
+    )
+    query_health = OrQuery(
+        ['"health care"', "medicine"], search_field=SearchField(Fields.TITLE)
+    )
+    query_ethics = OrQuery(
+        ["ethic*", "moral*"], search_field=SearchField(Fields.ABSTRACT)
+    )
+    return AndQuery(
+        [query_ai, query_health, query_ethics], search_field=SearchField(Fields.TITLE)
+    )
+
+
+def test_matcher_equals_selects() -> None:
+    """The compiled matcher gives the same answers as selects()"""
+    query = _complete_query()
+
+    for subquery in [query, *query.children]:
+        matcher = subquery.compile_matcher()
+        for record in RECORDS:
+            assert matcher(record) == subquery.selects(record_dict=record)
+
+
+def test_multi_term_matcher_equals_selects() -> None:
+    """The multi-term matcher gives the same answers as selects()"""
+    query = _complete_query()
+
+    for subquery in [query, *query.children]:
+        matcher = subquery.compile_matcher(multi_term=True)
+        for record in RECORDS:
+            assert matcher(record) == subquery.selects(record_dict=record)
+
+
+def test_matcher_reusable() -> None:
+    query = OrQuery(["medicine", "ethic*"], search_field=SearchField(Fields.TITLE))
+    matcher = query.compile_matcher()
+
+    assert [matcher(r) for r in RECORDS] == [False, False, False, True, True, False]
+    # Repeated evaluation of the same matcher
+    assert [matcher(r) for r in RECORDS] == [False, False, False, True, True, False]
+    assert matcher.keys == ("title",)
+
+
+def test_matcher_invalid_search_field() -> None:
+    query = OrQuery(["medicine"], search_field=SearchField(Fields.MESH_TERM))
+    with pytest.raises(ValueError):
+        query.compile_matcher()
+
+
+def _near(distance: int, *children: typing.Union[str, Query]) -> NEARQuery:
+    return NEARQuery(distance, list(children), search_field=SearchField(Fields.TITLE))
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        # "intelligence [in] health": one word between
+        (_near(1, "intelligence", "health"), [True, False, False, False, False, False]),
+        (_near(0, "intelligence", "health"), [False] * 6),
+        # NEAR matches in any order
+        (_near(1, "health", "intelligence"), [True, False, False, False, False, False]),
+        (_near(0, '"health care"', "in"), [True, False, False, False, False, False]),
+        (_near(2, "artificial", "moral*"), [False, True, False, False, False, False]),
+        (
+            _near(
+                2,
+                OrQuery(["ai", "robots"], search_field=SearchField(Fields.TITLE)),
+                "medicine",
+            ),
+            [False, False, False, True, True, False],
+        ),
+        # Terms match whole tokens
+        (_near(5, "robot", "medicine"), [False] * 6),
+        (
+            _near(1, _near(0, "artificial", "intelligence"), "health"),
+            [True] + [False] * 5,
+        ),
+    ],
+)
+def test_matcher_near(query: Query, expected: list) -> None:
+    matcher = query.compile_matcher()
+
+    assert [matcher(r) for r in RECORDS] == expected
+    assert [query.selects(record_dict=r) for r in RECORDS] == expected
+    assert [query.compile_matcher(multi_term=True)(r) for r in RECORDS] == expected
+
+
+def test_selects_near_compiled_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    compiled = []
+    compile_matcher = search_query.query.compile_matcher
+
+    def _compile_matcher(query: Query) -> typing.Any:
+        compiled.append(query)
+        return compile_matcher(query)
+
+    monkeypatch.setattr(search_query.query, "compile_matcher", _compile_matcher)
+    query = _near(1, "intelligence", "health")
+
+    assert [query.selects(record_dict=r) for r in RECORDS] == [True] + [False] * 5
+    assert len(compiled) == 1
+    # Compiled again after an edit of the subtree
+    query.children[0].value = "moral"
+    assert [query.selects(record_dict=r) for r in RECORDS] == [False] * 6
+    assert len(compiled) == 2
+    query.search_field.value = Fields.ABSTRACT
+    query.children[0].value = "machine"
+    query.children[1].value = "learning"
+    assert [query.selects(record_dict=r) for r in RECORDS] == [True] + [False] * 5
+    assert len(compiled) == 3
+
+
+def test_matcher_within() -> None:
+    title = SearchField(Fields.TITLE)
+    within = EBSCOProximityWithin(
+        ["artificial", "health"], search_field=title, distance=2
+    )
+    within_reversed = EBSCOProximityWithin(
+        ["health", "artificial"], search_field=title, distance=2
+    )
+    near_reversed = EBSCOProximityNear(
+        ["health", "artificial"], search_field=title, distance=2
+    )
+
+    assert within.selects(record_dict=RECORDS[0])
+    assert not within_reversed.selects(record_dict=RECORDS[0])
+    assert near_reversed.selects(record_dict=RECORDS[0])
+
+
+def test_matcher_near_inherits_search_field() -> None:
+    query = EBSCOProximityNear(
+        [Query("moral", search_field=SearchField(Fields.TITLE)), Query("artificial")],
+        search_field=SearchField(Fields.TITLE),
+        distance=2,
+    )
+
+    assert [query.selects(record_dict=r) for r in RECORDS] == [False, True] + [
+        False
+    ] * 4
+
+
+def test_matcher_near_parsed() -> None:
+    query = EBSCOParser("TI robots N1 medicine", "", "non-strict").parse()
+
+    assert query.compile_matcher()(RECORDS[4])
+    assert not query.compile_matcher()(RECORDS[3])
+
+
+def test_matcher_unsupported_operator() -> None:
+    query = _near(
+        2,
+        AndQuery(["health", "care"], search_field=SearchField(Fields.TITLE)),
+        "artificial",
+    )
+    with pytest.raises(ValueError):
+        query.compile_matcher()
+
+
+def test_matcher_near_across_search_fields() -> None:
+    query = _near(
+        2, "health", Query("ethics", search_field=SearchField(Fields.ABSTRACT))
+    )
+    with pytest.raises(ValueError):
+        query.compile_matcher()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""Tests for the parallel selection of records"""
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from search_query.and_query import AndQuery
+from search_query.compact import from_compact
+from search_query.compact import to_compact
+from search_query.constants import Fields
+from search_query.not_query import NotQuery
+from search_query.or_query import OrQuery
+from search_query.exception import QuerySyntaxError
+from search_query.parallel import select_parallel
+from search_query.parser import parse_with_messages
+from search_query.query import Query
+from search_query.query import SearchField
+
+RECORDS = [
+    {"title": "Robots in medicine", "abstract": "ethics"},
+    {"title": "Unrelated"},
+    {"title": "Medicine", "abstract": "moral questions"},
+    {"title": "Health care", "abstract": "robot ethics"},
+] * 25
+
+
+def _query() -> Query:
+    return AndQuery(
+        [
+            OrQuery(
+                ["medicine", '"health care"', NotQuery(["robot*"], search_field="ti")],
+                search_field=SearchField(Fields.TITLE),
+            ),
+            OrQuery(["ethic*", "moral*"], search_field=SearchField(Fields.ABSTRACT)),
+        ],
+        search_field=SearchField(Fields.TITLE),
+    )
+
+
+def test_compact_round_trip() -> None:
+    query = _query()
+    compact = to_compact(query)
+
+    assert pickle.loads(pickle.dumps(compact)) == compact
+    assert hash(compact)
+    restored = from_compact(compact)
+    assert restored.to_string("structured") == query.to_string("structured")
+    assert to_compact(restored) == compact
+
+
+def test_compact_distance() -> None:
+    query = Query(
+        "NEAR",
+        operator=True,
+        distance=3,
+        children=[Query("a", search_field=SearchField(Fields.TITLE))],
+    )
+    assert from_compact(to_compact(query)).distance == 3
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_select_parallel(chunk_size: int) -> None:
+    query = _query()
+    expected = [i for i, r in enumerate(RECORDS) if query.selects(record_dict=r)]
+
+    result = select_parallel(query, iter(RECORDS), max_workers=2, chunk_size=chunk_size)
+    assert result == expected
+
+
+def test_select_parallel_invalid_chunk_size() -> None:
+    with pytest.raises(ValueError):
+        select_parallel(_query(), RECORDS, chunk_size=0)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 1000])
+def test_select_parallel_file(tmp_path: Path, chunk_size: int) -> None:
+    query = _query()
+    expected = [i for i, r in enumerate(RECORDS) if query.selects(record_dict=r)]
+    path = tmp_path / "records.jsonl"
+    path.write_text(
+        "\n".join(json.dumps(record) for record in RECORDS) + "\n\n",
+        encoding="utf-8",
+    )
+
+    result = select_parallel(query, path, max_workers=2, chunk_size=chunk_size)
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    "syntax, query_list",
+    [
+        ("pubmed", "1. a[mh] OR b[mh]\n2. c[tiab]\n3. d[ti]\n4. #1 AND (#2 OR #3)"),
+        ("ebscohost", "1. TI a OR AB b\n2. TI c\n3. AB d\n4. S1 AND S2 NOT S3"),
+        ("wos", "1. TS=(a OR b)\n2. TI=c\n3. AB=d\n4. #1 AND #2 AND #3"),
+    ],
+)
+def test_parse_list_parallel(syntax: str, query_list: str) -> None:
+    expected = parse_with_messages(query_list, "", syntax=syntax, mode="")
+    result = parse_with_messages(query_list, "", syntax=syntax, mode="", max_workers=2)
+
+    assert result.query.to_string() == expected.query.to_string()
+    assert result.linter_messages == expected.linter_messages
+
+
+def test_parse_list_parallel_error_position() -> None:
+    query_list = "1. a[mh]\n2. c[mh] OR d[xx]\n3. #1 OR #2"
+    with pytest.raises(QuerySyntaxError) as exc_info:
+        parse_with_messages(query_list, "", syntax="pubmed", max_workers=2)
+
+    assert exc_info.value.position == (22, 26)
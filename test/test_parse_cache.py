@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Tests for the parse cache"""
+import pytest
+
+from search_query.parser import parse
+from search_query.parser import parse_with_messages
+from search_query.parser import ParseCache
+
+QUERY_STR = "TI=(robot* OR medicine) AND AB=ethic*"
+
+
+def test_parse_cache() -> None:
+    cache = ParseCache()
+    query = parse(QUERY_STR, "", cache=cache)
+    assert cache.stats() == {"entries": 1, "hits": 0, "misses": 1}
+
+    cached = parse(QUERY_STR, "", cache=cache)
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+    assert cached.to_string() == query.to_string() == parse(QUERY_STR, "").to_string()
+    assert cached is not query
+
+    # Other keys are parsed again
+    parse(QUERY_STR, "", syntax="wos", mode="non-strict", cache=cache)
+    parse("TS=robot*", "", cache=cache)
+    assert cache.stats() == {"entries": 3, "hits": 1, "misses": 3}
+
+
+def test_parse_cache_copies() -> None:
+    cache = ParseCache()
+    query = parse(QUERY_STR, "", cache=cache)
+    expected = query.to_string()
+
+    # Changes of the returned trees do not affect the cache
+    query.children[0].children[0].value = "changed"
+    query.children.pop()
+    cached = parse(QUERY_STR, "", cache=cache)
+    assert cached.to_string() == expected
+
+    cached.children[0].value = "AND"
+    assert parse(QUERY_STR, "", cache=cache).to_string() == expected
+
+
+def test_parse_cache_linter_messages(capsys: pytest.CaptureFixture) -> None:
+    cache = ParseCache()
+    query_str = "TI=(robot* or medicine)"
+    result = parse_with_messages(query_str, "", mode="non-strict", cache=cache)
+    assert [msg["code"] for msg in result.linter_messages]
+    printed = capsys.readouterr().out
+    assert printed
+
+    cached = parse_with_messages(query_str, "", mode="non-strict", cache=cache)
+    assert cached.linter_messages == result.linter_messages
+    assert cached.query.to_string() == result.query.to_string()
+    # The messages are returned (not printed again)
+    assert capsys.readouterr().out == ""
+
+    cached.linter_messages.clear()
+    assert parse_with_messages(
+        query_str, "", mode="non-strict", cache=cache
+    ).linter_messages
+
+
+def test_parse_cache_lru() -> None:
+    cache = ParseCache(maxsize=2)
+    for term in ["a", "b", "a", "c"]:
+        parse(f"TI={term}", "", cache=cache)
+    assert len(cache) == 2
+    assert cache.stats()["hits"] == 1
+    # "b" was evicted (least recently used)
+    parse("TI=a", "", cache=cache)
+    parse("TI=b", "", cache=cache)
+    assert cache.stats() == {"entries": 2, "hits": 2, "misses": 4}
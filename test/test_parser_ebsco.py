@@ -11,6 +11,7 @@ from search_query.constants import Token
 from search_query.constants import TokenTypes
 from search_query.parser import parse
 from search_query.parser_base import QueryStringParser
+from search_query.parser_ebsco import EBSCOListParser
 from search_query.parser_ebsco import EBSCOParser
 from search_query.query import Query
 
@@ -73,7 +74,7 @@ def test_tokenization_ebsco(
     [
         (
             'TI "Artificial Intelligence" AND AB Future NOT AB Past',
-            'TI "Artificial Intelligence" AND ( ( AB Future NOT AB Past ) ) ',
+            'TI "Artificial Intelligence" AND ( AB Future NOT AB Past ) ',
         ),
         (
             'TI "Artificial Intelligence" NOT AB Future AND AB Past',
@@ -99,6 +100,18 @@ def test_tokenization_ebsco(
             'TI "Robo*" OR AB Robots AND AB Ethics NOT AB Bias OR SU "Technology"',
             'TI "Robo*" OR ( AB Robots AND ( AB Ethics NOT AB Bias ) ) OR SU "Technology" ',
         ),
+        (
+            'TI "AI" AND AB Robots OR AB Ethics AND SU Bias',
+            '( TI "AI" AND AB Robots ) OR ( AB Ethics AND SU Bias ) ',
+        ),
+        (
+            'TI "AI" OR (AB Robots AND AB Ethics OR SU Bias)',
+            'TI "AI" OR ( ( AB Robots AND AB Ethics ) OR SU Bias ) ',
+        ),
+        (
+            'TI "AI" NOT AB Robots OR AB Ethics AND SU Bias NOT TI Robots',
+            '( TI "AI" NOT AB Robots ) OR ( AB Ethics AND ( SU Bias NOT TI Robots ) ) ',
+        ),
     ],
 )
 def test_add_artificial_parentheses_for_operator_precedence(
@@ -295,3 +308,36 @@ def test_query_parsing_1() -> None:
     assert query.children[1].children[1].value == "John Wayne"
     assert query.children[1].children[1].search_field
     assert query.children[1].children[1].search_field.value == "au"
+
+
+@pytest.mark.parametrize(
+    "query_string, expected",
+    [
+        ("TI (robot N3 care)", "NEAR/3[ti][robot[ti], care[ti]]"),
+        ("TI robot W0 AB care", "WITHIN/0[robot[ti], care[ab]]"),
+    ],
+)
+def test_proximity_round_trip(query_string: str, expected: str) -> None:
+    query = EBSCOParser(query_string, "", mode="").parse()
+    assert query.to_string() == expected
+    assert query.to_string("structured").startswith(expected.split("[", 1)[0] + "[")
+
+    # The distance is kept when the query is serialized and parsed again
+    parsed = EBSCOParser(query.to_string("ebscohost"), "", mode="").parse()
+    assert (parsed.value, parsed.distance) == (query.value, query.distance)
+    assert [child.to_string() for child in parsed.children] == [
+        child.to_string() for child in query.children
+    ]
+
+
+def test_list_parser_ebsco() -> None:
+    query_list = "1. TI a OR AB b\n2. TI c\n3. S1 OR S2 AND S1"
+    query = EBSCOListParser(query_list, "", mode="strict").parse()
+
+    assert query.to_string() == "OR[OR[a[ti], b[ab]], AND[c[ti], OR[a[ti], b[ab]]]]"
+    assert query.children[0] is query.children[1].children[1]
+    # Positions refer to the list query
+    term = query.children[1].children[0]
+    assert query_list[slice(*term.position)] == "c"
+    assert query_list[slice(*term.search_field.position)] == "TI"
+    assert query_list[slice(*query.children[0].position)] == "OR"
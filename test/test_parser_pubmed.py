@@ -4,10 +4,13 @@ from typing import Tuple
 
 import pytest  # type: ignore
 
+from search_query.constants import Fields
 from search_query.constants import QueryErrorCode
 from search_query.constants import Token
 from search_query.constants import TokenTypes
+from search_query.exception import QuerySyntaxError
 from search_query.exception import SearchQueryException
+from search_query.parser_pubmed import PubmedListParser
 from search_query.parser_pubmed import PubmedParser
 
 # to run (from top-level dir): pytest test/test_parser_pubmed.py
@@ -63,7 +66,11 @@ def test_tokenization_pubmed(query_str: str, expected_tokens: list) -> None:
             '(eHealth[Title/Abstract] OR "eHealth"[MeSH Terms]) AND Review[Publication Type]',
             # TODO : should the operators have search_field?
             'AND[all][OR[all][OR[all][eHealth[ti], eHealth[ab]], "eHealth"[mh]], Review[pt]]',
-        )
+        ),
+        (
+            "a[mh] OR b[mh] OR c[mh] AND (d[mh] OR e[mh]) AND f[mh] NOT g[mh]",
+            "NOT[all][AND[all][OR[all][a[mh], b[mh], c[mh]], OR[all][d[mh], e[mh]], f[mh]], g[mh]]",
+        ),
     ],
 )
 def test_parser_pubmed(query_str: str, expected_translation: str) -> None:
@@ -72,6 +79,46 @@ def test_parser_pubmed(query_str: str, expected_translation: str) -> None:
     assert expected_translation == query_tree.to_string(), print(query_tree.to_string())
 
 
+def test_parse_query_tree_positions() -> None:
+    query_str = "a[mh] OR (b[mh] AND c[mh]) NOT d[mh]"
+    pubmed_parser = PubmedParser(query_str, "")
+    pubmed_parser.tokenize()
+    query_tree = pubmed_parser.parse_query_tree(pubmed_parser.tokens)
+
+    assert query_tree.value == "NOT"
+    assert query_tree.position == (0, 36)
+    or_query, d_query = query_tree.children
+    assert or_query.position == (0, 26)
+    assert d_query.position == (31, 36)
+    assert d_query.search_field.position == (32, 36)
+    assert or_query.children[1].position == (10, 25)
+
+
+def test_parse_long_or_block() -> None:
+    query_str = "(" + " OR ".join(f"t{i}[tiab]" for i in range(5000)) + ") AND x[mh]"
+    pubmed_parser = PubmedParser(query_str, "")
+    pubmed_parser.tokenize()
+    query_tree = pubmed_parser.parse_query_tree(pubmed_parser.tokens)
+
+    assert query_tree.value == "AND"
+    assert query_tree.position == (0, len(query_str))
+    or_query = query_tree.children[0]
+    assert len(or_query.children) == 5000
+    assert or_query.children[-1].value == "t4999"
+    assert or_query.children[-1].search_field.value == "[tiab]"
+
+
+@pytest.mark.parametrize(
+    "query_str",
+    ["a[mh] OR", "(a[mh] OR b[mh]", "a[mh] OR b[mh])", "OR a[mh]", "()"],
+)
+def test_parse_query_tree_invalid(query_str: str) -> None:
+    pubmed_parser = PubmedParser(query_str, "")
+    pubmed_parser.tokenize()
+    with pytest.raises(ValueError):
+        pubmed_parser.parse_query_tree(pubmed_parser.tokens)
+
+
 @pytest.mark.parametrize(
     "query_str, error, position",
     [
@@ -167,3 +214,56 @@ def test_linter_pubmed(
         message["code"] == error.code and message["position"] == position
         for message in pubmed_parser.linter_messages
     ), print(pubmed_parser.linter_messages)
+
+
+def test_list_parser_pubmed() -> None:
+    query_list = (
+        "1. a[mh] OR b[mh]\n2. c[mh]\n3. #1 AND #2 NOT d[ti]\n4. #3 OR (#1 & #2)"
+    )
+    query = PubmedListParser(query_list, "").parse()
+
+    assert query.to_string() == (
+        "OR[all][NOT[all][AND[all][OR[all][a[mh], b[mh]], c[mh]], d[ti]], "
+        "AND[all][OR[all][a[mh], b[mh]], c[mh]]]"
+    )
+    # Each line is parsed once, references share the query of the line
+    first_line = query.children[0].children[0].children[0]
+    assert query.children[1].children[0] is first_line
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_list_parser_pubmed_positions(max_workers: int) -> None:
+    query_list = (
+        "1. robot*[tiab]\n2. care[tiab] OR nursing[mh]\n3. #1 AND #2\n"
+        "4. health[mh]\n5. #3 OR #4 AND english[la]"
+    )
+    query = PubmedListParser(query_list, "", max_workers=max_workers).parse()
+
+    # Positions refer to the list query (not to the line)
+    nursing = query.children[0].children[0].children[1].children[1]
+    health = query.children[0].children[1]
+    english = query.children[1]
+    assert query_list[slice(*nursing.position)] == "nursing[mh]"
+    assert query_list[slice(*nursing.search_field.position)] == "[mh]"
+    assert query_list[slice(*health.position)] == "health[mh]"
+    assert query_list[slice(*english.position)] == "english[la]"
+    # Operators combining list items have no position
+    assert query.position is None
+    assert query.search_field.value == Fields.ALL
+
+
+@pytest.mark.parametrize(
+    "query_list, position",
+    [
+        ("1. a[mh]\n2. c[mh] OR d[xx]\n3. #1 OR #2", (22, 26)),
+        ("1. a[mh]\n2. c[mh]\n3. #1 OR #4", (27, 29)),
+        ("1. a[mh]\n2. #3 OR #1\n3. c[mh]", (12, 14)),
+        ("1. a[mh]\n2. c[mh]\n3. #1 #2", (24, 26)),
+    ],
+)
+def test_list_parser_pubmed_error_position(query_list: str, position: Tuple) -> None:
+    with pytest.raises(QuerySyntaxError) as exc_info:
+        PubmedListParser(query_list, "").parse()
+
+    assert exc_info.value.position == position
+    assert exc_info.value.query_string == query_list
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 """Web-of-Science query parser unit tests."""
+import random
+import re
 import typing
 
 import pytest
@@ -77,6 +79,21 @@ def test_tokenization(query_str: str, expected_tokens: list) -> None:
     assert parser.tokens == expected_tokens, print(parser.tokens)
 
 
+def test_token_pattern() -> None:
+    # Types are given by the named groups (also if the regexes contain groups)
+    matches = WOSParser.TOKEN_PATTERN.finditer('TI=(robot* NEAR/3 "AI" or x)')
+    assert [(match.group(), match.lastgroup) for match in matches] == [
+        ("TI=", "FIELD"),
+        ("(", "PARENTHESIS_OPEN"),
+        ("robot*", "SEARCH_TERM"),
+        ("NEAR/3", "PROXIMITY_OPERATOR"),
+        ('"AI"', "SEARCH_TERM"),
+        ("or", "LOGIC_OPERATOR"),
+        ("x", "SEARCH_TERM"),
+        (")", "PARENTHESIS_CLOSED"),
+    ]
+
+
 def test_handle_closing_parenthesis_single_child() -> None:
     """
     Test the `handle_closing_parenthesis` method with a single child.
@@ -1136,6 +1153,28 @@ def test_list_parser_case_1() -> None:
     list_parser.parse()
 
 
+def test_list_parser_parses_lines_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    query_list = "1. TS=(robot* OR drone*)\n2. TI=(farm*)\n3. #1 AND #2\n"
+    parsed = []
+    parse = WOSParser.parse
+
+    def counting_parse(self: WOSParser) -> Query:
+        parsed.append(self.query_str)
+        return parse(self)
+
+    monkeypatch.setattr(WOSParser, "parse", counting_parse)
+    list_parser = WOSListParser(query_list=query_list, search_field_general="", mode="")
+    query = list_parser.parse()
+
+    # Linting and building the query tree use the same parse results
+    assert parsed == ["TS=(robot* OR drone*)", "TI=(farm*)", "#1 AND #2"]
+    assert query.value == "AND"
+    assert query.children == [
+        list_parser.query_dict["1"]["query"],
+        list_parser.query_dict["2"]["query"],
+    ]
+
+
 # Test case 2
 def test_list_parser_case_2() -> None:
     query_list = '1. TS=("Peer leader*" OR "Shared leader*")\n2. TS=("acrobatics" OR "acrobat" OR "acrobats")'
@@ -1191,3 +1230,216 @@ def test_list_parser_case_4() -> None:
         "position": (7, 9),
         "details": "List reference #5 not found.",
     }
+
+
+def test_parse_deeply_nested_query() -> None:
+    # Deeper than the recursion limit
+    depth = 1100
+    query_str = "TI=robot"
+    for i in range(depth):
+        query_str = f"(term{i} {'AND' if i % 2 else 'OR'} {query_str})"
+
+    parser = WOSParser(query_str=query_str, search_field_general="", mode="")
+    query = parser.parse()
+
+    # Serialized without recursion
+    assert query.to_string().endswith("robot[ti]" + "]" * depth)
+    assert query.to_string("structured").count("|---") == 2
+
+    for i in reversed(range(depth)):
+        assert query.value == ("AND" if i % 2 else "OR")
+        term, query = query.children
+        assert term.value == f"term{i}"
+        start = query_str.index(f"term{i} ")
+        assert term.position == (start, start + len(f"term{i}"))
+    assert query.value == "robot"
+    assert query.search_field.value == Fields.TITLE
+
+
+def test_add_artificial_parentheses_deeply_nested() -> None:
+    depth = 1500
+    query_str = "TI=robot"
+    for i in range(depth):
+        query_str = f"(a{i} OR b{i} AND {query_str})"
+
+    parser = WOSParser(query_str=query_str, search_field_general="", mode="")
+    parser.tokenize()
+    parser.add_artificial_parentheses_for_operator_precedence()
+
+    # One artificial pair per level: (a OR (b AND (...)))
+    assert [token.value for token in parser.tokens[:4]] == ["(", "a1499", "OR", "("]
+    assert parser.tokens[3].position == (-1, -1)
+    assert [token.value for token in parser.tokens[-3:]] == [")", ")", ")"]
+    assert [token.position for token in parser.tokens[-2:]] == [
+        (-1, -1),
+        (query_str.rindex(")"), query_str.rindex(")") + 1),
+    ]
+    assert sum(token.position == (-1, -1) for token in parser.tokens) == 2 * depth
+
+
+def test_artificial_parentheses_nested_levels() -> None:
+    parser = WOSParser(
+        query_str="TS=(a AND b OR c) AND d", search_field_general="", mode=""
+    )
+    parser.tokenize()
+    parser.add_artificial_parentheses_for_operator_precedence()
+    assert [
+        token.value if token.position != (-1, -1) else f"[{token.value}]"
+        for token in parser.tokens
+    ] == ["TS=", "(", "[(]", "a", "AND", "b", "[)]", "OR", "c", ")", "AND", "d"]
+
+
+def test_parse_superior_search_field() -> None:
+    # Terms without search field after a term with a search field
+    parser = WOSParser(
+        query_str="TS=(TI=robot OR care)", search_field_general="", mode=""
+    )
+    query = parser.parse()
+    assert query.value == "OR"
+    assert [(child.value, child.search_field.value) for child in query.children] == [
+        ("robot", Fields.TITLE),
+        ("care", Fields.TOPIC),
+    ]
+
+
+def _parsed_state(parser: WOSParser, query: Query) -> tuple:
+    """Query (with positions), tokens and linter messages"""
+    terms = []
+    nodes = [query]
+    for node in nodes:
+        nodes.extend(node.children)
+        if node.search_field:
+            terms.append((node.value, node.position, node.search_field.position))
+    return (
+        query.to_string(),
+        terms,
+        [(token.value, token.position) for token in parser.tokens],
+        sorted((msg["code"], msg["position"]) for msg in parser.linter_messages),
+    )
+
+
+@pytest.mark.parametrize(
+    "query_str, edits",
+    [
+        # Typing and deleting in a term
+        (
+            "TI=(robot* OR care) AND AB=(nurse OR health)",
+            [("nurse", "nurses"), ("nurses", "nurse"), ("robot*", "machine")],
+        ),
+        # Terms and operators (also with implicit precedence and linter messages)
+        (
+            "TS=(robot* OR (care AND home)) AND TI=(digital OR x)",
+            [
+                ("home", "home OR elderly"),
+                ("OR x", "OR x AND y"),
+                ("OR x", "OR digit*"),
+            ],
+        ),
+        # Edits of parentheses, quotes and at the top level are parsed again
+        (
+            'TI=(robot* OR care) AND AB=("deep learning" OR ai)',
+            [("care)", "care) "), ("AND", "OR"), ('"deep learning"', "deep")],
+        ),
+        # Groups that share a node with the enclosing group ("((...))")
+        (
+            "TI=z AND AB=(((a AND b) AND (x AND y) OR (m AND n) OR w))",
+            [("w", "w2"), ("m", "m2"), ("x", "x2")],
+        ),
+    ],
+)
+def test_apply_edit(query_str: str, edits: list) -> None:
+    parser = WOSParser(query_str=query_str, search_field_general="", mode="")
+    parser.parse()
+
+    for old_text, new_text in edits:
+        start = query_str.index(old_text)
+        end = start + len(old_text)
+        query_str = query_str[:start] + new_text + query_str[end:]
+        query = parser.apply_edit(start, end, new_text)
+
+        expected_parser = WOSParser(
+            query_str=query_str, search_field_general="", mode=""
+        )
+        expected_query = expected_parser.parse()
+        assert parser.query_str == query_str
+        assert _parsed_state(parser, query) == _parsed_state(
+            expected_parser, expected_query
+        )
+
+
+def _nested_group(rng: random.Random, depth: int) -> str:
+    operands = []
+    for _ in range(rng.randint(1, 4)):
+        if depth and rng.random() < 0.5:
+            parentheses = rng.choice([1, 1, 2])
+            operands.append(
+                "(" * parentheses + _nested_group(rng, depth - 1) + ")" * parentheses
+            )
+        else:
+            operands.append(rng.choice("abcmnxyz"))
+    return f" {rng.choice(['AND', 'OR'])} ".join(operands)
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_apply_edit_chain(seed: int) -> None:
+    rng = random.Random(seed)
+    query_str = " AND ".join(
+        f"{field}=({_nested_group(rng, 3)})" for field in ["TI", "AB", "TS"]
+    )
+    parser = WOSParser(query_str=query_str, search_field_general="", mode="")
+    parser.parse()
+
+    for _ in range(30):
+        start, end = rng.choice([m.span() for m in re.finditer("[a-z]+", query_str)])
+        new_text = rng.choice(["robot", "care", "x", "nurse"])
+        query_str = query_str[:start] + new_text + query_str[end:]
+        query = parser.apply_edit(start, end, new_text)
+
+        expected_parser = WOSParser(
+            query_str=query_str, search_field_general="", mode=""
+        )
+        expected_query = expected_parser.parse()
+        assert _parsed_state(parser, query) == _parsed_state(
+            expected_parser, expected_query
+        )
+
+
+def test_apply_edit_parses_group(monkeypatch: pytest.MonkeyPatch) -> None:
+    query_str = " AND ".join(
+        f"TS=({' OR '.join(f'b{i}t{j}' for j in range(10))})" for i in range(50)
+    )
+    parser = WOSParser(query_str=query_str, search_field_general="", mode="")
+    query = parser.parse()
+    first_block, last_block = query.children[0], query.children[-1]
+
+    def parse() -> Query:
+        raise AssertionError("The query is parsed again")
+
+    monkeypatch.setattr(parser, "parse", parse)
+    start = query_str.index("b20t5")
+    query = parser.apply_edit(start, start + 5, "robot*")
+
+    # The other groups are kept (the positions are shifted)
+    assert query.children[0] is first_block
+    assert query.children[-1] is last_block
+    assert query.children[20].children[5].value == "robot*"
+    assert last_block.children[0].position == (
+        query_str.index("b49t0") + 1,
+        query_str.index("b49t0") + 6,
+    )
+
+
+def test_apply_edit_fatal_error() -> None:
+    parser = WOSParser(
+        query_str="TI=(robot* OR care) AND AB=(nurse)",
+        search_field_general="",
+        mode="",
+    )
+    parser.parse()
+
+    with pytest.raises(FatalLintingException):
+        parser.apply_edit(28, 28, "OR ")
+
+    # Fixed by the next edit
+    query = parser.apply_edit(28, 31, "")
+    assert query.to_string() == "AND[ab][OR[ti][robot*[ti], care[ti]], nurse[ab]]"
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Tests for the selectivity-aware query planner"""
+from search_query.and_query import AndQuery
+from search_query.constants import Fields
+from search_query.not_query import NotQuery
+from search_query.or_query import OrQuery
+from search_query.planner import QueryPlanner
+from search_query.query import Query
+from search_query.query import SearchField
+
+RECORDS = [
+    {"title": "Robots in medicine", "abstract": "ethics of care"},
+    {"title": "Unrelated"},
+    {"title": "Medicine", "abstract": "moral questions of care"},
+    {"title": "Health care", "abstract": "robot ethics in care"},
+    {"title": "Care robots", "abstract": "rare terms"},
+] * 4
+
+
+def _query() -> Query:
+    return AndQuery(
+        [
+            OrQuery(["ethic*", "care", "moral*"], search_field=Fields.ABSTRACT),
+            NotQuery(["unrelated"], search_field=Fields.TITLE),
+            OrQuery(["rare", '"health care"'], search_field=Fields.ABSTRACT),
+        ],
+        search_field=SearchField(Fields.TITLE),
+    )
+
+
+def test_planned_matcher_equals_selects() -> None:
+    query = _query()
+    for planner in [QueryPlanner(), QueryPlanner(RECORDS[:5])]:
+        matcher = query.compile_matcher(planner=planner)
+        for record in RECORDS:
+            assert matcher(record) == query.selects(record_dict=record)
+
+
+def test_order_children_with_sample() -> None:
+    query = _query()
+    planner = QueryPlanner(RECORDS)
+
+    # AND: the selective (rarely true) block first
+    and_order = planner.order_children(query)
+    assert and_order[0] is query.children[2]
+
+    # OR: the cheap and frequent term first, the wildcards last
+    or_order = planner.order_children(query.children[0])
+    assert [child.value for child in or_order] == ["care", "ethic*", "moral*"]
+
+    # The query itself is not changed
+    assert query.children[0].children[0].value == "ethic*"
+
+
+def test_estimate() -> None:
+    planner = QueryPlanner()
+
+    short = planner.estimate(Query("ai", search_field=SearchField(Fields.TITLE)))
+    long = planner.estimate(
+        Query('"artificial intelligence"', search_field=SearchField(Fields.TITLE))
+    )
+    wildcard = planner.estimate(Query("art*", search_field=SearchField(Fields.TITLE)))
+    assert long.selectivity < short.selectivity
+    assert short.cost == long.cost < wildcard.cost
+
+    query = _query()
+    estimate = planner.estimate(query)
+    assert 0 < estimate.selectivity < 1
+    assert estimate.cost < sum(planner.estimate(c).cost for c in query.children)
+
+    not_query = query.children[1]
+    assert (
+        planner.estimate(not_query).selectivity
+        == 1 - planner.estimate(not_query.children[0]).selectivity
+    )
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""Tests for token positions and proximity search"""
+import pytest
+
+from search_query.positions import compile_term_tokens
+from search_query.positions import phrase_spans
+from search_query.positions import proximity_spans
+from search_query.positions import TokenPositions
+
+
+def test_token_positions() -> None:
+    positions = TokenPositions("Health care and mental health-care")
+
+    assert positions.find("health") == [0, 4]
+    assert positions.find("surgery") == []
+    assert positions.find(compile_term_tokens("ca*")[0]) == [1, 5]
+    assert positions.find_phrase(compile_term_tokens('"health care"')) == [
+        (0, 1),
+        (4, 5),
+    ]
+    assert positions.find_phrase(compile_term_tokens("m?ntal health")) == [(3, 4)]
+
+
+def test_phrase_spans() -> None:
+    assert phrase_spans([]) == []
+    assert phrase_spans([[0, 3, 7]]) == [(0, 0), (3, 3), (7, 7)]
+    assert phrase_spans([[0, 3, 7], [1, 8], [2, 9]]) == [(0, 2), (7, 9)]
+
+
+@pytest.mark.parametrize(
+    "left, right, distance, ordered, expected",
+    [
+        ([(0, 0)], [(1, 1)], 0, False, [(0, 1)]),
+        ([(0, 0)], [(2, 2)], 0, False, []),
+        ([(0, 0)], [(2, 2)], 1, False, [(0, 2)]),
+        ([(5, 5)], [(2, 3)], 1, False, [(2, 5)]),
+        ([(5, 5)], [(2, 3)], 1, True, []),
+        # Overlapping spans do not match
+        ([(2, 3)], [(3, 3)], 5, False, []),
+        ([(0, 0), (10, 10)], [(3, 3), (12, 12)], 2, False, [(0, 3), (10, 12)]),
+        ([(0, 0)], [], 2, False, []),
+    ],
+)
+def test_proximity_spans(
+    left: list, right: list, distance: int, ordered: bool, expected: list
+) -> None:
+    assert proximity_spans(left, right, distance, ordered=ordered) == expected
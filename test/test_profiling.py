@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Tests for the profiling of query evaluation"""
+from search_query.and_query import AndQuery
+from search_query.constants import Fields
+from search_query.not_query import NotQuery
+from search_query.or_query import OrQuery
+from search_query.profiling import QueryProfile
+from search_query.query import SearchField
+
+RECORDS = [
+    {"title": "Robots in medicine", "abstract": "ethics"},
+    {"title": "Robotic surgery", "abstract": "costs"},
+    {"title": "Medicine", "abstract": "moral questions"},
+    {"title": "Unrelated"},
+]
+
+
+def _query() -> AndQuery:
+    return AndQuery(
+        [
+            OrQuery(["robot*", "surgery"], search_field=SearchField(Fields.TITLE)),
+            OrQuery(["ethic*", "moral*"], search_field=SearchField(Fields.ABSTRACT)),
+            NotQuery(["survey"], search_field=SearchField(Fields.TITLE)),
+        ],
+        search_field=SearchField(Fields.TITLE),
+    )
+
+
+def test_profile_counts() -> None:
+    query = _query()
+    profile = QueryProfile()
+    matcher = query.compile_matcher(profile=profile)
+
+    assert [matcher(r) for r in RECORDS] == [True, False, False, False]
+
+    title, abstract, not_survey = query.children
+    assert (profile[query].evaluated, profile[query].matched) == (4, 1)
+    assert (profile[title].evaluated, profile[title].matched) == (4, 2)
+    # Short-circuit: only evaluated on the records selected by the first child
+    assert (profile[abstract].evaluated, profile[abstract].matched) == (2, 1)
+    assert (profile[not_survey].evaluated, profile[not_survey].matched) == (1, 1)
+    # "surgery" is only evaluated if "robot*" does not match
+    assert profile[title.children[1]].evaluated == 2
+    assert profile[query].seconds >= profile[title].seconds >= 0
+
+
+def test_profile_multi_term() -> None:
+    query = _query()
+    profile = QueryProfile()
+    matcher = query.compile_matcher(profile=profile, multi_term=True)
+
+    assert [matcher(r) for r in RECORDS] == [True, False, False, False]
+    assert profile[query].matched == 1
+
+
+def test_profile_to_string() -> None:
+    query = _query()
+    profile = QueryProfile()
+    matcher = query.compile_matcher(profile=profile)
+    for record in RECORDS:
+        matcher(record)
+
+    lines = profile.to_string(query).splitlines()
+    assert len(lines) == len(query.to_string("structured").splitlines())
+    assert lines[0].startswith("AND[")
+    assert "# evaluated: 4, matched: 1 (25.0%), time: " in lines[0]
+    assert "evaluated: 4, matched: 2 (50.0%)" in lines[1]
+    # All statistics are aligned in one column
+    assert len({line.index("#") for line in lines if "#" in line}) == 1
+
+
+def test_profile_not_compiled() -> None:
+    query = _query()
+    profile = QueryProfile()
+
+    assert query not in profile
+    assert profile.to_string(query) == query.to_string("structured")
@@ -4,6 +4,7 @@ import unittest
 
 from search_query.and_query import AndQuery
 from search_query.constants import Fields
+from search_query.near_query import NEARQuery
 from search_query.not_query import NotQuery
 from search_query.or_query import OrQuery
 from search_query.query import Query
@@ -149,12 +150,54 @@ class TestQuery(unittest.TestCase):
         )
 
     def test_invalid_tree_structure(self) -> None:
-        """test wheter an invalid Query (which includes a cycle), correctly raises an exception"""
+        """test wheter adding a child that creates a cycle correctly raises an exception"""
+        cyclic = OrQuery(["invalid"], search_field=SearchField("Author Keywords"))
+        query = AndQuery(
+            ["invalid", cyclic],
+            search_field=SearchField("Author Keywords"),
+        )
+        with self.assertRaises(ValueError):
+            cyclic.add_child(query)
+        with self.assertRaises(ValueError):
+            cyclic.children = [query]
+        with self.assertRaises(ValueError):
+            query.add_child(query)
+        self.assertEqual(len(cyclic.children), 1)
+
+        # Cycles created in place (children list) are detected when serializing
+        cyclic.children.append(query)
+        with self.assertRaises(ValueError):
+            query.to_string()
+        with self.assertRaises(ValueError):
+            query.to_string("structured")
+
+    def test_distance(self) -> None:
+        """test whether proximity operators (and only these) require a distance"""
+        near = Query("NEAR", operator=True, distance=0, children=["a", "b"])
+        self.assertEqual(near.distance, 0)
+        with self.assertRaises(ValueError):
+            Query("NEAR", operator=True, children=["a", "b"])
+        with self.assertRaises(ValueError):
+            Query("WITHIN", operator=True, children=["a", "b"])
         with self.assertRaises(ValueError):
-            AndQuery(
-                ["invalid", self.query_complete, self.query_ai],
-                search_field=SearchField("Author Keywords"),
-            )
+            Query("AND", operator=True, distance=2, children=["a", "b"])
+
+    def test_near_query_to_string(self) -> None:
+        """test whether the distance of NEAR queries is serialized"""
+        near = NEARQuery(3, ["robot", "care"], search_field=SearchField(Fields.TITLE))
+        self.assertEqual(near.to_string(), "NEAR/3[ti][robot[ti], care[ti]]")
+        self.assertTrue(near.to_string("structured").startswith("NEAR/3[\n"))
+        self.assertEqual(near.to_string("wos"), "TI=(robot NEAR/3 care)")
+
+    def test_shared_subtrees(self) -> None:
+        """test whether subtrees can be shared (the query is not a tree but has no cycle)"""
+        query = AndQuery(
+            ["valid", self.query_complete, self.query_ai],
+            search_field=SearchField("Author Keywords"),
+        )
+        self.assertIs(query.children[2], self.query_complete.children[0])
+        self.assertEqual(query.to_string().count('"AI"[ti]'), 2)
+        self.assertEqual(query.to_string("structured").count('"AI"'), 2)
 
     def test_selects(self) -> None:
         """Test whether the 'selects' method correctly evaluates records."""
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""Tests for the inverted record index"""
+import pytest
+
+from search_query.and_query import AndQuery
+from search_query.constants import Fields
+from search_query.near_query import NEARQuery
+from search_query.not_query import NotQuery
+from search_query.or_query import OrQuery
+from search_query.proximity_query_ebsco import EBSCOProximityWithin
+from search_query.query import Query
+from search_query.query import SearchField
+from search_query.record_index import bitset_to_ids
+from search_query.record_index import RecordIndex
+
+# flake8: noqa: E501
+
+RECORDS = [
+    {
+        "title": "Artificial Intelligence in Health Care",
+        "abstract": "This study explores the role of AI and machine learning in improving health outcomes.",
+    },
+    {
+        "title": "Moral Implications of Artificial Intelligence",
+        "abstract": "Examines ethical concerns in AI development.",
+    },
+    {
+        "title": "Unrelated Title",
+        "abstract": "This abstract is about something else entirely.",
+    },
+    {
+        "title": "Title with AI and medicine",
+        "abstract": "abstract containing ethics.",
+    },
+    {"title": "Robots in medicine, care and health"},
+]
+
+
+def _title(*values: str) -> OrQuery:
+    return OrQuery(list(values), search_field=SearchField(Fields.TITLE))
+
+
+def _abstract(*values: str) -> OrQuery:
+    return OrQuery(list(values), search_field=SearchField(Fields.ABSTRACT))
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        (_title("medicine"), [3, 4]),
+        (_title("ai"), [3]),
+        (_title('"AI"', "robot*"), [3, 4]),
+        (_title('"health care"'), [0]),
+        (_title('"artificial intel*"'), [0, 1]),
+        (_title("robot?"), [4]),
+        (_title("robots$"), [4]),
+        (_title("medicine$"), [3, 4]),
+        (_abstract("ethic*"), [1, 3]),
+        (_abstract("ethic"), []),
+        (NotQuery(["medicine"], search_field=SearchField(Fields.TITLE)), [0, 1, 2]),
+        (
+            AndQuery(
+                [_title("intelligence"), _abstract("ethic*", "moral*")],
+                search_field=SearchField(Fields.TITLE),
+            ),
+            [1],
+        ),
+        (
+            AndQuery(
+                [
+                    _title("medicine", '"artificial intelligence"'),
+                    NotQuery(["robot*"], search_field=SearchField(Fields.TITLE)),
+                ],
+                search_field=SearchField(Fields.TITLE),
+            ),
+            [0, 1, 3],
+        ),
+    ],
+)
+def test_record_index_search(query: Query, expected: list) -> None:
+    index = RecordIndex(RECORDS)
+
+    assert index.search(query) == expected
+    assert index.count(query) == len(expected)
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        (NEARQuery(1, ["intelligence", "health"], search_field="ti"), [0]),
+        (NEARQuery(1, ["health", "intelligence"], search_field="ti"), [0]),
+        (NEARQuery(0, ["intelligence", "health"], search_field="ti"), []),
+        (NEARQuery(0, ['"health care"', "in"], search_field="ti"), [0]),
+        (NEARQuery(2, ["care", "health"], search_field="ti"), [0, 4]),
+        (NEARQuery(3, ["medicine", _title("robot?", "ai")], search_field="ti"), [3, 4]),
+        (NEARQuery(3, ["ethic*", "concerns"], search_field="ab"), [1]),
+        (EBSCOProximityWithin(["care", "health"], search_field="ti", distance=2), [4]),
+        (
+            NEARQuery(
+                1,
+                [
+                    NEARQuery(0, ["artificial", "intelligence"], search_field="ti"),
+                    "health",
+                ],
+                search_field="ti",
+            ),
+            [0],
+        ),
+    ],
+)
+def test_record_index_near(query: Query, expected: list) -> None:
+    index = RecordIndex(RECORDS)
+
+    assert index.search(query) == expected
+    assert [
+        i for i, r in enumerate(RECORDS) if query.selects(record_dict=r)
+    ] == expected
+
+
+def test_record_index_equals_selects_for_whole_words() -> None:
+    """For terms matching whole words, the index gives the same answers as selects()"""
+    query = AndQuery(
+        [
+            _title('"Artificial Intelligence"', "medicine"),
+            _abstract("ethics", "ethical", '"machine learning"'),
+        ],
+        search_field=SearchField(Fields.TITLE),
+    )
+    index = RecordIndex(RECORDS)
+
+    expected = [i for i, r in enumerate(RECORDS) if query.selects(record_dict=r)]
+    assert index.search(query) == expected
+
+
+def test_record_index_add() -> None:
+    index = RecordIndex()
+    assert index.search(_title("medicine")) == []
+
+    assert index.add(RECORDS[0]) == 0
+    assert index.add(RECORDS[3]) == 1
+    assert index.nr_records == 2
+    assert index.search(_title("medicine")) == [1]
+    assert "medicine" in index.vocabulary("title")
+
+
+def test_record_index_invalid_search_field() -> None:
+    index = RecordIndex(RECORDS)
+    with pytest.raises(ValueError):
+        index.search(OrQuery(["medicine"], search_field=SearchField(Fields.MESH_TERM)))
+
+
+def test_bitset_to_ids() -> None:
+    assert bitset_to_ids(0) == []
+    assert bitset_to_ids(0b1011) == [0, 1, 3]
+    assert bitset_to_ids(1 << 100) == [100]
+
+
+def test_record_index_composite_fields() -> None:
+    index = RecordIndex(RECORDS)
+    topic = SearchField(Fields.TOPIC)
+
+    assert index.search(OrQuery(["ethical", "medicine"], search_field=topic)) == [
+        1,
+        3,
+        4,
+    ]
+    assert index.search(NEARQuery(2, ["study", "role"], search_field=topic)) == [0]
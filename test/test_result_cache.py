@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""Tests for the cross-query result cache"""
+from search_query.and_query import AndQuery
+from search_query.compact import fingerprint
+from search_query.constants import Fields
+from search_query.not_query import NotQuery
+from search_query.or_query import OrQuery
+from search_query.query import SearchField
+from search_query.record_index import RecordIndex
+from search_query.result_cache import ResultCache
+
+RECORDS = [
+    {"title": "Robots in medicine", "abstract": "ethics"},
+    {"title": "Robotic surgery", "abstract": "costs"},
+    {"title": "Medicine", "abstract": "moral questions"},
+    {"title": "Unrelated", "abstract": "ethical survey"},
+]
+
+
+def _robots(*values: str) -> OrQuery:
+    return OrQuery(list(values), search_field=SearchField(Fields.TITLE))
+
+
+def _ethics() -> OrQuery:
+    return OrQuery(["ethic*", "moral*"], search_field=SearchField(Fields.ABSTRACT))
+
+
+def test_normalized_fingerprint() -> None:
+    first = _robots('"Robot*"', "surgery")
+    second = _robots("surgery", "robot*", "surgery")
+
+    assert fingerprint(first) != fingerprint(second)
+    assert fingerprint(first, normalized=True) == fingerprint(second, normalized=True)
+    assert fingerprint(first, normalized=True) != fingerprint(
+        _robots("robot*"), normalized=True
+    )
+
+
+def test_result_cache_across_queries() -> None:
+    index = RecordIndex(RECORDS)
+    cache = ResultCache()
+    first = AndQuery(
+        [_robots("robot*", "surgery"), _ethics()],
+        search_field=SearchField(Fields.TITLE),
+    )
+    second = AndQuery(
+        [
+            _robots("surgery", "robot*"),
+            NotQuery(["survey"], search_field=SearchField(Fields.ABSTRACT)),
+        ],
+        search_field=SearchField(Fields.TITLE),
+    )
+
+    assert index.search(first, cache=cache) == index.search(first) == [0]
+    assert cache.hits == 0
+    assert len(cache) == 7
+
+    # The title block of the second query is reused
+    assert index.search(second, cache=cache) == index.search(second) == [0, 1]
+    assert cache.hits == 1
+    assert len(cache) == 10
+
+    # Repeated query: only the root is looked up
+    hits = cache.hits
+    assert index.search(first, cache=cache) == [0]
+    assert cache.hits == hits + 1
+
+
+def test_result_cache_corpus_version() -> None:
+    index = RecordIndex(RECORDS)
+    cache = ResultCache()
+    query = _robots("medicine")
+    assert index.count(query, cache=cache) == 2
+
+    index.add({"title": "Medicine"})
+    assert index.count(query, cache=cache) == 3
+    assert RecordIndex(RECORDS).count(_robots("medicine", "robots"), cache=cache) == 2
+    assert cache.hits == 0
+
+
+def test_result_cache_eviction() -> None:
+    cache = ResultCache(max_bytes=1000)
+    for i in range(10):
+        cache.put((bytes([i]), "corpus"), (1 << 100) - 1)
+
+    assert len(cache) < 10
+    assert cache.evictions == 10 - len(cache)
+    assert cache.nbytes <= 1000
+    # Least recently used results are evicted first
+    assert (bytes([0]), "corpus") not in cache
+    assert cache.get((bytes([9]), "corpus")) == (1 << 100) - 1
+    assert cache.get((bytes([0]), "corpus")) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_result_cache_sparse_results() -> None:
+    cache = ResultCache()
+    sparse = 1 << 100_000 | 1 << 5
+    cache.put((b"sparse", "corpus"), sparse)
+    cache.put((b"empty", "corpus"), 0)
+
+    assert cache.nbytes < 1000
+    assert cache.get((b"sparse", "corpus")) == sparse
+    assert cache.get((b"empty", "corpus")) == 0
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""Tests for the streaming record screening"""
+import json
+from pathlib import Path
+
+import pytest
+
+from search_query.cli import main
+from search_query.constants import Fields
+from search_query.or_query import OrQuery
+from search_query.query import SearchField
+from search_query.screening import read_records
+from search_query.screening import screen
+
+RECORDS = [
+    {"ID": "a", "title": "Robots in medicine", "abstract": "ethics"},
+    {"ID": "b", "title": "Unrelated"},
+    {"title": "Medicine", "abstract": "moral questions"},
+]
+
+
+@pytest.fixture(name="records_path")
+def fixture_records_path(tmp_path: Path) -> Path:
+    path = tmp_path / "records.jsonl"
+    lines = [json.dumps(record) for record in RECORDS]
+    lines.insert(2, "")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_read_records(records_path: Path) -> None:
+    assert list(read_records(records_path)) == RECORDS
+
+
+def test_read_records_invalid(tmp_path: Path) -> None:
+    path = tmp_path / "records.jsonl"
+    path.write_text('{"ID": "a"}\n{"ID": \n', encoding="utf-8")
+    with pytest.raises(ValueError, match="line 2"):
+        list(read_records(path))
+
+
+def test_screen(records_path: Path) -> None:
+    query = OrQuery(["medicine"], search_field=SearchField(Fields.TITLE))
+
+    results = screen(query, records_path)
+    assert next(results) == RECORDS[0]
+    assert list(results) == [RECORDS[2]]
+
+    assert list(screen(query, records_path, ids=True)) == ["a", 2]
+
+
+def test_cli_screen(records_path: Path, capsys: pytest.CaptureFixture) -> None:
+    with pytest.raises(SystemExit) as exc:
+        main(
+            [
+                "screen",
+                "--query",
+                "TI=(medicine OR robot*) AND AB=(ethic* OR moral*)",
+                str(records_path),
+                "--ids",
+            ]
+        )
+    assert exc.value.code == 0
+    assert capsys.readouterr().out.split() == ["a", "2"]
+
+    with pytest.raises(SystemExit) as exc:
+        main(["screen", "--query", "TI=robot*", str(records_path)])
+    assert exc.value.code == 0
+    assert capsys.readouterr().out.splitlines() == [json.dumps(RECORDS[0])]
+
+
+def test_cli_screen_invalid_query(
+    records_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    with pytest.raises(SystemExit) as exc:
+        main(["screen", "--query", "TI=(medicine", str(records_path)])
+    assert exc.value.code == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_cli_screen_invalid_records(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    path = tmp_path / "records.jsonl"
+    path.write_text('{"ID": "a", "title": "robot"}\n{"ID": \n', encoding="utf-8")
+    with pytest.raises(SystemExit) as exc:
+        main(["screen", "--query", "TI=robot*", str(path), "--ids"])
+    assert exc.value.code == 1
+    captured = capsys.readouterr()
+    assert captured.out.split() == ["a"]
+    assert "line 2" in captured.err
+
+
+def test_cli_screen_profile(records_path: Path, capsys: pytest.CaptureFixture) -> None:
+    with pytest.raises(SystemExit) as exc:
+        main(["screen", "--query", "TI=robot*", str(records_path), "--profile"])
+    assert exc.value.code == 0
+    captured = capsys.readouterr()
+    assert captured.out.splitlines() == [json.dumps(RECORDS[0])]
+    assert "evaluated: 3, matched: 1" in captured.err
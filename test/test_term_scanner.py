@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""Tests for the multi-term scanner"""
+import pytest
+
+from search_query.term_scanner import TermScanner
+
+
+@pytest.mark.parametrize(
+    "terms, text, expected",
+    [
+        (
+            ["care", "health care", "health"],
+            "health care",
+            {"health care", "health", "care"},
+        ),
+        (["car", "care", "careful"], "a carefree car", {"car", "care"}),
+        (["car", "care", "careful"], "careful", {"car", "care", "careful"}),
+        (["ai", "said"], "she said", {"ai", "said"}),
+        (["a.b", "(x)"], "a.b and (x)", {"a.b", "(x)"}),
+        (["a.b"], "axb", set()),
+        (["abc", "bcd", "cde"], "abcde", {"abc", "bcd", "cde"}),
+        (["ethic"], "", set()),
+        ([], "text", set()),
+        ([""], "text", set()),
+    ],
+)
+def test_scan(terms: list, text: str, expected: set) -> None:
+    scanner = TermScanner(terms)
+    assert scanner.scan(text) == expected
+    # Same result as one substring search per term
+    assert expected == {term for term in terms if term and term in text}
+
+
+def test_scan_many_terms() -> None:
+    terms = [f"term{i}" for i in range(500)] + ["term", "ter"]
+    scanner = TermScanner(terms)
+    text = "a term12 and term499 and term4999"
+
+    assert scanner.scan(text) == {t for t in terms if t in text}
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""Tests for the vectorized selection of record collections"""
+import pytest
+
+from search_query.and_query import AndQuery
+from search_query.constants import Fields
+from search_query.near_query import NEARQuery
+from search_query.not_query import NotQuery
+from search_query.or_query import OrQuery
+from search_query.query import SearchField
+
+np = pytest.importorskip("numpy")
+
+# flake8: noqa: E501
+
+RECORDS = [
+    {
+        "title": "Artificial Intelligence in Health Care",
+        "abstract": "This study explores the role of AI and machine learning in improving health outcomes.",
+    },
+    {
+        "title": "Moral Implications of Artificial Intelligence",
+        "abstract": "Examines ethical concerns in AI development.",
+    },
+    {
+        "title": "Title with AI and medicine",
+        "abstract": "abstract containing ethics.",
+    },
+    {"title": "Robots in medicine"},
+    {},
+]
+
+
+def test_select_many_equals_selects() -> None:
+    """select_many() gives the same answers as selects()"""
+    query = AndQuery(
+        [
+            OrQuery(
+                [
+                    '"AI"',
+                    '"Machine Learning"',
+                    NotQuery(["robot*"], search_field=SearchField(Fields.TITLE)),
+                ],
+                search_field=SearchField(Fields.TITLE),
+            ),
+            OrQuery(
+                ['"health care"', "medicine"], search_field=SearchField(Fields.TITLE)
+            ),
+            OrQuery(["ethic*", "moral*"], search_field=SearchField(Fields.ABSTRACT)),
+        ],
+        search_field=SearchField(Fields.TITLE),
+    )
+
+    for subquery in [query, *query.children, *query.children[0].children]:
+        mask = subquery.select_many(RECORDS)
+        expected = [subquery.selects(record_dict=record) for record in RECORDS]
+        assert mask.dtype == bool
+        assert mask.tolist() == expected
+
+
+def test_select_many_multiline_fields() -> None:
+    """Matches do not span records (or lines within records)"""
+    records = [
+        {"title": "ethics and"},
+        {"title": "morality\nethics"},
+        {"title": "Ethics"},
+        {"title": ""},
+        {"title": "more ethic"},
+    ]
+    for value in ["ethic*", "and*mor*", "s*eth*", "ethics", "cs\nmor", "e*"]:
+        query = OrQuery([value], search_field=SearchField(Fields.TITLE))
+        expected = [query.selects(record_dict=record) for record in records]
+        assert query.select_many(records).tolist() == expected, value
+
+
+def test_select_many_empty() -> None:
+    query = NotQuery(["robot*"], search_field=SearchField(Fields.TITLE))
+    assert query.select_many([]).tolist() == []
+    assert query.select_many(iter([{"title": "robots"}])).tolist() == [False]
+
+
+def test_select_many_near() -> None:
+    query = AndQuery(
+        [
+            NEARQuery(2, ["ai", "medicine"], search_field=SearchField(Fields.TITLE)),
+            OrQuery(["ethic*"], search_field=SearchField(Fields.ABSTRACT)),
+        ],
+        search_field=SearchField(Fields.TITLE),
+    )
+    expected = [query.selects(record_dict=record) for record in RECORDS]
+    assert expected == [False, False, True, False, False]
+    assert query.select_many(RECORDS).tolist() == expected
+
+
+def test_select_many_composite_fields() -> None:
+    query = OrQuery(["ethic*", "robots"], search_field=SearchField(Fields.TOPIC))
+    expected = [query.selects(record_dict=record) for record in RECORDS]
+    assert expected == [False, True, True, True, False]
+    assert query.select_many(RECORDS).tolist() == expected
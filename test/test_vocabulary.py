@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""Tests for the sorted vocabularies (wildcard expansion)"""
+import pytest
+
+from search_query.constants import Fields
+from search_query.or_query import OrQuery
+from search_query.positions import compile_token_wildcard
+from search_query.query import SearchField
+from search_query.record_index import RecordIndex
+from search_query.vocabulary import SortedVocabulary
+
+TOKENS = [
+    "child",
+    "childhood",
+    "children",
+    "chill",
+    "woman",
+    "women",
+    "womens",
+    "robot",
+    "robots",
+    "robotics",
+    "learning",
+    "teaching",
+    "ing",
+]
+
+
+@pytest.mark.parametrize(
+    "token, expected",
+    [
+        ("child*", ["child", "childhood", "children"]),
+        ("chil*", ["child", "childhood", "children", "chill"]),
+        ("wom?n", ["woman", "women"]),
+        ("wom?n$", ["woman", "women", "womens"]),
+        ("robot$", ["robot", "robots"]),
+        ("*ing", ["ing", "learning", "teaching"]),
+        ("*", sorted(TOKENS)),
+        ("?", []),
+        ("c*d*", ["child", "childhood", "children"]),
+        ("robot", ["robot"]),
+        ("robo", []),
+        ("xyz*", []),
+    ],
+)
+def test_expand(token: str, expected: list) -> None:
+    vocabulary = SortedVocabulary(TOKENS)
+    assert vocabulary.expand(token) == expected
+    # Same result as matching all tokens
+    pattern = compile_token_wildcard(token)
+    assert expected == [t for t in sorted(TOKENS) if pattern.fullmatch(t)]
+    # Cached
+    assert vocabulary.expand(token) is vocabulary.expand(token)
+
+
+def test_vocabulary() -> None:
+    vocabulary = SortedVocabulary(TOKENS)
+    assert len(vocabulary) == len(TOKENS)
+    assert vocabulary.tokens == sorted(TOKENS)
+    assert "robot" in vocabulary
+    assert "robo" not in vocabulary
+
+
+def test_record_index_vocabulary_update() -> None:
+    query = OrQuery(["child*"], search_field=SearchField(Fields.TITLE))
+    index = RecordIndex([{"title": "Children and robots"}])
+    assert index.vocabulary("title") == ["and", "children", "robots"]
+    assert index.search(query) == [0]
+
+    # The vocabulary (and the expansions) are updated when records are added
+    index.add({"title": "Childhood"})
+    assert index.vocabulary("title") == ["and", "childhood", "children", "robots"]
+    assert index.search(query) == [0, 1]